@@ -0,0 +1,102 @@
+"""Booking のアイテム変換のマイクロベンチマーク
+
+boto3 resource 層の経路（dict 組み立て + TypeSerializer / TypeDeserializer）と、
+AttributeValue を直接組み立てるコーデックの経路を比較する。
+
+    uv run python benchmarks/bench_codec.py [--number 20000]
+"""
+
+import argparse
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from services.flight.domain.entity import Booking  # noqa: E402
+from services.flight.domain.enum import BookingStatus  # noqa: E402
+from services.flight.domain.value_object import BookingId, FlightNumber  # noqa: E402
+from services.flight.infrastructure.booking_codec import (  # noqa: E402
+    decode_booking,
+    encode_booking,
+)
+from services.shared.domain import (  # noqa: E402
+    Currency,
+    IsoDateTime,
+    Money,
+    TripId,
+)
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+def resource_encode(booking: Booking) -> dict:
+    """旧実装の _to_item + resource 層のシリアライズ"""
+    item = {
+        "PK": f"TRIP#{booking.trip_id}",
+        "SK": f"FLIGHT#{booking.id}",
+        "entity_type": "FLIGHT",
+        "booking_id": str(booking.id),
+        "trip_id": str(booking.trip_id),
+        "flight_number": str(booking.flight_number),
+        "departure_time": str(booking.departure_time),
+        "arrival_time": str(booking.arrival_time),
+        "price_amount": str(booking.price.amount),
+        "price_currency": str(booking.price.currency),
+        "status": booking.status.value,
+    }
+    return {k: serializer.serialize(v) for k, v in item.items()}
+
+
+def resource_decode(wire: dict) -> Booking:
+    """resource 層のデシリアライズ + 旧実装の _to_entity"""
+    item = {k: deserializer.deserialize(v) for k, v in wire.items()}
+    return Booking(
+        id=BookingId(value=item["booking_id"]),
+        trip_id=TripId(value=item["trip_id"]),
+        flight_number=FlightNumber(value=item["flight_number"]),
+        departure_time=IsoDateTime.from_string(item["departure_time"]),
+        arrival_time=IsoDateTime.from_string(item["arrival_time"]),
+        price=Money(
+            amount=Decimal(item["price_amount"]),
+            currency=Currency(item["price_currency"]),
+        ),
+        status=BookingStatus(item["status"]),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    booking = Booking(
+        id=BookingId(value="flight_for_trip-123"),
+        trip_id=TripId(value="trip-123"),
+        flight_number=FlightNumber(value="NH001"),
+        departure_time=IsoDateTime.from_string("2024-01-01T10:00:00"),
+        arrival_time=IsoDateTime.from_string("2024-01-01T12:00:00"),
+        price=Money(amount=Decimal("50000"), currency=Currency.jpy()),
+        status=BookingStatus.PENDING,
+    )
+    wire = encode_booking(booking)
+    assert resource_encode(booking) == wire
+
+    cases = {
+        "encode (resource)": lambda: resource_encode(booking),
+        "encode (codec)": lambda: encode_booking(booking),
+        "decode (resource)": lambda: resource_decode(wire),
+        "decode (codec)": lambda: decode_booking(wire),
+    }
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(f"{name:<20} {best / args.number * 1e6:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,649 @@
+"""Saga をプロセス内で実行するローカルベンチマーク
+
+Orchestration から合成したステートマシン定義（ASL）を解釈し、各ステップの
+Lambda ハンドラーをプロセス内で呼び出す。リポジトリは DynamoDB 実装のまま、
+クライアントをインメモリ実装（--repository memory）か実際の DynamoDB
+（--repository dynamodb、TABLE_NAME と AWS_ENDPOINT_URL_DYNAMODB などで指定）に
+差し替えられる。events/sfn_input_*.json の入力ごとに、スループットと
+ステップごとのレイテンシのパーセンタイルを表示する。
+
+    uv run python benchmarks/bench_saga.py [--executions 500] [--workers 8] \\
+        [--pool thread|process] [--repository memory|dynamodb] [--latency-ms 0] \\
+        [--parallel-reservations] [--direct-compensations]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+EVENTS_DIR = ROOT / "events"
+DEFAULT_TABLE_NAME = "TripTable"
+
+# ハンドラーの INFO ログで計測が歪まないようにする
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "WARNING")
+sys.path.insert(0, str(ROOT / "src"))
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from services.flight.applications.cancel_flight import CancelFlightService  # noqa: E402
+from services.flight.applications.reserve_flight import (  # noqa: E402
+    ReserveFlightService,
+)
+from services.flight.domain.factory import BookingFactory  # noqa: E402
+from services.flight.handlers import cancel as flight_cancel  # noqa: E402
+from services.flight.handlers import reserve as flight_reserve  # noqa: E402
+from services.flight.infrastructure.dynamodb_booking_repository import (  # noqa: E402
+    DynamoDBBookingRepository,
+)
+from services.hotel.applications.cancel_hotel import CancelHotelService  # noqa: E402
+from services.hotel.applications.reserve_hotel import (  # noqa: E402
+    ReserveHotelService,
+)
+from services.hotel.domain.factory import HotelBookingFactory  # noqa: E402
+from services.hotel.handlers import cancel as hotel_cancel  # noqa: E402
+from services.hotel.handlers import reserve as hotel_reserve  # noqa: E402
+from services.hotel.infrastructure.dynamodb_hotel_booking_repository import (  # noqa: E402
+    DynamoDBHotelBookingRepository,
+)
+from services.payment.applications.process_payment import (  # noqa: E402
+    ProcessPaymentService,
+)
+from services.payment.domain.factory import PaymentFactory  # noqa: E402
+from services.payment.handlers import process as payment_process  # noqa: E402
+from services.payment.infrastructure.dynamodb_payment_repository import (  # noqa: E402
+    DynamoDBPaymentRepository,
+)
+from services.shared.infrastructure.dynamodb import get_dynamodb_client  # noqa: E402
+
+# Orchestration の関数名 → ハンドラーモジュール
+HANDLER_MODULES = {
+    "flight_reserve": flight_reserve,
+    "flight_cancel": flight_cancel,
+    "hotel_reserve": hotel_reserve,
+    "hotel_cancel": hotel_cancel,
+    "payment_process": payment_process,
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+# --- インメモリの DynamoDB クライアント -------------------------------------
+
+
+def conditional_check_failed(operation: str, item: dict | None) -> ClientError:
+    response: dict = {
+        "Error": {
+            "Code": "ConditionalCheckFailedException",
+            "Message": "The conditional request failed",
+        }
+    }
+    if item is not None:
+        response["Item"] = item
+    return ClientError(response, operation)
+
+
+class InMemoryDynamoDBClient:
+    """リポジトリが使う低レベル API の一部をメモリ上で実装するクライアント
+
+    式は Saga の経路で使うもの（SET・attribute_exists/attribute_not_exists・
+    = ・IN の AND 結合）だけを解釈する。latency を指定すると呼び出しごとに
+    待機し、ネットワーク越しの I/O を模擬する。
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.items: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def get_item(self, TableName: str, Key: dict, **kwargs) -> dict:
+        self._wait()
+        with self._lock:
+            item = self.items.get(self._key(Key))
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(
+        self,
+        TableName: str,
+        Item: dict,
+        ConditionExpression: str | None = None,
+        ReturnValuesOnConditionCheckFailure: str | None = None,
+        **kwargs,
+    ) -> dict:
+        self._wait()
+        with self._lock:
+            key = self._key(Item)
+            old = self.items.get(key)
+            if ConditionExpression and not self._check(ConditionExpression, old, {}):
+                raise conditional_check_failed(
+                    "PutItem", old if ReturnValuesOnConditionCheckFailure else None
+                )
+            self.items[key] = dict(Item)
+        return {}
+
+    def update_item(
+        self,
+        TableName: str,
+        Key: dict,
+        UpdateExpression: str,
+        ConditionExpression: str | None = None,
+        ExpressionAttributeNames: dict | None = None,
+        ExpressionAttributeValues: dict | None = None,
+        ReturnValues: str = "NONE",
+        ReturnValuesOnConditionCheckFailure: str | None = None,
+        **kwargs,
+    ) -> dict:
+        self._wait()
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        with self._lock:
+            key = self._key(Key)
+            old = self.items.get(key)
+            if ConditionExpression and not self._check(
+                ConditionExpression, old, names, values
+            ):
+                raise conditional_check_failed(
+                    "UpdateItem", old if ReturnValuesOnConditionCheckFailure else None
+                )
+            item = dict(old or Key)
+            for assignment in UpdateExpression.removeprefix("SET ").split(","):
+                name, value = (part.strip() for part in assignment.split("="))
+                item[names.get(name, name)] = values[value]
+            self.items[key] = item
+        return {"Attributes": dict(item)} if ReturnValues != "NONE" else {}
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def _key(item: dict) -> tuple[str, str]:
+        return (item["PK"]["S"], item["SK"]["S"])
+
+    @staticmethod
+    def _check(
+        expression: str, item: dict | None, names: dict, values: dict | None = None
+    ) -> bool:
+        values = values or {}
+        for clause in expression.split(" AND "):
+            clause = clause.strip()
+            if match := re.fullmatch(r"attribute_(not_)?exists\((.+)\)", clause):
+                exists = item is not None and names.get(match[2], match[2]) in (
+                    item or {}
+                )
+                if exists == bool(match[1]):
+                    return False
+            elif match := re.fullmatch(r"(\S+) IN \((.+)\)", clause):
+                current = (item or {}).get(names.get(match[1], match[1]))
+                candidates = [values[name.strip()] for name in match[2].split(",")]
+                if current not in candidates:
+                    return False
+            elif match := re.fullmatch(r"(\S+) = (\S+)", clause):
+                current = (item or {}).get(names.get(match[1], match[1]))
+                if current != values[match[2]]:
+                    return False
+            else:
+                raise NotImplementedError(f"Unsupported condition: {clause}")
+        return True
+
+
+def build_services(client, table_name: str) -> dict[str, object]:
+    """関数名 → ハンドラーの get_service() が返すサービス"""
+    return {
+        "flight_reserve": ReserveFlightService(
+            repository=DynamoDBBookingRepository(table_name, client),
+            factory=BookingFactory(),
+        ),
+        "flight_cancel": CancelFlightService(
+            repository=DynamoDBBookingRepository(table_name, client)
+        ),
+        "hotel_reserve": ReserveHotelService(
+            repository=DynamoDBHotelBookingRepository(table_name, client),
+            factory=HotelBookingFactory(),
+        ),
+        "hotel_cancel": CancelHotelService(
+            repository=DynamoDBHotelBookingRepository(table_name, client)
+        ),
+        "payment_process": ProcessPaymentService(
+            repository=DynamoDBPaymentRepository(table_name, client),
+            factory=PaymentFactory(),
+        ),
+    }
+
+
+def install_services(services: dict[str, object]) -> None:
+    """ハンドラーモジュールの get_service を差し替える"""
+    for name, service in services.items():
+        HANDLER_MODULES[name].get_service = lambda service=service: service
+
+
+# --- ASL の解釈 -------------------------------------------------------------
+
+
+class TaskFailed(Exception):
+    """タスクの失敗（Step Functions のエラー名と Cause）"""
+
+    def __init__(self, error: str, cause: str) -> None:
+        super().__init__(error)
+        self.error = error
+        self.cause = cause
+
+
+@dataclass
+class LambdaContext:
+    """ハンドラーに渡す Lambda コンテキスト"""
+
+    function_name: str
+    aws_request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    memory_limit_in_mb: int = 512
+    timeout_ms: int = 30_000
+
+    @property
+    def invoked_function_arn(self) -> str:
+        return (
+            f"arn:aws:lambda:ap-northeast-1:123456789012:function:{self.function_name}"
+        )
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.timeout_ms
+
+
+def read_path(data, path: str, context: dict | None = None):
+    """$.a.b / $[0].a / $$.a 形式の JSONPath で値を取り出す"""
+    if path.startswith("$$"):
+        data, path = context or {}, path[1:]
+    for part in path.removeprefix("$").replace("[", ".[").split("."):
+        if not part:
+            continue
+        data = data[int(part[1:-1])] if part.startswith("[") else data[part]
+    return data
+
+
+def write_path(data: dict, path: str | None, value):
+    """ResultPath に従って結果を状態に書き込む（None は結果を捨てる）"""
+    if path is None:
+        return data
+    if path == "$":
+        return value
+    data = json.loads(json.dumps(data))
+    *parents, name = path.removeprefix("$.").split(".")
+    target = data
+    for parent in parents:
+        target = target.setdefault(parent, {})
+    target[name] = value
+    return data
+
+
+INTRINSIC = re.compile(r"States\.(\w+)\((.*)\)")
+INTRINSIC_ARGUMENT = re.compile(r"'((?:[^'\\]|\\.)*)'|([^,\s][^,]*)")
+
+
+def resolve(expression: str, data, context: dict | None = None):
+    """パスまたは組み込み関数（States.Format / States.JsonToString）を評価する"""
+    match = INTRINSIC.fullmatch(expression)
+    if match is None:
+        return read_path(data, expression, context)
+    arguments = [
+        literal if path is None or path == "" else read_path(data, path, context)
+        for literal, path in INTRINSIC_ARGUMENT.findall(match[2])
+    ]
+    match match[1]:
+        case "Format":
+            template, *values = arguments
+            for value in values:
+                template = template.replace("{}", str(value), 1)
+            return template
+        case "JsonToString":
+            return json.dumps(arguments[0], separators=(",", ":"))
+    raise NotImplementedError(f"Unsupported intrinsic: {expression}")
+
+
+def evaluate(template, data, context: dict | None = None):
+    """Parameters / ResultSelector のテンプレートを評価する"""
+    if isinstance(template, dict):
+        return {
+            key.removesuffix(".$"): (
+                resolve(value, data, context)
+                if key.endswith(".$")
+                else evaluate(value, data, context)
+            )
+            for key, value in template.items()
+        }
+    return template
+
+
+def matches(condition: dict, data: dict) -> bool:
+    """Choice の条件（IsPresent と And / Or）を評価する"""
+    if "And" in condition:
+        return all(matches(c, data) for c in condition["And"])
+    if "Or" in condition:
+        return any(matches(c, data) for c in condition["Or"])
+    try:
+        read_path(data, condition["Variable"])
+        present = True
+    except KeyError:
+        present = False
+    return present == condition["IsPresent"]
+
+
+@dataclass
+class Execution:
+    """1回の実行結果"""
+
+    status: str = "RUNNING"
+    output: dict = field(default_factory=dict)
+    error: str | None = None
+    # (ステート名, 秒) のタスクごとの所要時間
+    steps: list[tuple[str, float]] = field(default_factory=list)
+    # 各ステートに入るときの状態のサイズ（バイト）
+    sizes: list[int] = field(default_factory=list)
+
+
+class SagaExecutor:
+    """ASL を解釈し、タスクをプロセス内で実行する
+
+    Lambda の呼び出しは関数名（FunctionName の末尾）でハンドラーを選び、
+    DynamoDB の統合は client に対して同じパラメーターで呼び出す。
+    Parallel のブランチは順に実行する。再試行は行わず、最初の失敗で Catch に
+    進む（Catch がなければ実行の失敗）。
+    """
+
+    def __init__(
+        self,
+        definition: dict,
+        handlers: dict[str, Callable[[dict, LambdaContext], dict]] | None = None,
+        client=None,
+    ) -> None:
+        self.definition = definition
+        self.handlers = handlers or {
+            name: module.lambda_handler for name, module in HANDLER_MODULES.items()
+        }
+        self.client = client
+
+    def execute(self, data: dict, name: str | None = None) -> Execution:
+        execution = Execution()
+        context = {
+            "Execution": {
+                "Id": f"arn:aws:states:local:execution:saga:{name or uuid.uuid4()}",
+                "Name": name or str(uuid.uuid4()),
+            },
+            "State": {},
+            "StateMachine": {"Id": "arn:aws:states:local:stateMachine:saga"},
+        }
+        try:
+            execution.output = self._run(
+                self.definition["States"],
+                self.definition["StartAt"],
+                data,
+                context,
+                execution,
+            )
+        except TaskFailed as e:
+            # Catch されなかったエラーは実行の失敗
+            execution.status, execution.error = "FAILED", e.error
+        return execution
+
+    def _run(
+        self,
+        states: dict,
+        name: str,
+        data: dict,
+        context: dict,
+        execution: Execution,
+    ) -> dict:
+        while True:
+            state = states[name]
+            context["State"] = {"Name": name, "EnteredTime": time.time()}
+            execution.sizes.append(
+                len(json.dumps(data, separators=(",", ":")).encode())
+            )
+            match state["Type"]:
+                case "Succeed":
+                    execution.status = "SUCCEEDED"
+                    return data
+                case "Fail":
+                    execution.status = "FAILED"
+                    execution.error = state.get("Error")
+                    return data
+                case "Pass":
+                    result = (
+                        evaluate(state["Parameters"], data, context)
+                        if "Parameters" in state
+                        else state.get("Result", data)
+                    )
+                    data = write_path(data, state.get("ResultPath", "$"), result)
+                case "Choice":
+                    name = next(
+                        (c["Next"] for c in state["Choices"] if matches(c, data)),
+                        state["Default"],
+                    )
+                    continue
+                case "Parallel":
+                    outputs = [
+                        self._run(
+                            branch["States"],
+                            branch["StartAt"],
+                            data,
+                            context,
+                            execution,
+                        )
+                        for branch in state["Branches"]
+                    ]
+                    result = evaluate(state.get("ResultSelector", {}), outputs)
+                    data = write_path(
+                        data, state.get("ResultPath", "$"), result or outputs
+                    )
+                case "Task":
+                    started = time.perf_counter()
+                    try:
+                        raw = self._task(state, data, context)
+                    except TaskFailed as e:
+                        execution.steps.append((name, time.perf_counter() - started))
+                        catcher = next(
+                            (
+                                c
+                                for c in state.get("Catch", [])
+                                if {e.error, "States.ALL", "States.TaskFailed"}
+                                & set(c["ErrorEquals"])
+                            ),
+                            None,
+                        )
+                        if catcher is None:
+                            raise
+                        error_info = {"Error": e.error, "Cause": e.cause}
+                        data = write_path(
+                            data, catcher.get("ResultPath", "$"), error_info
+                        )
+                        name = catcher["Next"]
+                        continue
+                    execution.steps.append((name, time.perf_counter() - started))
+                    result = evaluate(state.get("ResultSelector", {}), raw) or raw
+                    data = write_path(data, state.get("ResultPath", "$"), result)
+            if state.get("End"):
+                return data
+            name = state["Next"]
+
+    def _task(self, state: dict, data: dict, context: dict) -> dict:
+        parameters = evaluate(state["Parameters"], data, context)
+        service, _, action = state["Resource"].rpartition(":::")[2].partition(":")
+        if service == "lambda" and action == "invoke":
+            return self._invoke(parameters["FunctionName"], parameters["Payload"])
+        if service == "dynamodb":
+            operation = re.sub(r"(?<!^)(?=[A-Z])", "_", action).lower()
+            try:
+                return getattr(self.client, operation)(**parameters)
+            except ClientError as e:
+                code = e.response["Error"]["Code"]
+                raise TaskFailed(f"DynamoDB.{code}", str(e)) from e
+        raise NotImplementedError(f"Unsupported resource: {state['Resource']}")
+
+    def _invoke(self, function_arn: str, payload: dict) -> dict:
+        """ハンドラーを呼び出し、Lambda の関数エラーと同じ形式で失敗を返す"""
+        function_name = function_arn.rpartition(":")[2]
+        context = LambdaContext(function_name)
+        try:
+            result = self.handlers[function_name](payload, context)
+        except Exception as e:
+            cause = {
+                "errorMessage": str(e),
+                "errorType": type(e).__name__,
+                "requestId": context.aws_request_id,
+                "stackTrace": traceback.format_tb(e.__traceback__),
+            }
+            raise TaskFailed(type(e).__name__, json.dumps(cause)) from e
+        return {"ExecutedVersion": "$LATEST", "Payload": result, "StatusCode": 200}
+
+
+def render_definition(**options) -> dict:
+    """Orchestration を合成し、ステートマシンの ASL を dict で返す
+
+    関数はその名前を末尾に持つ ARN で参照する（SagaExecutor がハンドラーを選ぶ）。
+    """
+    import aws_cdk as cdk
+    from aws_cdk import aws_dynamodb as dynamodb
+    from aws_cdk import aws_lambda as _lambda
+    from aws_cdk.assertions import Template
+
+    sys.path.insert(0, str(ROOT))
+    from infra.constructs.orchestration import Orchestration
+
+    stack = cdk.Stack(cdk.App(), "SagaBench")
+    functions = {
+        name: _lambda.Function.from_function_arn(
+            stack, name, f"arn:aws:lambda:local:000000000000:function:{name}"
+        )
+        for name in HANDLER_MODULES
+    }
+    table = dynamodb.Table.from_table_name(
+        stack, "Table", os.getenv("TABLE_NAME", DEFAULT_TABLE_NAME)
+    )
+    Orchestration(stack, "Orchestration", **functions, table=table, **options)
+
+    resources = Template.from_stack(stack).to_json()["Resources"]
+    (state_machine,) = [
+        resource
+        for resource in resources.values()
+        if resource["Type"] == "AWS::StepFunctions::StateMachine"
+    ]
+    definition = state_machine["Properties"]["DefinitionString"]
+    if isinstance(definition, dict):
+        _, parts = definition["Fn::Join"]
+        definition = "".join(part if isinstance(part, str) else "" for part in parts)
+    return json.loads(definition)
+
+
+# --- 並行実行と集計 ---------------------------------------------------------
+
+_executor: SagaExecutor | None = None
+
+
+def init_worker(
+    definition: dict, repository: str, latency: float, table_name: str
+) -> None:
+    """ワーカー（プロセスごと、スレッドプールでは1回）の初期化"""
+    global _executor
+    client = (
+        InMemoryDynamoDBClient(latency)
+        if repository == "memory"
+        else get_dynamodb_client()
+    )
+    install_services(build_services(client, table_name))
+    _executor = SagaExecutor(definition, client=client)
+
+
+def run_one(data: dict, name: str) -> tuple[str, float, list[tuple[str, float]]]:
+    """1回実行し、(ステータス, 所要秒数, ステップごとの所要時間) を返す"""
+    assert _executor is not None
+    started = time.perf_counter()
+    execution = _executor.execute({**data, "trip_id": name}, name=name)
+    return execution.status, time.perf_counter() - started, execution.steps
+
+
+def percentiles(values: list[float]) -> list[float]:
+    if len(values) < 2:
+        return [values[0] if values else 0.0] * len(PERCENTILES)
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return [cuts[p - 1] for p in PERCENTILES]
+
+
+def report(event: str, results: list[tuple[str, float, list]], elapsed: float) -> None:
+    statuses: dict[str, int] = {}
+    steps: dict[str, list[float]] = {}
+    for status, _, execution_steps in results:
+        statuses[status] = statuses.get(status, 0) + 1
+        for name, seconds in execution_steps:
+            steps.setdefault(name, []).append(seconds)
+    steps["(execution)"] = [seconds for _, seconds, _ in results]
+
+    summary = ", ".join(f"{status} {count}" for status, count in statuses.items())
+    print(f"\n{event}: {len(results) / elapsed:9.1f} executions/s ({summary})")
+    header = " ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+    print(f"  {'step':<32} {'count':>6} {header}   (ms)")
+    for name, values in steps.items():
+        cells = " ".join(f"{value * 1000:9.3f}" for value in percentiles(values))
+        print(f"  {name:<32} {len(values):6d} {cells}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread")
+    parser.add_argument(
+        "--repository", choices=["memory", "dynamodb"], default="memory"
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="インメモリクライアントの呼び出しごとの待機時間（I/O の模擬）",
+    )
+    parser.add_argument("--parallel-reservations", action="store_true")
+    parser.add_argument("--direct-compensations", action="store_true")
+    args = parser.parse_args()
+
+    definition = render_definition(
+        parallel_reservations=args.parallel_reservations,
+        direct_compensations=args.direct_compensations,
+    )
+    table_name = os.getenv("TABLE_NAME", DEFAULT_TABLE_NAME)
+    initargs = (definition, args.repository, args.latency_ms / 1000, table_name)
+    pool: Executor = (
+        ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=initargs)
+        if args.pool == "process"
+        else ThreadPoolExecutor(args.workers)
+    )
+    if args.pool == "thread":
+        init_worker(*initargs)
+
+    print(
+        f"{args.executions} executions per input, {args.workers} {args.pool} "
+        f"workers, {args.repository} repository"
+    )
+    with pool:
+        # プロセスプールの起動・import を計測に含めない
+        list(pool.map(time.sleep, [0] * args.workers))
+        run_id = uuid.uuid4().hex[:8]
+        for path in sorted(EVENTS_DIR.glob("sfn_input_*.json")):
+            data = json.loads(path.read_text())
+            names = [f"{data['trip_id']}-{run_id}-{i}" for i in range(args.executions)]
+            started = time.perf_counter()
+            results = list(pool.map(run_one, [data] * len(names), names))
+            report(path.stem, results, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""API レスポンスの JSON シリアライズのマイクロベンチマーク
+
+get_trip（assemble_trip の結果）と list_trips（summary_to_trip の一覧）の
+ペイロードで、各シリアライザーを比較する（stdlib が従来の json.dumps(default=str)）。
+出力が従来と同じことも確かめる。
+
+    uv run python benchmarks/bench_serializer.py [--number 2000] [--trips 100]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from services.shared.utils.serializer import SERIALIZERS  # noqa: E402
+from services.trip.infrastructure.trip_read_model import (  # noqa: E402
+    assemble_trip,
+    summary_to_trip,
+)
+
+
+def trip_items(trip_id: str) -> list[dict]:
+    """DynamoDB から読み出した状態（数値は Decimal）のアイテム"""
+    return [
+        {
+            "entity_type": "FLIGHT",
+            "booking_id": f"flight_for_{trip_id}",
+            "flight_number": "NH001",
+            "departure_time": "2024-01-01T10:00:00",
+            "arrival_time": "2024-01-01T12:00:00",
+            "price_amount": Decimal("50000"),
+            "price_currency": "JPY",
+            "status": "CONFIRMED",
+        },
+        {
+            "entity_type": "HOTEL",
+            "booking_id": f"hotel_for_{trip_id}",
+            "hotel_name": "Tokyo Hotel",
+            "check_in_date": "2024-01-01",
+            "check_out_date": "2024-01-03",
+            "price_amount": Decimal("30000"),
+            "price_currency": "JPY",
+            "status": "CONFIRMED",
+        },
+        {
+            "entity_type": "PAYMENT",
+            "payment_id": f"payment_for_{trip_id}",
+            "amount": Decimal("80000"),
+            "currency": "JPY",
+            "status": "COMPLETED",
+        },
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--trips", type=int, default=100)
+    args = parser.parse_args()
+
+    trip = assemble_trip("trip-0", trip_items("trip-0"))
+    listing = {
+        "items": [
+            summary_to_trip(assemble_trip(f"trip-{i}", trip_items(f"trip-{i}")))
+            for i in range(args.trips)
+        ],
+        "next_token": None,
+    }
+
+    candidates = {name: factory().dumps for name, factory in SERIALIZERS.items()}
+
+    for payload_name, payload in (("get_trip", trip), ("list_trips", listing)):
+        expected = json.dumps(payload, default=str)
+        print(f"\n{payload_name} ({len(expected)} bytes)")
+        for name, dumps in candidates.items():
+            assert dumps(payload) == expected, name
+            best = min(
+                timeit.repeat(
+                    lambda: dumps(payload), number=args.number, repeat=args.repeat
+                )
+            )
+            print(f"  {name:<24} {best / args.number * 1e6:9.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
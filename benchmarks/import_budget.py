@@ -0,0 +1,156 @@
+"""Lambda ハンドラーの import 時間（コールドスタートの初期化コスト）の予算チェック
+
+infra/constructs/functions.py に定義された各ハンドラーのモジュールを新しい
+インタープリターで import し、-X importtime の累積時間の中央値が予算を超えたら
+失敗する。予算は計測した中央値（BASELINE_MS）に HEADROOM を掛けた値で、
+CI（.github/workflows/test.yml）で毎回チェックする。
+
+    uv run python benchmarks/import_budget.py [--repeat 9] [--scale 1.0]
+
+ハンドラーの追加や依存の変更で import 時間が変わった場合は、--calibrate で
+中央値を計測し、出力を BASELINE_MS に貼り付ける。
+
+    uv run python benchmarks/import_budget.py --calibrate --repeat 21
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+FUNCTIONS_CONSTRUCT = ROOT / "infra" / "constructs" / "functions.py"
+
+HANDLER_SUFFIX = ".lambda_handler"
+
+# ハンドラーモジュールごとの import 時間の中央値（ミリ秒、累積）
+# --calibrate --repeat 21 で計測（Python 3.14、1 vCPU の Linux）
+BASELINE_MS = {
+    "services.flight.handlers.cancel": 200.7,
+    "services.flight.handlers.reserve": 195.4,
+    "services.hotel.handlers.cancel": 192.8,
+    "services.hotel.handlers.reserve": 196.8,
+    "services.payment.handlers.process": 198.1,
+    "services.payment.handlers.refund": 190.8,
+    "services.trip.handlers.get_trip": 105.7,
+    "services.trip.handlers.list_trips": 203.4,
+    "services.trip.handlers.project_trip_summary": 141.3,
+}
+
+# 計測のばらつき（同じ環境で ±15% 程度）と CI ランナーとの差を吸収する余裕
+HEADROOM = 1.5
+
+# import 時に参照される環境変数（値は計測に影響しない）
+IMPORT_ENV = {
+    "TABLE_NAME": "import-budget",
+    "AWS_DEFAULT_REGION": "ap-northeast-1",
+    "POWERTOOLS_SERVICE_NAME": "import-budget",
+    "POWERTOOLS_METRICS_NAMESPACE": "ImportBudget",
+}
+
+
+def handler_modules(path: Path = FUNCTIONS_CONSTRUCT) -> list[str]:
+    """Functions Construct に書かれたハンドラー文字列からモジュール名を取り出す"""
+    tree = ast.parse(path.read_text())
+    modules = {
+        node.value.removesuffix(HANDLER_SUFFIX)
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant)
+        and isinstance(node.value, str)
+        and node.value.startswith("services.")
+        and node.value.endswith(HANDLER_SUFFIX)
+    }
+    return sorted(modules)
+
+
+def parse_importtime(stderr: str, module: str) -> float:
+    """-X importtime の出力から module の累積時間（ミリ秒）を取り出す"""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise ValueError(f"{module} not found in importtime output")
+
+
+def measure(module: str) -> float:
+    """新しいインタープリターで module を import し、累積時間（ミリ秒）を返す"""
+    env = {**os.environ, **IMPORT_ENV, "PYTHONPATH": str(ROOT / "src")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return parse_importtime(result.stderr, module)
+
+
+def budget_ms(module: str, scale: float = 1.0) -> float | None:
+    """module の予算（ミリ秒）。BASELINE_MS にない場合は None"""
+    baseline = BASELINE_MS.get(module)
+    if baseline is None:
+        return None
+    return baseline * HEADROOM * scale
+
+
+def median_ms(module: str, repeat: int) -> float:
+    """module の import 時間の中央値（ミリ秒）"""
+    # 1回目は .pyc の生成を含むため捨てる
+    measure(module)
+    return statistics.median(measure(module) for _ in range(repeat))
+
+
+def calibrate(repeat: int) -> None:
+    """各ハンドラーの中央値を BASELINE_MS の形式で出力する"""
+    print("BASELINE_MS = {")
+    for module in handler_modules():
+        print(f'    "{module}": {median_ms(module, repeat):.1f},')
+    print("}")
+
+
+def check(repeat: int, scale: float) -> bool:
+    """全ハンドラーが予算内なら True"""
+    passed = True
+    for module in handler_modules():
+        median = median_ms(module, repeat)
+        limit = budget_ms(module, scale)
+        if limit is None:
+            # 予算がないハンドラーは計測値を示して失敗させる
+            print(f"NONE {module:<48} {median:8.1f} ms / no budget (--calibrate)")
+            passed = False
+            continue
+        status = "ok  " if median <= limit else "OVER"
+        passed &= median <= limit
+        print(f"{status} {module:<48} {median:8.1f} ms / {limit:6.0f} ms")
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="予算に掛ける係数（計測環境が基準の環境より遅い場合に使う）",
+    )
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="予算をチェックせず、中央値を BASELINE_MS の形式で出力する",
+    )
+    args = parser.parse_args()
+
+    if args.calibrate:
+        calibrate(args.repeat)
+        return 0
+    return 0 if check(args.repeat, args.scale) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
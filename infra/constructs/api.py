@@ -6,6 +6,45 @@ from aws_cdk import aws_secretsmanager as secretsmanager
 from aws_cdk import aws_stepfunctions as sfn
 from constructs import Construct
 
+from .handler_code import handler_code
+
+
+def start_execution_template(state_machine: sfn.IStateMachine) -> str:
+    """リクエストボディをそのまま実行の入力にするマッピングテンプレート"""
+    return (
+        '#set($input = $input.json("$"))\n'
+        "{\n"
+        f'  "stateMachineArn": "{state_machine.state_machine_arn}",\n'
+        '  "input": "$util.escapeJavaScript($input)"\n'
+        "}"
+    )
+
+
+# StartSyncExecution の結果をレスポンスに変換するテンプレート
+# Saga の失敗（補償済み）は 409、それ以外の失敗・タイムアウトは 500 を返す
+SYNC_EXECUTION_RESPONSE_TEMPLATE = (
+    "#set($status = $input.path('$.status'))\n"
+    "#if($status == 'SUCCEEDED')\n"
+    "{\n"
+    '  "executionArn": "$input.path(\'$.executionArn\')",\n'
+    '  "status": "$status",\n'
+    "  \"booking\": $input.path('$.output')\n"
+    "}\n"
+    "#else\n"
+    "#if($input.path('$.error') == 'SagaFailed')\n"
+    "#set($context.responseOverride.status = 409)\n"
+    "#else\n"
+    "#set($context.responseOverride.status = 500)\n"
+    "#end\n"
+    "{\n"
+    '  "executionArn": "$input.path(\'$.executionArn\')",\n'
+    '  "status": "$status",\n'
+    '  "error": "$util.escapeJavaScript($input.path(\'$.error\'))",\n'
+    '  "cause": "$util.escapeJavaScript($input.path(\'$.cause\'))"\n'
+    "}\n"
+    "#end"
+)
+
 
 class Api(Construct):
     """API Gateway Construct"""
@@ -18,7 +57,15 @@ class Api(Construct):
         get_trip: _lambda.Function,
         list_trips: _lambda.Function,
         origin_verify_secret: secretsmanager.ISecret,
+        sync_state_machine: sfn.IStateMachine | None = None,
     ) -> None:
+        """
+        Args:
+            state_machine: POST /trips で非同期に実行するステートマシン
+            sync_state_machine: 指定した場合、POST /trips はこの EXPRESS
+                ステートマシンを同期実行して結果を返し、
+                非同期実行は POST /trips/async に移る
+        """
         super().__init__(scope, id)
 
         self.rest_api = apigw.RestApi(
@@ -46,7 +93,9 @@ class Api(Construct):
             "OriginVerifyAuthorizerFn",
             runtime=_lambda.Runtime.PYTHON_3_14,
             handler="authorizer.handler.lambda_handler",
-            code=_lambda.Code.from_asset("src"),
+            code=handler_code(
+                "authorizer.handler.lambda_handler", _lambda.Runtime.PYTHON_3_14
+            ),
             environment={
                 "ORIGIN_VERIFY_SECRET_ARN": origin_verify_secret.secret_arn,
             },
@@ -61,7 +110,6 @@ class Api(Construct):
             results_cache_ttl=Duration.seconds(300),
         )
 
-        # POST /trips -> Step Functions (非同期)
         trips_resource = self.rest_api.root.add_resource("trips")
 
         sfn_integration = apigw.AwsIntegration(
@@ -71,13 +119,7 @@ class Api(Construct):
             options=apigw.IntegrationOptions(
                 credentials_role=apigw_role,
                 request_templates={
-                    "application/json": (
-                        '#set($input = $input.json("$"))\n'
-                        "{\n"
-                        f'  "stateMachineArn": "{state_machine.state_machine_arn}",\n'
-                        '  "input": "$util.escapeJavaScript($input)"\n'
-                        "}"
-                    ),
+                    "application/json": start_execution_template(state_machine),
                 },
                 integration_responses=[
                     apigw.IntegrationResponse(
@@ -103,17 +145,63 @@ class Api(Construct):
                 ],
             ),
         )
+        method_responses = [
+            apigw.MethodResponse(status_code="200"),
+            apigw.MethodResponse(status_code="400"),
+            apigw.MethodResponse(status_code="500"),
+        ]
 
-        trips_resource.add_method(
-            "POST",
-            sfn_integration,
-            method_responses=[
-                apigw.MethodResponse(status_code="200"),
-                apigw.MethodResponse(status_code="400"),
-                apigw.MethodResponse(status_code="500"),
-            ],
-            authorizer=authorizer,
-        )
+        if sync_state_machine is None:
+            # POST /trips -> Step Functions (非同期)
+            trips_resource.add_method(
+                "POST",
+                sfn_integration,
+                method_responses=method_responses,
+                authorizer=authorizer,
+            )
+        else:
+            # POST /trips -> Step Functions EXPRESS (同期)
+            # API Gateway の統合タイムアウト（29秒）に収まる予約フロー用
+            sync_integration = apigw.StepFunctionsIntegration.start_execution(
+                sync_state_machine,
+                request_templates={
+                    "application/json": start_execution_template(sync_state_machine),
+                },
+                integration_responses=[
+                    apigw.IntegrationResponse(
+                        status_code="200",
+                        response_templates={
+                            "application/json": SYNC_EXECUTION_RESPONSE_TEMPLATE,
+                        },
+                    ),
+                    apigw.IntegrationResponse(
+                        status_code="400",
+                        selection_pattern="4\\d{2}",
+                    ),
+                    apigw.IntegrationResponse(
+                        status_code="500",
+                        selection_pattern="5\\d{2}",
+                    ),
+                ],
+            )
+            trips_resource.add_method(
+                "POST",
+                sync_integration,
+                method_responses=[
+                    *method_responses,
+                    apigw.MethodResponse(status_code="409"),
+                ],
+                authorizer=authorizer,
+            )
+
+            # POST /trips/async -> Step Functions (非同期)
+            # 長時間かかる Saga や、実行結果をポーリングで取得するクライアント用
+            trips_resource.add_resource("async").add_method(
+                "POST",
+                sfn_integration,
+                method_responses=method_responses,
+                authorizer=authorizer,
+            )
 
         # GET /trips -> Lambda (list_trips)
         trips_resource.add_method(
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import compileall
+import logging
+import os
+import py_compile
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from aws_cdk import aws_lambda as _lambda
+
+logger = logging.getLogger(__name__)
+
+# 実行時に /var/task・/opt へ書き込めないため、.pyc はバンドル時に作成する。
+# unchecked-hash の .pyc はソースの mtime に依存せず、実行時の検証も行わない。
+COMPILEALL_ARGS = ["-m", "compileall", "-q", "--invalidation-mode", "unchecked-hash"]
+
+# レイヤーから取り除くディレクトリ・ファイル
+PRUNED_DIRECTORIES = frozenset({"__pycache__", "tests", "test"})
+PRUNED_SUFFIXES = (".pyi",)
+# dist-info のうち実行時に参照されないファイル（METADATA・ライセンスは残す）
+PRUNED_DIST_INFO_FILES = frozenset(
+    {"RECORD", "INSTALLER", "REQUESTED", "WHEEL", "direct_url.json"}
+)
+
+# レイヤーのバンドル結果を再利用するローカルキャッシュ（既定は ~/.cache 配下）
+BUNDLE_CACHE_NAME = "serverless-trip-saga-bundles"
+DEFAULT_BUNDLE_CACHE_MAX_ENTRIES = 8
+
+
+def runtime_python_version(runtime: _lambda.Runtime) -> str:
+    """ランタイム名から Python のバージョンを取り出す（例: python3.14 → 3.14）"""
+    return runtime.name.removeprefix("python")
+
+
+def byte_compile(directory: Path, runtime: _lambda.Runtime) -> bool:
+    """directory 配下の .py を unchecked-hash の .pyc にコンパイルする
+
+    .pyc は Python のバージョンごとに別ファイルのため、
+    synth を実行している Python がランタイムと異なる場合は作成しない。
+    """
+    current = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if current != runtime_python_version(runtime):
+        logger.warning(
+            "Skipping byte-compilation: synth runs Python %s, runtime is %s",
+            current,
+            runtime.name,
+        )
+        return False
+    return bool(
+        compileall.compile_dir(
+            directory,
+            quiet=1,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+    )
+
+
+def prune(directory: Path) -> None:
+    """テスト・キャッシュ・型スタブ・不要な dist-info ファイルを削除する"""
+    for path in sorted(directory.rglob("*"), reverse=True):
+        if not path.exists():
+            continue
+        if path.is_dir():
+            if path.name in PRUNED_DIRECTORIES:
+                shutil.rmtree(path)
+        elif path.suffix in PRUNED_SUFFIXES or (
+            path.parent.name.endswith(".dist-info")
+            and path.name in PRUNED_DIST_INFO_FILES
+        ):
+            path.unlink()
+
+
+def directory_size(directory: Path) -> tuple[int, int]:
+    """directory 配下のファイル数と合計バイト数"""
+    files = [path for path in directory.rglob("*") if path.is_file()]
+    return len(files), sum(path.stat().st_size for path in files)
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        # 別ファイルシステムなどでハードリンクできない場合はコピーする
+        shutil.copy2(source, target)
+
+
+class BundleCache:
+    """バンドル結果をキーごとに保存するローカルキャッシュ
+
+    エントリはキー名のディレクトリで、取り出すときは出力先へハードリンクする。
+    使われた順（ディレクトリの mtime）に max_entries 件だけ残す。
+    """
+
+    def __init__(
+        self, root: Path, max_entries: int = DEFAULT_BUNDLE_CACHE_MAX_ENTRIES
+    ) -> None:
+        self.root = root
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_env(cls) -> BundleCache | None:
+        """BUNDLE_CACHE_* 環境変数から作成する（MAX_ENTRIES が 0 なら None）"""
+        max_entries = int(
+            os.getenv("BUNDLE_CACHE_MAX_ENTRIES", DEFAULT_BUNDLE_CACHE_MAX_ENTRIES)
+        )
+        if max_entries <= 0:
+            return None
+        cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+        root = os.getenv("BUNDLE_CACHE_DIR") or Path(cache_home) / BUNDLE_CACHE_NAME
+        return cls(Path(root), max_entries)
+
+    def restore(self, key: str, target: Path) -> bool:
+        """キーのエントリを target に展開する（エントリがなければ False）"""
+        entry = self.root / key
+        if not entry.is_dir():
+            return False
+        shutil.copytree(entry, target, copy_function=_link_or_copy, dirs_exist_ok=True)
+        os.utime(entry)
+        return True
+
+    def store(self, key: str, source: Path) -> None:
+        """source の内容をキーのエントリとして保存し、古いエントリを削除する"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.root))
+        shutil.copytree(
+            source, staging, copy_function=_link_or_copy, dirs_exist_ok=True
+        )
+        try:
+            staging.rename(self.root / key)
+        except OSError:
+            # 並行して同じキーが保存された場合はそちらを使う
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def evict(self) -> None:
+        """最近使われた max_entries 件を残して削除する"""
+        entries = sorted(
+            (
+                path
+                for path in self.root.iterdir()
+                if path.is_dir() and not path.name.startswith(".")
+            ),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self.max_entries :]:
+            shutil.rmtree(entry, ignore_errors=True)
@@ -1,13 +1,10 @@
-from aws_cdk import (
+from aws_cdk import (  # isort: skip
+    Duration,
     aws_apigateway as apigw,
-)
-from aws_cdk import (
     aws_cloudfront as cloudfront,
-)
-from aws_cdk import (
     aws_cloudfront_origins as origins,
+    aws_secretsmanager as secretsmanager,
 )
-from aws_cdk import aws_secretsmanager as secretsmanager
 from constructs import Construct
 
 
@@ -29,6 +26,22 @@ class Cdn(Construct):
             },
         )
 
+        # クエリ文字列（limit / next_token）をキャッシュキーに含めて
+        # ページごとに別オブジェクトとしてキャッシュする。
+        # 既定の TTL は 0 とし、キャッシュする時間はオリジンの Cache-Control に従う。
+        # 正規化した Accept-Encoding（br / gzip）もキャッシュキーに含め、
+        # CloudFront が圧縮したレスポンスを圧縮方式ごとにキャッシュする
+        api_cache_policy = cloudfront.CachePolicy(
+            self,
+            "ApiCachePolicy",
+            min_ttl=Duration.seconds(0),
+            default_ttl=Duration.seconds(0),
+            max_ttl=Duration.days(365),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.all(),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+        )
+
         self.distribution = cloudfront.Distribution(
             self,
             "Distribution",
@@ -37,7 +50,9 @@ class Cdn(Construct):
                 # 全メソッド転送（POST 含む）、キャッシュは GET/HEAD のみ
                 allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
                 cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
-                cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                cache_policy=api_cache_policy,
+                # オリジンは非圧縮の JSON を返し、ビューアーへは br / gzip で圧縮する
+                compress=True,
                 viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
                 origin_request_policy=cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER,
             ),
@@ -1,7 +1,21 @@
+from aws_cdk import Duration
 from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_lambda_event_sources as event_sources
 from constructs import Construct
 
+from .handler_code import handler_code
+from .layers import Layers
+
+# Lambda のタイムアウト。ハンドラーはここから安全マージンを引いた時刻を締め切りとし
+# （services.shared.infrastructure.deadline）、DynamoDB 呼び出しの
+# タイムアウトと試行回数をその中に収める。
+FUNCTION_TIMEOUT = Duration.seconds(10)
+# ストリームのバッチ（最大 100 件）を処理する関数
+STREAM_FUNCTION_TIMEOUT = Duration.seconds(30)
+# deadline.DEFAULT_SAFETY_MARGIN_MS と同じ値を明示する
+DEADLINE_SAFETY_MARGIN_MS = 500
+
 
 class Functions(Construct):
     """Lambda 関数を管理する Construct"""
@@ -11,7 +25,7 @@ class Functions(Construct):
         scope: Construct,
         id: str,
         table: dynamodb.Table,
-        common_layer: _lambda.LayerVersion,
+        layers: Layers,
     ) -> None:
         super().__init__(scope, id)
 
@@ -20,7 +34,8 @@ class Functions(Construct):
             "services.flight.handlers.reserve.lambda_handler",
             "flight-service",
             table,
-            common_layer,
+            layers,
+            snap_start=True,
         )
 
         self.flight_cancel = self._create_function(
@@ -28,7 +43,7 @@ class Functions(Construct):
             "services.flight.handlers.cancel.lambda_handler",
             "flight-service",
             table,
-            common_layer,
+            layers,
         )
 
         self.hotel_reserve = self._create_function(
@@ -36,7 +51,8 @@ class Functions(Construct):
             "services.hotel.handlers.reserve.lambda_handler",
             "hotel-service",
             table,
-            common_layer,
+            layers,
+            snap_start=True,
         )
 
         self.hotel_cancel = self._create_function(
@@ -44,7 +60,7 @@ class Functions(Construct):
             "services.hotel.handlers.cancel.lambda_handler",
             "hotel-service",
             table,
-            common_layer,
+            layers,
         )
 
         self.payment_process = self._create_function(
@@ -52,7 +68,8 @@ class Functions(Construct):
             "services.payment.handlers.process.lambda_handler",
             "payment-service",
             table,
-            common_layer,
+            layers,
+            snap_start=True,
         )
 
         self.payment_refund = self._create_function(
@@ -60,7 +77,7 @@ class Functions(Construct):
             "services.payment.handlers.refund.lambda_handler",
             "payment-service",
             table,
-            common_layer,
+            layers,
         )
 
         for fn in [
@@ -78,7 +95,7 @@ class Functions(Construct):
             "services.trip.handlers.get_trip.lambda_handler",
             "trip-service",
             table,
-            common_layer,
+            layers,
         )
 
         self.list_trips = self._create_function(
@@ -86,12 +103,48 @@ class Functions(Construct):
             "services.trip.handlers.list_trips.lambda_handler",
             "trip-service",
             table,
-            common_layer,
+            layers,
         )
 
+        # 遅い読み取りへのヘッジリクエスト（"true" で有効化）
+        self.get_trip.add_environment("HEDGING_ENABLED", "false")
         table.grant_read_data(self.get_trip)
         table.grant_read_data(self.list_trips)
 
+        self.project_trip_summary = self._create_function(
+            "ProjectTripSummaryLambda",
+            "services.trip.handlers.project_trip_summary.lambda_handler",
+            "trip-service",
+            table,
+            layers,
+            timeout=STREAM_FUNCTION_TIMEOUT,
+        )
+        table.grant_read_write_data(self.project_trip_summary)
+        self.project_trip_summary.add_event_source(
+            event_sources.DynamoEventSource(
+                table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=100,
+                max_batching_window=Duration.seconds(1),
+                bisect_batch_on_error=True,
+                retry_attempts=10,
+                report_batch_item_failures=True,
+                # サマリー自身やシャードマップの変更では起動しない
+                filters=[
+                    _lambda.FilterCriteria.filter(
+                        {
+                            "dynamodb": {
+                                "Keys": {
+                                    "SK": {"S": _lambda.FilterRule.begins_with(prefix)}
+                                }
+                            }
+                        }
+                    )
+                    for prefix in ("FLIGHT#", "HOTEL#", "PAYMENT#")
+                ],
+            )
+        )
+
         self.all_functions = [
             self.flight_reserve,
             self.flight_cancel,
@@ -101,6 +154,7 @@ class Functions(Construct):
             self.payment_refund,
             self.get_trip,
             self.list_trips,
+            self.project_trip_summary,
         ]
 
     def _create_function(
@@ -109,17 +163,31 @@ class Functions(Construct):
         handler: str,
         service_name: str,
         table: dynamodb.Table,
-        common_layer: _lambda.LayerVersion,
+        layers: Layers,
+        snap_start: bool = False,
+        timeout: Duration = FUNCTION_TIMEOUT,
     ) -> _lambda.Function:
+        """Lambda 関数を作成する
+
+        snap_start=True の関数は、Deployment のエイリアスが指す発行済みバージョンで
+        SnapStart を有効にする（スナップショット前の初期化は各ハンドラーの prime）。
+        """
         return _lambda.Function(
             self,
             id,
-            runtime=_lambda.Runtime.PYTHON_3_14,
+            runtime=layers.runtime,
+            architecture=layers.architecture,
             handler=handler,
-            code=_lambda.Code.from_asset("src"),
-            layers=[common_layer],
+            code=handler_code(handler, layers.runtime),
+            layers=layers.for_handler(handler),
+            timeout=timeout,
             environment={
                 "TABLE_NAME": table.table_name,
                 "POWERTOOLS_SERVICE_NAME": service_name,
+                "POWERTOOLS_METRICS_NAMESPACE": "ServerlessTripSaga",
+                "DEADLINE_SAFETY_MARGIN_MS": str(DEADLINE_SAFETY_MARGIN_MS),
             },
+            snap_start=_lambda.SnapStartConf.ON_PUBLISHED_VERSIONS
+            if snap_start
+            else None,
         )
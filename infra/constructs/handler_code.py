@@ -0,0 +1,167 @@
+import ast
+import hashlib
+import shlex
+import shutil
+from pathlib import Path
+
+import jsii
+from aws_cdk import AssetHashType, BundlingOptions, ILocalBundling
+from aws_cdk import aws_lambda as _lambda
+
+from .bundling import COMPILEALL_ARGS, byte_compile
+
+SOURCE_ROOT = "src"
+
+# バンドルの作り方を変えたら更新する（アセットハッシュに含める）
+BUNDLE_FORMAT_VERSION = "1"
+
+
+def module_path(source_root: Path, module: str) -> Path | None:
+    """モジュール名に対応する source_root 配下のファイル（なければ None）"""
+    base = source_root.joinpath(*module.split("."))
+    package_init = base / "__init__.py"
+    if package_init.is_file():
+        return package_init
+    module_file = base.with_suffix(".py")
+    if module_file.is_file():
+        return module_file
+    return None
+
+
+def imported_modules(path: Path, module: str) -> set[str]:
+    """ファイル内の import 文から参照されるモジュール名の候補を集める
+
+    関数内・TYPE_CHECKING ブロック内の import も含める。
+    from X import Y の Y はサブモジュールの可能性があるため X.Y も候補にする。
+    """
+    package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+    names: set[str] = set()
+    for node in ast.walk(ast.parse(path.read_text(), filename=str(path))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                anchor = parts[: len(parts) - (node.level - 1)]
+                base = ".".join([*anchor, node.module] if node.module else anchor)
+            else:
+                base = node.module or ""
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+def module_closure(module: str, source_root: Path) -> list[Path]:
+    """module から静的な import をたどって到達する source_root 配下のファイル
+
+    親パッケージの __init__.py も含める。source_root 外のモジュール
+    （標準ライブラリ・レイヤーの依存）はたどらない。
+    """
+    pending = [module]
+    seen: set[str] = set()
+    files: set[Path] = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+
+        parts = name.split(".")
+        pending.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+
+        path = module_path(source_root, name)
+        if path is None:
+            continue
+        files.add(path)
+        pending.extend(imported_modules(path, name))
+    return sorted(files)
+
+
+def external_imports(module: str, source_root: Path) -> set[str]:
+    """module から到達するファイルが import する、source_root 外のトップレベル名"""
+    names: set[str] = set()
+    for path in module_closure(module, source_root):
+        relative = path.relative_to(source_root).with_suffix("")
+        parts = relative.parts[:-1] if relative.name == "__init__" else relative.parts
+        for name in imported_modules(path, ".".join(parts)):
+            top = name.split(".")[0]
+            if top and module_path(source_root, top) is None:
+                names.add(top)
+    return names
+
+
+def closure_hash(files: list[Path], source_root: Path, runtime: _lambda.Runtime) -> str:
+    """対象ファイルの相対パスと内容、ランタイムから計算するアセットハッシュ"""
+    digest = hashlib.sha256()
+    digest.update(f"{BUNDLE_FORMAT_VERSION}:{runtime.name}".encode())
+    for path in files:
+        digest.update(path.relative_to(source_root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@jsii.implements(ILocalBundling)
+class HandlerLocalBundling:
+    """ハンドラーから到達するファイルだけをコピーし、バイトコンパイルするBundlingクラス"""
+
+    def __init__(
+        self, source_root: str, files: list[str], runtime: _lambda.Runtime
+    ) -> None:
+        self.source_root = source_root
+        self.files = files
+        self.runtime = runtime
+
+    def try_bundle(self, output_dir: str, options: BundlingOptions) -> bool:
+        """ローカルでバンドリングを試行する。
+
+        Args:
+            output_dir: 出力先ディレクトリ
+            options: BundlingOptions（未使用だが必須）
+
+        Returns:
+            True: バンドリング成功（Dockerをスキップ）
+        """
+        del options  # unused
+        for relative in self.files:
+            target = Path(output_dir) / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(Path(self.source_root) / relative, target)
+
+        byte_compile(Path(output_dir), self.runtime)
+        return True
+
+
+def handler_code(
+    handler: str,
+    runtime: _lambda.Runtime,
+    source_root: str = SOURCE_ROOT,
+) -> _lambda.AssetCode:
+    """ハンドラーが import するモジュールだけを含むアセットを作成する
+
+    アセットハッシュは対象ファイルの内容から計算するため、
+    他のサービスのコードを変更しても、この関数のアセットは変わらない。
+    """
+    root = Path(source_root)
+    module = handler.rpartition(".")[0]
+    files = [path.relative_to(root).as_posix() for path in module_closure(module, root)]
+    if not files:
+        raise ValueError(f"Handler module not found under {source_root}: {module}")
+
+    command = " && ".join(
+        [
+            f"cp --parents {' '.join(shlex.quote(f) for f in files)} /asset-output",
+            f"python {' '.join(COMPILEALL_ARGS)} /asset-output",
+        ]
+    )
+    return _lambda.Code.from_asset(
+        source_root,
+        asset_hash_type=AssetHashType.CUSTOM,
+        asset_hash=closure_hash([root / relative for relative in files], root, runtime),
+        bundling=BundlingOptions(
+            image=runtime.bundling_image,
+            command=["bash", "-c", command],
+            local=HandlerLocalBundling(source_root, files, runtime),
+        ),
+    )
@@ -1,21 +1,107 @@
+import hashlib
 import logging
+import re
+import shlex
 import subprocess
+import sys
+import tempfile
 from pathlib import Path
 
 import jsii
-from aws_cdk import BundlingOptions, ILocalBundling
+from aws_cdk import AssetHashType, BundlingOptions, ILocalBundling
 from aws_cdk import aws_lambda as _lambda
 from constructs import Construct
 
+from .bundling import (
+    COMPILEALL_ARGS,
+    PRUNED_DIRECTORIES,
+    PRUNED_DIST_INFO_FILES,
+    PRUNED_SUFFIXES,
+    BundleCache,
+    byte_compile,
+    directory_size,
+    prune,
+    runtime_python_version,
+)
+from .handler_code import SOURCE_ROOT, external_imports
+
 logger = logging.getLogger(__name__)
 
+LAYER_SOURCE_PATH = "layers/common_layer"
+
+# Lambda の Python ランタイムに含まれるため、レイヤーには入れないパッケージ
+RUNTIME_PROVIDED_PACKAGES = frozenset({"boto3", "botocore"})
+
+# アーキテクチャ → (uv の --python-platform, pip の --platform)
+PLATFORMS = {
+    _lambda.Architecture.X86_64.name: ("x86_64-manylinux2014", "manylinux2014_x86_64"),
+    _lambda.Architecture.ARM_64.name: (
+        "aarch64-manylinux2014",
+        "manylinux2014_aarch64",
+    ),
+}
+
+
+def normalize_name(name: str) -> str:
+    """パッケージ名を比較用に正規化する（PEP 503）"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def pinned_requirements(requirements_path: Path) -> dict[str, str]:
+    """uv export の requirements.txt から パッケージ名 → 固定バージョンの行 を取り出す
+
+    ハッシュ・コメントは除き、環境マーカーは残す。
+    """
+    pinned: dict[str, str] = {}
+    for line in requirements_path.read_text().splitlines():
+        if not line or line[0].isspace() or line.startswith(("#", "-")):
+            continue
+        requirement = line.removesuffix("\\").strip()
+        name = re.split(r"[\s=<>!~;\[]", requirement, maxsplit=1)[0]
+        pinned[normalize_name(name)] = requirement
+    return pinned
+
+
+def handler_packages(
+    handler: str, pinned: dict[str, str], source_root: str = SOURCE_ROOT
+) -> list[str]:
+    """ハンドラーから到達するコードが import する、レイヤーに入れるパッケージ
+
+    requirements.txt にないもの（標準ライブラリ・任意の依存）と
+    ランタイムに含まれるものは除く。
+    """
+    module = handler.rpartition(".")[0]
+    names = {
+        normalize_name(name) for name in external_imports(module, Path(source_root))
+    }
+    return sorted((names & pinned.keys()) - RUNTIME_PROVIDED_PACKAGES)
+
 
 @jsii.implements(ILocalBundling)
 class PythonLocalBundling:
     """ローカル環境でpip installを実行するBundlingクラス"""
 
-    def __init__(self, source_path: str) -> None:
+    def __init__(
+        self,
+        source_path: str,
+        packages: list[str] | None = None,
+        architecture: _lambda.Architecture = _lambda.Architecture.X86_64,
+        runtime: _lambda.Runtime = _lambda.Runtime.PYTHON_3_14,
+        cache: BundleCache | None = None,
+    ) -> None:
+        """
+        Args:
+            source_path: requirements.txt のあるディレクトリ
+            packages: インストールするパッケージ（None なら requirements.txt 全体）
+            architecture: ビルド対象のアーキテクチャ
+            runtime: ビルド対象のランタイム
+            cache: バンドル結果のキャッシュ（省略時は BUNDLE_CACHE_* 環境変数から）
+        """
         self.source_path = source_path
+        self.packages = packages
+        self.architecture = architecture
+        self.runtime = runtime
+        self.cache = cache or BundleCache.from_env()
 
     def try_bundle(self, output_dir: str, options: BundlingOptions) -> bool:
         """ローカルでバンドリングを試行する。
@@ -36,18 +122,63 @@ class PythonLocalBundling:
             logger.warning("requirements.txt not found: %s", requirements_path)
             return False
 
-        # uvを優先し、なければpipを使用
-        if self._try_uv_install(requirements_path, target_dir):
+        cache_key = self._cache_key(requirements_path)
+        if self.cache is not None and self.cache.restore(cache_key, target_dir):
+            logger.info("Layer cache hit: %s (%s)", self._name, cache_key[:12])
             return True
+        logger.info("Layer cache miss: %s (%s)", self._name, cache_key[:12])
 
-        if self._try_pip_install(requirements_path, target_dir):
-            return True
+        with tempfile.TemporaryDirectory() as work_dir:
+            install_args = self._install_args(requirements_path, Path(work_dir))
+
+            # uvを優先し、なければpipを使用
+            if self._try_uv_install(install_args, target_dir) or (
+                self._try_pip_install(install_args, target_dir)
+            ):
+                self._finalize(target_dir)
+                if self.cache is not None and target_dir.exists():
+                    self.cache.store(cache_key, target_dir)
+                return True
 
         logger.warning("Local bundling failed, falling back to Docker")
         return False
 
-    def _try_uv_install(self, requirements_path: Path, target_dir: Path) -> bool:
+    @property
+    def _name(self) -> str:
+        return " ".join(self.packages or ["requirements.txt"])
+
+    def _cache_key(self, requirements_path: Path) -> str:
+        """requirements.txt・パッケージ・ランタイム・アーキテクチャから計算するキー
+
+        .pyc は synth を実行する Python がランタイムと同じ場合だけ作成するため、
+        その Python のバージョンもキーに含める。
+        """
+        digest = hashlib.sha256(requirements_path.read_bytes())
+        for part in [
+            self._name,
+            self.runtime.name,
+            self.architecture.name,
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+        ]:
+            digest.update(b"\0" + part.encode())
+        return digest.hexdigest()
+
+    def _install_args(self, requirements_path: Path, work_dir: Path) -> list[str]:
+        """インストール対象の引数
+
+        packages を指定した場合は、requirements.txt の固定バージョンを
+        制約として、そのパッケージと依存だけをインストールする。
+        """
+        if self.packages is None:
+            return ["-r", str(requirements_path)]
+        constraints_path = work_dir / "constraints.txt"
+        constraints = pinned_requirements(requirements_path).values()
+        constraints_path.write_text("".join(f"{line}\n" for line in constraints))
+        return [*self.packages, "-c", str(constraints_path)]
+
+    def _try_uv_install(self, install_args: list[str], target_dir: Path) -> bool:
         """uvでインストールを試行する。"""
+        uv_platform, _ = PLATFORMS[self.architecture.name]
         try:
             logger.info("Trying local bundling with uv...")
             subprocess.run(
@@ -55,10 +186,15 @@ class PythonLocalBundling:
                     "uv",
                     "pip",
                     "install",
-                    "-r",
-                    str(requirements_path),
+                    *install_args,
                     "--target",
                     str(target_dir),
+                    "--python-platform",
+                    uv_platform,
+                    "--python-version",
+                    runtime_python_version(self.runtime),
+                    "--only-binary",
+                    ":all:",
                     "--quiet",
                 ],
                 check=True,
@@ -72,18 +208,25 @@ class PythonLocalBundling:
             logger.debug("uv install failed: %s", e)
             return False
 
-    def _try_pip_install(self, requirements_path: Path, target_dir: Path) -> bool:
+    def _try_pip_install(self, install_args: list[str], target_dir: Path) -> bool:
         """pipでインストールを試行する。"""
+        _, pip_platform = PLATFORMS[self.architecture.name]
         try:
             logger.info("Trying local bundling with pip...")
             subprocess.run(
                 [
                     "pip",
                     "install",
-                    "-r",
-                    str(requirements_path),
+                    *install_args,
                     "-t",
                     str(target_dir),
+                    "--platform",
+                    pip_platform,
+                    "--implementation",
+                    "cp",
+                    "--python-version",
+                    runtime_python_version(self.runtime),
+                    "--only-binary=:all:",
                     "--quiet",
                 ],
                 check=True,
@@ -97,32 +240,115 @@ class PythonLocalBundling:
             logger.debug("pip install failed: %s", e)
             return False
 
+    def _finalize(self, target_dir: Path) -> None:
+        """不要なファイルを削除して .pyc を作成し、レイヤーのサイズを出力する"""
+        if not target_dir.exists():
+            return
+        prune(target_dir)
+        byte_compile(target_dir, self.runtime)
+        files, size = directory_size(target_dir)
+        logger.info(
+            "Layer %s (%s): %d files, %.1f MiB unzipped",
+            self._name,
+            self.architecture.name,
+            files,
+            size / 2**20,
+        )
+
+
+def docker_command(packages: list[str], constraints: list[str]) -> str:
+    """Docker でのバンドリングコマンド（ローカルと同じ削除・コンパイルを行う）"""
+    target = "/asset-output/python"
+    directories = " -o ".join(f"-name {name}" for name in sorted(PRUNED_DIRECTORIES))
+    dist_info_files = " -o ".join(
+        f"-name {name}" for name in sorted(PRUNED_DIST_INFO_FILES)
+    )
+    stubs = " -o ".join(f"-name '*{suffix}'" for suffix in PRUNED_SUFFIXES)
+    return " && ".join(
+        [
+            "printf '%s\\n' "
+            + " ".join(shlex.quote(line) for line in constraints)
+            + " > /tmp/constraints.txt",
+            f"pip install {' '.join(packages)} -c /tmp/constraints.txt -t {target}",
+            f"find {target} -depth -type d \\( {directories} \\) -exec rm -rf {{}} +",
+            f"find {target} -type f \\( {stubs} \\) -delete",
+            f"find {target} -path '*.dist-info/*' \\( {dist_info_files} \\) -delete",
+            f"python {' '.join(COMPILEALL_ARGS)} {target}",
+        ]
+    )
+
 
 class Layers(Construct):
-    """Lambda Layers Construct"""
+    """Lambda Layers Construct
+
+    関数ごとに、ハンドラーから到達するコードが import するパッケージだけを
+    含むレイヤーを作成する。同じパッケージ構成の関数は同じレイヤーを共有する。
+    """
 
-    def __init__(self, scope: Construct, id: str) -> None:
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        architecture: _lambda.Architecture = _lambda.Architecture.X86_64,
+        runtime: _lambda.Runtime = _lambda.Runtime.PYTHON_3_14,
+    ) -> None:
         super().__init__(scope, id)
 
-        # NOTE: self.common_layerに格納することで、
-        # 他のConstructやStackから参照可能にしている
-        layer_source_path = "layers/common_layer"
+        self.architecture = architecture
+        self.runtime = runtime
+        self._requirements_path = Path(LAYER_SOURCE_PATH) / "requirements.txt"
+        self._pinned = pinned_requirements(self._requirements_path)
+        self._layers: dict[tuple[str, ...], _lambda.LayerVersion] = {}
+
+    def for_handler(self, handler: str) -> list[_lambda.ILayerVersion]:
+        """ハンドラーに必要なレイヤー（必要なパッケージがなければ空）"""
+        packages = tuple(handler_packages(handler, self._pinned))
+        if not packages:
+            return []
+        if packages not in self._layers:
+            self._layers[packages] = self._create_layer(packages)
+        return [self._layers[packages]]
+
+    def _create_layer(self, packages: tuple[str, ...]) -> _lambda.LayerVersion:
+        name = "".join(
+            part.capitalize() for package in packages for part in package.split("-")
+        )
+        constraints = list(self._pinned.values())
+        asset_hash = hashlib.sha256(
+            "\n".join(
+                [
+                    self._requirements_path.read_text(),
+                    *packages,
+                    self.architecture.name,
+                    self.runtime.name,
+                ]
+            ).encode()
+        ).hexdigest()
 
-        self.common_layer = _lambda.LayerVersion(
+        return _lambda.LayerVersion(
             self,
-            "CommonLayer",
+            f"{name}Layer",
             code=_lambda.Code.from_asset(
-                layer_source_path,
+                LAYER_SOURCE_PATH,
+                asset_hash_type=AssetHashType.CUSTOM,
+                asset_hash=asset_hash,
                 bundling=BundlingOptions(
-                    image=_lambda.Runtime.PYTHON_3_14.bundling_image,
+                    image=self.runtime.bundling_image,
+                    platform=self.architecture.docker_platform,
                     command=[
                         "bash",
                         "-c",
-                        "pip install -r requirements.txt -t /asset-output/python",
+                        docker_command(list(packages), constraints),
                     ],
-                    local=PythonLocalBundling(layer_source_path),
+                    local=PythonLocalBundling(
+                        LAYER_SOURCE_PATH,
+                        packages=list(packages),
+                        architecture=self.architecture,
+                        runtime=self.runtime,
+                    ),
                 ),
             ),
-            compatible_runtimes=[_lambda.Runtime.PYTHON_3_14],
-            description="Common dependencies Library",
+            compatible_runtimes=[self.runtime],
+            compatible_architectures=[self.architecture],
+            description=f"Dependencies: {', '.join(packages)}",
         )
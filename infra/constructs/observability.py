@@ -27,7 +27,7 @@ class Observability(Construct):
         scope: Construct,
         id: str,
         functions: list[_lambda.Function],
-        state_machine: sfn.StateMachine,
+        state_machines: list[sfn.StateMachine],
         datadog_api_key_secret_name: str = "/serverless-trip-saga/datadog-api-key",
         service_name: str = "serverless-trip-saga",
         env: str = "dev",
@@ -90,4 +90,4 @@ class Observability(Construct):
             version="1.0.0",
             forwarder_arn=forwarder_arn,
         )
-        datadog_sfn.add_state_machines([state_machine])
+        datadog_sfn.add_state_machines(state_machines)
@@ -1,9 +1,30 @@
+from aws_cdk import Duration
+from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_lambda as _lambda
 from aws_cdk import aws_stepfunctions as sfn
 from aws_cdk import aws_stepfunctions_tasks as tasks
 from constructs import Construct
 from datadog_cdk_constructs_v2 import DatadogStepFunctions
 
+# 補償で取り消す予約（各サービスのコーデック・ステータスと同じ値）
+# 対象 → (SK のフォーマット, 取り消し後のステータス)
+CANCEL_TARGETS = {
+    "flight": ("FLIGHT#flight_for_{}", "CANCELLED"),
+    "hotel": ("HOTEL#hotel_for_{}", "CANCELED"),
+}
+# 取り消せるステータス（Cancel*Service の from_statuses と同じ）
+CANCELLABLE_STATUSES = ("PENDING", "CONFIRMED")
+CONDITIONAL_CHECK_FAILED = "DynamoDB.ConditionalCheckFailedException"
+
+# 状態に残す呼び出し結果（LambdaInvoke の結果全体ではなく、Payload の一部だけ）
+# 後続のステップは入力の予約内容を使うため、結果は ID とステータスだけを残す
+CANCEL_RESULT_SELECTOR = {"status.$": "$.Payload.status"}
+
+
+def data_selector(*fields: str) -> dict[str, str]:
+    """Payload.data のうち fields だけを残す ResultSelector"""
+    return {f"{field}.$": f"$.Payload.data.{field}" for field in fields}
+
 
 class Orchestration(Construct):
     """Step Functions ステートマシーン"""
@@ -17,7 +38,20 @@ class Orchestration(Construct):
         hotel_reserve: _lambda.IFunction,
         hotel_cancel: _lambda.IFunction,
         payment_process: _lambda.IFunction,
+        table: dynamodb.ITable,
+        parallel_reservations: bool = False,
+        direct_compensations: bool = False,
+        state_machine_type: sfn.StateMachineType = sfn.StateMachineType.STANDARD,
     ):
+        """
+        Args:
+            table: 補償に失敗した旅行を記録するテーブル
+            parallel_reservations: フライトとホテルの予約を Parallel で同時に実行する
+            direct_compensations: 予約の取り消しを Lambda ではなく
+                DynamoDB の UpdateItem で直接行う
+            state_machine_type: ステートマシンの種類
+                （EXPRESS は API からの同期実行用。実行時間は最大5分）
+        """
         super().__init__(scope, id)
 
         lambda_payload = sfn.TaskInput.from_object(
@@ -33,6 +67,7 @@ class Orchestration(Construct):
             lambda_function=flight_reserve,
             payload=lambda_payload,
             retry_on_service_exceptions=True,
+            result_selector=data_selector("booking_id", "status"),
             result_path="$.results.flight",
         )
 
@@ -43,6 +78,7 @@ class Orchestration(Construct):
             lambda_function=hotel_reserve,
             payload=lambda_payload,
             retry_on_service_exceptions=True,
+            result_selector=data_selector("booking_id", "status"),
             result_path="$.results.hotel",
         )
 
@@ -53,43 +89,69 @@ class Orchestration(Construct):
             lambda_function=payment_process,
             payload=lambda_payload,
             retry_on_service_exceptions=True,
+            result_selector=data_selector("payment_id", "status"),
             result_path="$.results.payment",
         )
 
         # 補償タスク
         # NOTE: Step Functions では同じタスクを複数のチェーンで再利用できないため、
         # ロールバックチェーンごとに別のタスクインスタンスを作成する
+        def cancel_step(id: str, target: str, function: _lambda.IFunction):
+            if direct_compensations:
+                return self._direct_cancel(id, target, table)
+            return tasks.LambdaInvoke(
+                self,
+                id,
+                lambda_function=function,
+                payload=lambda_payload,
+                retry_on_service_exceptions=True,
+                result_selector=CANCEL_RESULT_SELECTOR,
+                result_path=f"$.results.{target}_cancel",
+            )
 
         # Hotel の予約を取り消す
-        cancel_hotel_from_payment = tasks.LambdaInvoke(
-            self,
-            "CancelHotelFromPayment",
-            lambda_function=hotel_cancel,
-            payload=lambda_payload,
-            retry_on_service_exceptions=True,
-            result_path="$.results.hotel_cancel",
+        cancel_hotel_from_payment = cancel_step(
+            "CancelHotelFromPayment", "hotel", hotel_cancel
         )
 
         # Flight の予約を取り消す
-        cancel_flight_from_payment = tasks.LambdaInvoke(
-            self,
-            "CancelFlightFromPayment",
-            lambda_function=flight_cancel,
-            payload=lambda_payload,
-            retry_on_service_exceptions=True,
-            result_path="$.results.flight_cancel",
+        cancel_flight_from_payment = cancel_step(
+            "CancelFlightFromPayment", "flight", flight_cancel
         )
 
         # Flight の予約を取り消す
-        cancel_flight_from_hotel = tasks.LambdaInvoke(
-            self,
-            "CancelFlightFromHotel",
-            lambda_function=flight_cancel,
-            payload=lambda_payload,
-            retry_on_service_exceptions=True,
-            result_path="$.results.flight_cancel",
+        cancel_flight_from_hotel = cancel_step(
+            "CancelFlightFromHotel", "flight", flight_cancel
         )
 
+        compensations = [
+            cancel_hotel_from_payment,
+            cancel_flight_from_payment,
+            cancel_flight_from_hotel,
+        ]
+        if parallel_reservations:
+            # Hotel の予約を取り消す（Parallel でフライト予約だけが失敗した場合）
+            cancel_hotel_from_flight = cancel_step(
+                "CancelHotelFromFlight", "hotel", hotel_cancel
+            )
+            compensations.append(cancel_hotel_from_flight)
+
+        # Lambda の残り時間内に終わらず打ち切られた呼び出しは、新しい実行で再試行する
+        # （予約・決済の書き込みとキャンセルは冪等なため再試行しても安全）
+        for task in (
+            reserve_flight_task,
+            reserve_hotel_task,
+            process_payment_task,
+            *([] if direct_compensations else compensations),
+        ):
+            task.add_retry(
+                errors=["DeadlineExceededException"],
+                interval=Duration.seconds(1),
+                max_attempts=2,
+                backoff_rate=2.0,
+                jitter_strategy=sfn.JitterType.FULL,
+            )
+
         # 失敗State
         saga_failed_from_payment = sfn.Fail(
             self, "SagaFailedFromPayment", error="SagaFailed"
@@ -98,10 +160,13 @@ class Orchestration(Construct):
             self, "SagaFailedFromHotel", error="SagaFailed"
         )
 
-        # Payment 失敗時（Hotel Cancel → Flight Cancel → Fail）
-        rollback_from_payment = cancel_hotel_from_payment.next(
-            cancel_flight_from_payment
-        ).next(saga_failed_from_payment)
+        # Payment 失敗時（Hotel Cancel と Flight Cancel を同時に実行 → Fail）
+        rollback_from_payment = self._parallel_compensations(
+            cancel_hotel_from_payment,
+            cancel_flight_from_payment,
+            table,
+            saga_failed_from_payment,
+        )
 
         # Hotel 失敗時（Flight Cancel → Fail）
         rollback_from_hotel = cancel_flight_from_hotel.next(saga_failed_from_hotel)
@@ -111,15 +176,256 @@ class Orchestration(Construct):
             rollback_from_payment, result_path="$.error_info"
         )
 
-        reserve_hotel_task.add_catch(rollback_from_hotel, result_path="$.error_info")
+        payment_chain = process_payment_task.next(sfn.Succeed(self, "BookingSucceeded"))
 
         # ステートマシン定義
-        definition = reserve_flight_task.next(reserve_hotel_task).next(
-            process_payment_task.next(sfn.Succeed(self, "BookingSucceeded"))
-        )
+        if parallel_reservations:
+            definition = self._parallel_reservations(
+                reserve_flight_task,
+                reserve_hotel_task,
+                payment_chain,
+                rollback_from_flight=cancel_hotel_from_flight.next(
+                    sfn.Fail(self, "SagaFailedFromFlight", error="SagaFailed")
+                ),
+                rollback_from_hotel=rollback_from_hotel,
+            )
+        else:
+            reserve_hotel_task.add_catch(
+                rollback_from_hotel, result_path="$.error_info"
+            )
+            definition = reserve_flight_task.next(reserve_hotel_task).next(
+                payment_chain
+            )
 
         self.state_machine = sfn.StateMachine(
             self,
             "TripBookingStateMachine",
             definition_body=sfn.DefinitionBody.from_chainable(definition),
+            state_machine_type=state_machine_type,
+        )
+
+    def _parallel_reservations(
+        self,
+        reserve_flight_task: tasks.LambdaInvoke,
+        reserve_hotel_task: tasks.LambdaInvoke,
+        payment_chain: sfn.IChainable,
+        rollback_from_flight: sfn.IChainable,
+        rollback_from_hotel: sfn.IChainable,
+    ) -> sfn.IChainable:
+        """フライトとホテルの予約を同時に実行し、結果に応じて決済か補償へ進む
+
+        各ブランチは失敗を自身で捕捉して {"error": ...} を返すため、
+        片方の失敗でもう片方が中断されることはない。
+        結果は従来どおり $.results.flight / $.results.hotel に格納し、
+        失敗した場合は成功した側の予約だけを取り消す。
+        """
+        reservations = sfn.Parallel(
+            self,
+            "ReserveFlightAndHotel",
+            result_selector={
+                "flight.$": "$[0].results.flight",
+                "hotel.$": "$[1].results.hotel",
+            },
+            result_path="$.results",
+        )
+        for task, name in (
+            (reserve_flight_task, "Flight"),
+            (reserve_hotel_task, "Hotel"),
+        ):
+            task.add_catch(
+                sfn.Pass(
+                    self,
+                    f"{name}ReservationFailed",
+                    parameters={"error.$": "$.error_info"},
+                    result_path=f"$.results.{name.lower()}",
+                ),
+                result_path="$.error_info",
+            )
+            reservations.branch(task)
+
+        flight_failed = sfn.Condition.is_present("$.results.flight.error")
+        hotel_failed = sfn.Condition.is_present("$.results.hotel.error")
+        check = (
+            sfn.Choice(self, "CheckReservations")
+            .when(
+                sfn.Condition.and_(flight_failed, hotel_failed),
+                sfn.Fail(self, "SagaFailedFromReservations", error="SagaFailed"),
+            )
+            .when(flight_failed, rollback_from_flight)
+            .when(hotel_failed, rollback_from_hotel)
+            .otherwise(payment_chain)
+        )
+        return reservations.next(check)
+
+    def _parallel_compensations(
+        self,
+        cancel_hotel: sfn.IChainable,
+        cancel_flight: sfn.IChainable,
+        table: dynamodb.ITable,
+        saga_failed: sfn.IChainable,
+    ) -> sfn.IChainable:
+        """ホテルとフライトの取り消しを同時に実行し、失敗があれば記録する
+
+        各ブランチは失敗を再試行し、それでも失敗した場合は {"error": ...} を返す。
+        結果は $.results.hotel_cancel / $.results.flight_cancel に格納する。
+        どちらかが失敗した場合は、後から再実行できるよう
+        COMPENSATION_FAILURE アイテムを TRIP#{trip_id} パーティションに書き込む。
+        """
+        compensations = sfn.Parallel(
+            self,
+            "CancelReservationsFromPayment",
+            # 決済失敗時の $.results はフライト・ホテルの予約結果だけを持つ
+            result_selector={
+                "flight.$": "$[0].results.flight",
+                "hotel.$": "$[0].results.hotel",
+                "hotel_cancel.$": "$[0].results.hotel_cancel",
+                "flight_cancel.$": "$[1].results.flight_cancel",
+            },
+            result_path="$.results",
+        )
+        for step, name in (
+            (cancel_hotel, "hotel_cancel"),
+            (cancel_flight, "flight_cancel"),
+        ):
+            task = step.start_state
+            task.add_retry(
+                errors=[sfn.Errors.TASKS_FAILED],
+                interval=Duration.seconds(2),
+                max_attempts=3,
+                backoff_rate=2.0,
+                jitter_strategy=sfn.JitterType.FULL,
+            )
+            task.add_catch(
+                sfn.Pass(
+                    self,
+                    f"{task.node.id}Failed",
+                    parameters={"error.$": "$.error_info"},
+                    result_path=f"$.results.{name}",
+                ),
+                result_path="$.error_info",
+            )
+            compensations.branch(step)
+
+        record_failure = tasks.DynamoPutItem(
+            self,
+            "RecordCompensationFailure",
+            table=table,
+            item={
+                "PK": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.format("TRIP#{}", sfn.JsonPath.string_at("$.trip_id"))
+                ),
+                "SK": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.format(
+                        "COMPENSATION_FAILURE#{}",
+                        sfn.JsonPath.string_at("$$.Execution.Name"),
+                    )
+                ),
+                "entity_type": tasks.DynamoAttributeValue.from_string(
+                    "COMPENSATION_FAILURE"
+                ),
+                "trip_id": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.string_at("$.trip_id")
+                ),
+                "execution_arn": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.string_at("$$.Execution.Id")
+                ),
+                "hotel_cancel": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.json_to_string(
+                        sfn.JsonPath.object_at("$.results.hotel_cancel")
+                    )
+                ),
+                "flight_cancel": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.json_to_string(
+                        sfn.JsonPath.object_at("$.results.flight_cancel")
+                    )
+                ),
+                "failed_at": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.string_at("$$.State.EnteredTime")
+                ),
+            },
+            result_path=sfn.JsonPath.DISCARD,
+        )
+
+        check = (
+            sfn.Choice(self, "CheckCompensations")
+            .when(
+                sfn.Condition.or_(
+                    sfn.Condition.is_present("$.results.hotel_cancel.error"),
+                    sfn.Condition.is_present("$.results.flight_cancel.error"),
+                ),
+                record_failure.next(
+                    sfn.Fail(self, "CompensationFailed", error="SagaCompensationFailed")
+                ),
+            )
+            .otherwise(saga_failed)
+        )
+        return compensations.next(check)
+
+    def _direct_cancel(
+        self, id: str, target: str, table: dynamodb.ITable
+    ) -> sfn.IChainable:
+        """予約を DynamoDB の条件付き UpdateItem で直接取り消す
+
+        条件は transition_item_status と同じ（アイテムが存在し、取り消せるステータス）。
+        条件チェックの失敗は「取り消し済み または 存在しない」ことを意味するため、
+        キャンセル Lambda と同じく成功として扱う。
+        """
+        sk_format, cancelled_status = CANCEL_TARGETS[target]
+        result_path = f"$.results.{target}_cancel"
+        placeholders = [f":from{index}" for index in range(len(CANCELLABLE_STATUSES))]
+        values = {
+            ":status": tasks.DynamoAttributeValue.from_string(cancelled_status),
+            **{
+                placeholder: tasks.DynamoAttributeValue.from_string(status)
+                for placeholder, status in zip(placeholders, CANCELLABLE_STATUSES)
+            },
+        }
+
+        task = tasks.DynamoUpdateItem(
+            self,
+            id,
+            table=table,
+            key={
+                "PK": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.format("TRIP#{}", sfn.JsonPath.string_at("$.trip_id"))
+                ),
+                "SK": tasks.DynamoAttributeValue.from_string(
+                    sfn.JsonPath.format(sk_format, sfn.JsonPath.string_at("$.trip_id"))
+                ),
+            },
+            update_expression="SET #status = :status",
+            condition_expression=(
+                f"attribute_exists(PK) AND #status IN ({', '.join(placeholders)})"
+            ),
+            expression_attribute_names={"#status": "status"},
+            expression_attribute_values=values,
+            result_selector={"status": "success"},
+            result_path=result_path,
+        )
+        # 条件チェックの失敗は再試行しない（後から追加される再試行より先に評価される）
+        task.add_retry(errors=[CONDITIONAL_CHECK_FAILED], max_attempts=0)
+        task.add_retry(
+            errors=[
+                "DynamoDB.ProvisionedThroughputExceededException",
+                "DynamoDB.ThrottlingException",
+                "DynamoDB.InternalServerErrorException",
+            ],
+            interval=Duration.seconds(1),
+            max_attempts=3,
+            backoff_rate=2.0,
+            jitter_strategy=sfn.JitterType.FULL,
+        )
+        already_cancelled = sfn.Pass(
+            self,
+            f"{id}AlreadyCancelled",
+            result=sfn.Result.from_object(
+                {"status": "success", "message": "Already cancelled or not found"}
+            ),
+            result_path=result_path,
+        )
+        task.add_catch(
+            already_cancelled,
+            errors=[CONDITIONAL_CHECK_FAILED],
+            result_path=sfn.JsonPath.DISCARD,
         )
+        return sfn.Chain.custom(task, [task, already_cancelled], task)
@@ -1,5 +1,6 @@
 from aws_cdk import Stack
 from aws_cdk import aws_secretsmanager as secretsmanager
+from aws_cdk import aws_stepfunctions as sfn
 from constructs import Construct
 
 from infra.constructs import (
@@ -25,7 +26,7 @@ class ServerlessTripSagaStack(Stack):
             self,
             "Functions",
             table=database.table,
-            common_layer=layers.common_layer,
+            layers=layers,
         )
 
         deployment = Deployment(
@@ -44,6 +45,20 @@ class ServerlessTripSagaStack(Stack):
             hotel_reserve=deployment.hotel_reserve_alias,
             hotel_cancel=fns.hotel_cancel,
             payment_process=deployment.payment_process_alias,
+            table=database.table,
+        )
+
+        # POST /trips で同期実行する EXPRESS ステートマシン（定義は上と同じ）
+        express_orchestration = Orchestration(
+            self,
+            "ExpressOrchestration",
+            flight_reserve=deployment.flight_reserve_alias,
+            flight_cancel=fns.flight_cancel,
+            hotel_reserve=deployment.hotel_reserve_alias,
+            hotel_cancel=fns.hotel_cancel,
+            payment_process=deployment.payment_process_alias,
+            table=database.table,
+            state_machine_type=sfn.StateMachineType.EXPRESS,
         )
 
         origin_verify_secret = secretsmanager.Secret(
@@ -60,6 +75,7 @@ class ServerlessTripSagaStack(Stack):
             self,
             "Api",
             state_machine=orchestration.state_machine,
+            sync_state_machine=express_orchestration.state_machine,
             get_trip=fns.get_trip,
             list_trips=fns.list_trips,
             origin_verify_secret=origin_verify_secret,
@@ -76,5 +92,8 @@ class ServerlessTripSagaStack(Stack):
             self,
             "Observability",
             functions=fns.all_functions,
-            state_machine=orchestration.state_machine,
+            state_machines=[
+                orchestration.state_machine,
+                express_orchestration.state_machine,
+            ],
         )
@@ -2,7 +2,7 @@ import hmac
 import logging
 import os
 
-import boto3
+from services.shared.infrastructure.aws import get_client
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -13,7 +13,7 @@ _secret_cache: str | None = None
 def _get_secret() -> str:
     global _secret_cache
     if _secret_cache is None:
-        client = boto3.client("secretsmanager")
+        client = get_client("secretsmanager")
         response = client.get_secret_value(
             SecretId=os.environ["ORIGIN_VERIFY_SECRET_ARN"]
         )
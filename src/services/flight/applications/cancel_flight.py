@@ -1,4 +1,5 @@
 from services.flight.domain.entity import Booking
+from services.flight.domain.enum import BookingStatus
 from services.flight.domain.repository import BookingRepository
 from services.shared.domain import TripId
 
@@ -10,11 +11,17 @@ class CancelFlightService:
         self._repository = repository
 
     def cancel(self, trip_id: TripId) -> Booking | None:
-        """フライト予約をキャンセルする"""
-        booking = self._repository.find_by_trip_id(trip_id)
-        if booking is None:
-            return None
-        expected_status = booking.status
-        booking.cancel()
-        self._repository.update(booking, expected_status=expected_status)
+        """フライト予約をキャンセルする
+
+        事前の読み取りは行わず、条件付き書き込み1回で遷移させる。
+        遷移しなかった場合は現在の状態に Booking.cancel() の規則を適用する
+        （キャンセル済みなら何もせず、それ以外は BusinessRuleViolationException）。
+        """
+        booking = self._repository.transition_status(
+            trip_id,
+            to_status=BookingStatus.CANCELLED,
+            from_statuses=Booking.CANCELLABLE_STATUSES,
+        )
+        if booking is not None:
+            booking.cancel()
         return booking
@@ -17,5 +17,4 @@ class ReserveFlightService:
     def reserve(self, trip_id: TripId, flight_details: FlightDetails) -> Booking:
         """フライトを予約する"""
         booking = self._factory.create(trip_id, flight_details)
-        self._repository.save(booking)
-        return booking
+        return self._repository.save(booking)
@@ -7,6 +7,9 @@ from services.shared.domain.exception import BusinessRuleViolationException
 class Booking(AggregateRoot[BookingId]):
     """フライト予約"""
 
+    # キャンセルできるステータス（条件付き書き込みの遷移元にも使う）
+    CANCELLABLE_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
     def __init__(
         self,
         id: BookingId,
@@ -70,4 +73,8 @@ class Booking(AggregateRoot[BookingId]):
         """予約をキャンセルする"""
         if self._status == BookingStatus.CANCELLED:
             return
+        if self._status not in self.CANCELLABLE_STATUSES:
+            raise BusinessRuleViolationException(
+                f"Cannot cancel booking in {self._status} status"
+            )
         self._status = BookingStatus.CANCELLED
@@ -10,8 +10,8 @@ class BookingRepository(Repository[Booking, BookingId]):
     """フライト予約レポジトリ"""
 
     @abstractmethod
-    def save(self, booking: Booking) -> None:
-        """永続化する"""
+    def save(self, booking: Booking) -> Booking:
+        """永続化する（既に同じ予約があれば保存済みの予約を返す）"""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,9 +24,37 @@ class BookingRepository(Repository[Booking, BookingId]):
         """TripIDで検索"""
         raise NotImplementedError
 
+    @abstractmethod
+    def save_many(self, bookings: list[Booking]) -> None:
+        """複数の予約をまとめて保存する（条件なしの上書き）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_ids(self, booking_ids: list[BookingId]) -> list[Booking | None]:
+        """複数の予約IDでまとめて検索する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_trip_ids(self, trip_ids: list[TripId]) -> list[Booking | None]:
+        """複数の TripID でまとめて検索する"""
+        raise NotImplementedError
+
     @abstractmethod
     def update(
         self, booking: Booking, expected_status: BookingStatus | None = None
     ) -> None:
         """予約を更新する"""
         raise NotImplementedError
+
+    @abstractmethod
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: BookingStatus,
+        from_statuses: tuple[BookingStatus, ...],
+    ) -> Booking | None:
+        """予約のステータスを1回の条件付き書き込みで遷移させる
+
+        存在しない場合は None。遷移元でなければ遷移させず、現在の予約を返す。
+        """
+        raise NotImplementedError
@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -8,14 +10,19 @@ from services.flight.infrastructure.dynamodb_booking_repository import (
     DynamoDBBookingRepository,
 )
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
 
 logger = Logger()
 
-repository = DynamoDBBookingRepository()
-service = CancelFlightService(repository=repository)
+
+@cache
+def get_service() -> CancelFlightService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return CancelFlightService(repository=DynamoDBBookingRepository())
 
 
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """フライト予約キャンセル Lambda Handler（補償トランザクション用）"""
     logger.info("Received cancel flight request")
@@ -23,7 +30,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     payload = event.get("Payload", event)
     request = CancelFlightRequest.model_validate(payload)
     trip_id = TripId(value=request.trip_id)
-    booking = service.cancel(trip_id)
+    booking = get_service().cancel(trip_id)
 
     if booking is None:
         return {"status": "success", "message": "Already cancelled or not found"}
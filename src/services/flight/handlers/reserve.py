@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -6,20 +8,46 @@ from services.flight.domain.factory import BookingFactory
 from services.flight.domain.factory.booking_factory import FlightDetails
 from services.flight.handlers.request_models import ReserveFlightRequest
 from services.flight.handlers.response_models import to_response
+from services.flight.infrastructure.booking_codec import (
+    decode_booking,
+    encode_booking,
+)
 from services.flight.infrastructure.dynamodb_booking_repository import (
     DynamoDBBookingRepository,
 )
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
+from services.shared.infrastructure.runtime_hooks import (
+    before_snapshot,
+    prime_aws_clients,
+    validate_example,
+)
 
 logger = Logger()
 
 
-repository = DynamoDBBookingRepository()
-factory = BookingFactory()
-service = ReserveFlightService(repository=repository, factory=factory)
+@cache
+def get_service() -> ReserveFlightService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return ReserveFlightService(
+        repository=DynamoDBBookingRepository(), factory=BookingFactory()
+    )
+
+
+@before_snapshot
+def prime() -> None:
+    """SnapStart のスナップショット前に、初回呼び出しで行う初期化を済ませておく"""
+    request = validate_example(ReserveFlightRequest)
+    booking = BookingFactory().create(
+        TripId(value=request.trip_id), _to_flight_details(request)
+    )
+    to_response(decode_booking(encode_booking(booking)))
+    get_service()
+    prime_aws_clients("dynamodb")
 
 
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """フライト予約 Lambda Handler
 
@@ -35,7 +63,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
 
     trip_id = TripId(value=request.trip_id)
     flight_details = _to_flight_details(request)
-    booking = service.reserve(trip_id, flight_details)
+    booking = get_service().reserve(trip_id, flight_details)
     return to_response(booking)
 
 
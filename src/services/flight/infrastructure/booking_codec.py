@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from services.flight.domain.entity import Booking
+from services.flight.domain.enum import BookingStatus
+from services.flight.domain.value_object import BookingId, FlightNumber
+from services.shared.domain import Currency, IsoDateTime, Money, TripId
+from services.shared.infrastructure.dynamodb import Item
+
+ENTITY_TYPE = "FLIGHT"
+SK_PREFIX = "FLIGHT#"
+
+# Query 用の事前に組み立てた式
+QUERY_BY_TRIP_EXPRESSION = "PK = :pk AND begins_with(SK, :sk)"
+
+
+def booking_key(trip_id: TripId | str, booking_id: BookingId | str) -> Item:
+    return {"PK": {"S": f"TRIP#{trip_id}"}, "SK": {"S": f"{SK_PREFIX}{booking_id}"}}
+
+
+def key_from_booking_id(booking_id: BookingId) -> Item:
+    trip_id = str(booking_id).removeprefix("flight_for_")
+    return booking_key(trip_id, booking_id)
+
+
+def encode_booking(booking: Booking) -> Item:
+    """Booking を AttributeValue 形式のアイテムに変換する"""
+    return {
+        **booking_key(booking.trip_id, booking.id),
+        "entity_type": {"S": ENTITY_TYPE},
+        "booking_id": {"S": str(booking.id)},
+        "trip_id": {"S": str(booking.trip_id)},
+        "flight_number": {"S": str(booking.flight_number)},
+        "departure_time": {"S": str(booking.departure_time)},
+        "arrival_time": {"S": str(booking.arrival_time)},
+        "price_amount": {"S": str(booking.price.amount)},
+        "price_currency": {"S": str(booking.price.currency)},
+        "status": {"S": booking.status.value},
+    }
+
+
+def decode_booking(item: Item) -> Booking:
+    """AttributeValue 形式のアイテムを Booking に変換する"""
+    return Booking(
+        id=BookingId(value=item["booking_id"]["S"]),
+        trip_id=TripId(value=item["trip_id"]["S"]),
+        flight_number=FlightNumber(value=item["flight_number"]["S"]),
+        departure_time=IsoDateTime.from_string(item["departure_time"]["S"]),
+        arrival_time=IsoDateTime.from_string(item["arrival_time"]["S"]),
+        price=Money(
+            amount=Decimal(item["price_amount"]["S"]),
+            currency=Currency(item["price_currency"]["S"]),
+        ),
+        status=BookingStatus(item["status"]["S"]),
+    )
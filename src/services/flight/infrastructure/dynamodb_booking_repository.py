@@ -1,73 +1,70 @@
 import os
-from decimal import Decimal
 
-import boto3
-from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from services.flight.domain.entity.booking import Booking
 from services.flight.domain.enum import BookingStatus
 from services.flight.domain.repository import BookingRepository
-from services.flight.domain.value_object import BookingId, FlightNumber
-from services.shared.domain import Currency, IsoDateTime, Money, TripId
-from services.shared.domain.exception.exceptions import (
-    DuplicateResourceException,
-    OptimisticLockException,
+from services.flight.domain.value_object import BookingId
+from services.flight.infrastructure.booking_codec import (
+    QUERY_BY_TRIP_EXPRESSION,
+    SK_PREFIX,
+    booking_key,
+    decode_booking,
+    encode_booking,
+    key_from_booking_id,
+)
+from services.shared.domain import TripId
+from services.shared.domain.exception.exceptions import OptimisticLockException
+from services.shared.infrastructure.dynamodb import (
+    SET_STATUS_UPDATE,
+    STATUS_NAMES,
+    batch_get_items,
+    batch_write_items,
+    get_dynamodb_client,
+    is_conditional_check_failed,
+    put_item_idempotent,
+    transition_item_status,
 )
 
 
 class DynamoDBBookingRepository(BookingRepository):
     """DynamoDBを使用したBookingRepository の具象実装"""
 
-    def __init__(self, table_name: str | None = None) -> None:
+    def __init__(self, table_name: str | None = None, client=None) -> None:
         self.table_name = table_name or os.getenv("TABLE_NAME")
-        self.dynamodb = boto3.resource("dynamodb")
-        self.table = self.dynamodb.Table(self.table_name)
-
-    def save(self, booking: Booking) -> None:
-        """予約をDBに保存する"""
-
-        item = {
-            "PK": f"TRIP#{booking.trip_id}",
-            "SK": f"FLIGHT#{booking.id}",
-            "entity_type": "FLIGHT",
-            "booking_id": str(booking.id),
-            "trip_id": str(booking.trip_id),
-            "flight_number": str(booking.flight_number),
-            "departure_time": str(booking.departure_time),
-            "arrival_time": str(booking.arrival_time),
-            "price_amount": str(booking.price.amount),
-            "price_currency": str(booking.price.currency),
-            "status": booking.status.value,
-        }
-        try:
-            self.table.put_item(Item=item, ConditionExpression=Attr("PK").not_exists())
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise DuplicateResourceException(
-                    f"Booking already exists: {booking.id}"
-                )
+        self.client = client or get_dynamodb_client()
+
+    def save(self, booking: Booking) -> Booking:
+        """予約をDBに保存する（同一内容の再保存は冪等）"""
+        item = encode_booking(booking)
+        stored = put_item_idempotent(self.client, self.table_name, item)
+        if stored is None:
+            return booking
+        # リトライによる再実行: 保存済みの予約を返す
+        return decode_booking(stored)
 
     def find_by_id(self, booking_id: BookingId) -> Booking | None:
         """予約IDで検索"""
-        trip_id = str(booking_id).removeprefix("flight_for_")
-        response = self.table.get_item(
-            Key={
-                "PK": f"TRIP#{trip_id}",
-                "SK": f"FLIGHT#{booking_id}",
-            },
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key=key_from_booking_id(booking_id),
             ConsistentRead=True,
         )
         item = response.get("Item")
         if not item:
             return None
-        return self._to_entity(item)
+        return decode_booking(item)
 
     def find_by_trip_id(self, trip_id: TripId) -> Booking | None:
         """Trip ID でフライト予約を検索する"""
-        response = self.table.query(
-            KeyConditionExpression=Key("PK").eq(f"TRIP#{trip_id}")
-            & Key("SK").begins_with("FLIGHT#"),
+        response = self.client.query(
+            TableName=self.table_name,
+            KeyConditionExpression=QUERY_BY_TRIP_EXPRESSION,
+            ExpressionAttributeValues={
+                ":pk": {"S": f"TRIP#{trip_id}"},
+                ":sk": {"S": SK_PREFIX},
+            },
             ConsistentRead=True,
         )
 
@@ -76,29 +73,50 @@ class DynamoDBBookingRepository(BookingRepository):
             return None
 
         item = items[0]
-        return self._to_entity(item)
+        return decode_booking(item)
+
+    def save_many(self, bookings: list[Booking]) -> None:
+        """複数の予約を BatchWriteItem でまとめて保存する"""
+        batch_write_items(
+            self.client,
+            self.table_name,
+            [encode_booking(booking) for booking in bookings],
+        )
+
+    def find_many_by_ids(self, booking_ids: list[BookingId]) -> list[Booking | None]:
+        """複数の予約IDで BatchGetItem する（結果は booking_ids と同じ順序）"""
+        keys = [key_from_booking_id(booking_id) for booking_id in booking_ids]
+        items = batch_get_items(self.client, self.table_name, keys)
+        return [decode_booking(item) if item else None for item in items]
+
+    def find_many_by_trip_ids(self, trip_ids: list[TripId]) -> list[Booking | None]:
+        """複数の Trip ID で予約をまとめて検索する"""
+        return self.find_many_by_ids(
+            [BookingId.from_trip_id(trip_id) for trip_id in trip_ids]
+        )
 
     def update(
         self, booking: Booking, expected_status: BookingStatus | None = None
     ) -> None:
         """予約のステータスを更新する"""
         kwargs: dict = {
-            "Key": {
-                "PK": f"TRIP#{booking.trip_id}",
-                "SK": f"FLIGHT#{booking.id}",
-            },
-            "UpdateExpression": "SET #status = :status",
-            "ExpressionAttributeNames": {"#status": "status"},
-            "ExpressionAttributeValues": {":status": booking.status.value},
+            "TableName": self.table_name,
+            "Key": booking_key(booking.trip_id, booking.id),
+            "UpdateExpression": SET_STATUS_UPDATE,
+            "ExpressionAttributeNames": STATUS_NAMES,
+            "ExpressionAttributeValues": {":status": {"S": booking.status.value}},
         }
 
         if expected_status is not None:
-            kwargs["ConditionExpression"] = Attr("status").eq(expected_status.value)
+            kwargs["ConditionExpression"] = "#status = :expected"
+            kwargs["ExpressionAttributeValues"][":expected"] = {
+                "S": expected_status.value
+            }
 
         try:
-            self.table.update_item(**kwargs)
+            self.client.update_item(**kwargs)
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if is_conditional_check_failed(e):
                 raise OptimisticLockException(
                     f"Booking status conflict: "
                     f"expected {expected_status}, "
@@ -106,17 +124,21 @@ class DynamoDBBookingRepository(BookingRepository):
                 )
             raise
 
-    def _to_entity(self, item: dict) -> Booking:
-        """DynamoDB アイテムをドメインエンティティに変換する"""
-        return Booking(
-            id=BookingId(value=item["booking_id"]),
-            trip_id=TripId(value=item["trip_id"]),
-            flight_number=FlightNumber(value=item["flight_number"]),
-            departure_time=IsoDateTime.from_string(item["departure_time"]),
-            arrival_time=IsoDateTime.from_string(item["arrival_time"]),
-            price=Money(
-                amount=Decimal(item["price_amount"]),
-                currency=Currency(item["price_currency"]),
-            ),
-            status=BookingStatus(item["status"]),
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: BookingStatus,
+        from_statuses: tuple[BookingStatus, ...],
+    ) -> Booking | None:
+        """予約のステータスを遷移させる（Query を伴わない単一の UpdateItem）"""
+        booking_id = BookingId.from_trip_id(trip_id)
+        item = transition_item_status(
+            self.client,
+            self.table_name,
+            key=booking_key(trip_id, booking_id),
+            to_status=to_status.value,
+            from_statuses=[status.value for status in from_statuses],
         )
+        if item is None:
+            return None
+        return decode_booking(item)
@@ -17,5 +17,4 @@ class ReserveHotelService:
         """ホテルを予約する"""
 
         booking: HotelBooking = self._factory.create(trip_id, hotel_details)
-        self._repository.save(booking)
-        return booking
+        return self._repository.save(booking)
@@ -7,6 +7,9 @@ from services.shared.domain.exception import BusinessRuleViolationException
 class HotelBooking(AggregateRoot[HotelBookingId]):
     """ホテル予約エンティティ"""
 
+    # キャンセルできるステータス（条件付き書き込みの遷移元にも使う）
+    CANCELLABLE_STATUSES = (HotelBookingStatus.PENDING, HotelBookingStatus.CONFIRMED)
+
     def __init__(
         self,
         id: HotelBookingId,
@@ -53,4 +56,8 @@ class HotelBooking(AggregateRoot[HotelBookingId]):
         """予約をキャンセルする"""
         if self._status == HotelBookingStatus.CANCELED:
             return
+        if self._status not in self.CANCELLABLE_STATUSES:
+            raise BusinessRuleViolationException(
+                f"Cannot cancel hotel booking in {self._status} status"
+            )
         self._status = HotelBookingStatus.CANCELED
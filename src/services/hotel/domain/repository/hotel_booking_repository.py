@@ -10,8 +10,8 @@ class HotelBookingRepository(Repository[HotelBooking, HotelBookingId]):
     """ホテル予約レポジトリのインターフェース"""
 
     @abstractmethod
-    def save(self, booking: HotelBooking) -> None:
-        """予約を保存する"""
+    def save(self, booking: HotelBooking) -> HotelBooking:
+        """予約を保存する（既に同じ予約があれば保存済みの予約を返す）"""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,9 +24,41 @@ class HotelBookingRepository(Repository[HotelBooking, HotelBookingId]):
         """TripIDで検索する"""
         raise NotImplementedError
 
+    @abstractmethod
+    def save_many(self, bookings: list[HotelBooking]) -> None:
+        """複数の予約をまとめて保存する（条件なしの上書き）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_ids(
+        self, booking_ids: list[HotelBookingId]
+    ) -> list[HotelBooking | None]:
+        """複数の予約IDでまとめて検索する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_trip_ids(
+        self, trip_ids: list[TripId]
+    ) -> list[HotelBooking | None]:
+        """複数の TripID でまとめて検索する"""
+        raise NotImplementedError
+
     @abstractmethod
     def update(
         self, booking: HotelBooking, expected_status: HotelBookingStatus | None = None
     ) -> None:
         """予約を更新する"""
         raise NotImplementedError
+
+    @abstractmethod
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: HotelBookingStatus,
+        from_statuses: tuple[HotelBookingStatus, ...],
+    ) -> HotelBooking | None:
+        """予約のステータスを1回の条件付き書き込みで遷移させる
+
+        存在しない場合は None。遷移元でなければ遷移させず、現在の予約を返す。
+        """
+        raise NotImplementedError
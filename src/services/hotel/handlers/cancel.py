@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -8,14 +10,19 @@ from services.hotel.infrastructure.dynamodb_hotel_booking_repository import (
     DynamoDBHotelBookingRepository,
 )
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
 
 logger = Logger()
 
-repository = DynamoDBHotelBookingRepository()
-service = CancelHotelService(repository=repository)
+
+@cache
+def get_service() -> CancelHotelService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return CancelHotelService(repository=DynamoDBHotelBookingRepository())
 
 
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """ホテル予約キャンセル Lambda Handler（補償トランザクション用）"""
     logger.info("Received cancel hotel request")
@@ -23,7 +30,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     payload = event.get("Payload", event)
     request = CancelHotelRequest.model_validate(payload)
     trip_id = TripId(value=request.trip_id)
-    booking = service.cancel(trip_id)
+    booking = get_service().cancel(trip_id)
 
     if booking is None:
         return {"status": "success", "message": "Already cancelled or not found"}
@@ -49,6 +49,23 @@ class ReserveHotelRequest(BaseModel):
     trip_id: str = Field(..., min_length=1)
     hotel_details: HotelDetailsRequest
 
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "trip_id": "trip-123",
+                    "hotel_details": {
+                        "hotel_name": "Grand Hotel Tokyo",
+                        "check_in_date": "2024-01-01",
+                        "check_out_date": "2024-01-03",
+                        "price_amount": 30000,
+                        "price_currency": "JPY",
+                    },
+                }
+            ]
+        }
+    }
+
 
 class CancelHotelRequest(BaseModel):
     """ホテルキャンセルリクエストモデル（補償トランザクション用）"""
@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -9,14 +11,27 @@ from services.hotel.handlers.response_models import to_response
 from services.hotel.infrastructure.dynamodb_hotel_booking_repository import (
     DynamoDBHotelBookingRepository,
 )
+from services.hotel.infrastructure.hotel_booking_codec import (
+    decode_hotel_booking,
+    encode_hotel_booking,
+)
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
+from services.shared.infrastructure.runtime_hooks import (
+    before_snapshot,
+    prime_aws_clients,
+    validate_example,
+)
 
 logger = Logger()
 
 
-repository = DynamoDBHotelBookingRepository()
-factory = HotelBookingFactory()
-service = ReserveHotelService(repository=repository, factory=factory)
+@cache
+def get_service() -> ReserveHotelService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return ReserveHotelService(
+        repository=DynamoDBHotelBookingRepository(), factory=HotelBookingFactory()
+    )
 
 
 def _to_hotel_details(request: ReserveHotelRequest) -> HotelDetails:
@@ -30,7 +45,20 @@ def _to_hotel_details(request: ReserveHotelRequest) -> HotelDetails:
     }
 
 
+@before_snapshot
+def prime() -> None:
+    """SnapStart のスナップショット前に、初回呼び出しで行う初期化を済ませておく"""
+    request = validate_example(ReserveHotelRequest)
+    booking = HotelBookingFactory().create(
+        TripId(value=request.trip_id), _to_hotel_details(request)
+    )
+    to_response(decode_hotel_booking(encode_hotel_booking(booking)))
+    get_service()
+    prime_aws_clients("dynamodb")
+
+
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """ホテル予約 Lambda ハンドラ"""
     logger.info("Received reserve hotel request")
@@ -40,5 +68,5 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
 
     trip_id = TripId(value=request.trip_id)
     hotel_details = _to_hotel_details(request)
-    booking = service.reserve(trip_id, hotel_details)
+    booking = get_service().reserve(trip_id, hotel_details)
     return to_response(booking)
@@ -1,100 +1,126 @@
 import os
-from decimal import Decimal
 
-import boto3
-from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from services.hotel.domain.entity import HotelBooking
 from services.hotel.domain.enum import HotelBookingStatus
 from services.hotel.domain.repository import HotelBookingRepository
-from services.hotel.domain.value_object import HotelBookingId, HotelName, StayPeriod
-from services.shared.domain import Currency, Money, TripId
-from services.shared.domain.exception.exceptions import (
-    DuplicateResourceException,
-    OptimisticLockException,
+from services.hotel.domain.value_object import HotelBookingId
+from services.hotel.infrastructure.hotel_booking_codec import (
+    QUERY_BY_TRIP_EXPRESSION,
+    SK_PREFIX,
+    decode_hotel_booking,
+    encode_hotel_booking,
+    hotel_booking_key,
+    key_from_booking_id,
+)
+from services.shared.domain import TripId
+from services.shared.domain.exception.exceptions import OptimisticLockException
+from services.shared.infrastructure.dynamodb import (
+    SET_STATUS_UPDATE,
+    STATUS_NAMES,
+    batch_get_items,
+    batch_write_items,
+    get_dynamodb_client,
+    is_conditional_check_failed,
+    put_item_idempotent,
+    transition_item_status,
 )
 
 
 class DynamoDBHotelBookingRepository(HotelBookingRepository):
     """DynamoDBを使用したHotelBookingRepository の具象実装"""
 
-    def __init__(self, table_name: str | None = None) -> None:
+    def __init__(self, table_name: str | None = None, client=None) -> None:
         self.table_name = table_name or os.getenv("TABLE_NAME")
-        self.dynamodb = boto3.resource("dynamodb")
-        self.table = self.dynamodb.Table(self.table_name)
-
-    def save(self, booking: HotelBooking) -> None:
-        """予約をDBに保存する"""
-        item = {
-            "PK": f"TRIP#{booking.trip_id}",
-            "SK": f"HOTEL#{booking.id}",
-            "entity_type": "HOTEL",
-            "booking_id": str(booking.id),
-            "trip_id": str(booking.trip_id),
-            "hotel_name": str(booking.hotel_name),
-            "check_in_date": booking.stay_period.check_in,
-            "check_out_date": booking.stay_period.check_out,
-            "price_amount": str(booking.price.amount),
-            "price_currency": str(booking.price.currency),
-            "status": booking.status.value,
-        }
-        try:
-            self.table.put_item(Item=item, ConditionExpression=Attr("PK").not_exists())
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise DuplicateResourceException(
-                    f"Hotel booking already exists: {booking.id}"
-                )
+        self.client = client or get_dynamodb_client()
+
+    def save(self, booking: HotelBooking) -> HotelBooking:
+        """予約をDBに保存する（同一内容の再保存は冪等）"""
+        item = encode_hotel_booking(booking)
+        stored = put_item_idempotent(self.client, self.table_name, item)
+        if stored is None:
+            return booking
+        # リトライによる再実行: 保存済みの予約を返す
+        return decode_hotel_booking(stored)
 
     def find_by_id(self, booking_id: HotelBookingId) -> HotelBooking | None:
         """予約IDで検索"""
-        trip_id = str(booking_id).removeprefix("hotel_for_")
-        response = self.table.get_item(
-            Key={
-                "PK": f"TRIP#{trip_id}",
-                "SK": f"HOTEL#{booking_id}",
-            },
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key=key_from_booking_id(booking_id),
             ConsistentRead=True,
         )
         item = response.get("Item")
         if not item:
             return None
-        return self._to_entity(item)
+        return decode_hotel_booking(item)
 
     def find_by_trip_id(self, trip_id: TripId) -> HotelBooking | None:
         """Trip ID でホテル予約を検索する"""
-        response = self.table.query(
-            KeyConditionExpression=Key("PK").eq(f"TRIP#{trip_id}")
-            & Key("SK").begins_with("HOTEL#"),
+        response = self.client.query(
+            TableName=self.table_name,
+            KeyConditionExpression=QUERY_BY_TRIP_EXPRESSION,
+            ExpressionAttributeValues={
+                ":pk": {"S": f"TRIP#{trip_id}"},
+                ":sk": {"S": SK_PREFIX},
+            },
             ConsistentRead=True,
         )
+
         items = response.get("Items", [])
         if not items:
             return None
-        return self._to_entity(items[0])
+
+        item = items[0]
+        return decode_hotel_booking(item)
+
+    def save_many(self, bookings: list[HotelBooking]) -> None:
+        """複数の予約を BatchWriteItem でまとめて保存する"""
+        batch_write_items(
+            self.client,
+            self.table_name,
+            [encode_hotel_booking(booking) for booking in bookings],
+        )
+
+    def find_many_by_ids(
+        self, booking_ids: list[HotelBookingId]
+    ) -> list[HotelBooking | None]:
+        """複数の予約IDで BatchGetItem する（結果は booking_ids と同じ順序）"""
+        keys = [key_from_booking_id(booking_id) for booking_id in booking_ids]
+        items = batch_get_items(self.client, self.table_name, keys)
+        return [decode_hotel_booking(item) if item else None for item in items]
+
+    def find_many_by_trip_ids(
+        self, trip_ids: list[TripId]
+    ) -> list[HotelBooking | None]:
+        """複数の Trip ID で予約をまとめて検索する"""
+        return self.find_many_by_ids(
+            [HotelBookingId.from_trip_id(trip_id) for trip_id in trip_ids]
+        )
 
     def update(
         self, booking: HotelBooking, expected_status: HotelBookingStatus | None = None
     ) -> None:
         """予約のステータスを更新する"""
         kwargs: dict = {
-            "Key": {
-                "PK": f"TRIP#{booking.trip_id}",
-                "SK": f"HOTEL#{booking.id}",
-            },
-            "UpdateExpression": "SET #status = :status",
-            "ExpressionAttributeNames": {"#status": "status"},
-            "ExpressionAttributeValues": {":status": booking.status.value},
+            "TableName": self.table_name,
+            "Key": hotel_booking_key(booking.trip_id, booking.id),
+            "UpdateExpression": SET_STATUS_UPDATE,
+            "ExpressionAttributeNames": STATUS_NAMES,
+            "ExpressionAttributeValues": {":status": {"S": booking.status.value}},
         }
 
         if expected_status is not None:
-            kwargs["ConditionExpression"] = Attr("status").eq(expected_status.value)
+            kwargs["ConditionExpression"] = "#status = :expected"
+            kwargs["ExpressionAttributeValues"][":expected"] = {
+                "S": expected_status.value
+            }
 
         try:
-            self.table.update_item(**kwargs)
+            self.client.update_item(**kwargs)
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if is_conditional_check_failed(e):
                 raise OptimisticLockException(
                     f"Hotel booking status conflict: "
                     f"expected {expected_status}, "
@@ -102,19 +128,21 @@ class DynamoDBHotelBookingRepository(HotelBookingRepository):
                 )
             raise
 
-    def _to_entity(self, item: dict) -> HotelBooking:
-        """DynamoDB アイテムをドメインエンティティに変換する"""
-        return HotelBooking(
-            id=HotelBookingId(value=item["booking_id"]),
-            trip_id=TripId(value=item["trip_id"]),
-            hotel_name=HotelName(value=item["hotel_name"]),
-            stay_period=StayPeriod(
-                check_in=item["check_in_date"],
-                check_out=item["check_out_date"],
-            ),
-            price=Money(
-                amount=Decimal(item["price_amount"]),
-                currency=Currency(item["price_currency"]),
-            ),
-            status=HotelBookingStatus(item["status"]),
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: HotelBookingStatus,
+        from_statuses: tuple[HotelBookingStatus, ...],
+    ) -> HotelBooking | None:
+        """予約のステータスを遷移させる（Query を伴わない単一の UpdateItem）"""
+        booking_id = HotelBookingId.from_trip_id(trip_id)
+        item = transition_item_status(
+            self.client,
+            self.table_name,
+            key=hotel_booking_key(trip_id, booking_id),
+            to_status=to_status.value,
+            from_statuses=[status.value for status in from_statuses],
         )
+        if item is None:
+            return None
+        return decode_hotel_booking(item)
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from services.hotel.domain.entity import HotelBooking
+from services.hotel.domain.enum import HotelBookingStatus
+from services.hotel.domain.value_object import HotelBookingId, HotelName, StayPeriod
+from services.shared.domain import Currency, Money, TripId
+from services.shared.infrastructure.dynamodb import Item
+
+ENTITY_TYPE = "HOTEL"
+SK_PREFIX = "HOTEL#"
+
+# Query 用の事前に組み立てた式
+QUERY_BY_TRIP_EXPRESSION = "PK = :pk AND begins_with(SK, :sk)"
+
+
+def hotel_booking_key(trip_id: TripId | str, booking_id: HotelBookingId | str) -> Item:
+    return {"PK": {"S": f"TRIP#{trip_id}"}, "SK": {"S": f"{SK_PREFIX}{booking_id}"}}
+
+
+def key_from_booking_id(booking_id: HotelBookingId) -> Item:
+    trip_id = str(booking_id).removeprefix("hotel_for_")
+    return hotel_booking_key(trip_id, booking_id)
+
+
+def encode_hotel_booking(booking: HotelBooking) -> Item:
+    """HotelBooking を AttributeValue 形式のアイテムに変換する"""
+    return {
+        **hotel_booking_key(booking.trip_id, booking.id),
+        "entity_type": {"S": ENTITY_TYPE},
+        "booking_id": {"S": str(booking.id)},
+        "trip_id": {"S": str(booking.trip_id)},
+        "hotel_name": {"S": str(booking.hotel_name)},
+        "check_in_date": {"S": booking.stay_period.check_in},
+        "check_out_date": {"S": booking.stay_period.check_out},
+        "price_amount": {"S": str(booking.price.amount)},
+        "price_currency": {"S": str(booking.price.currency)},
+        "status": {"S": booking.status.value},
+    }
+
+
+def decode_hotel_booking(item: Item) -> HotelBooking:
+    """AttributeValue 形式のアイテムを HotelBooking に変換する"""
+    return HotelBooking(
+        id=HotelBookingId(value=item["booking_id"]["S"]),
+        trip_id=TripId(value=item["trip_id"]["S"]),
+        hotel_name=HotelName(value=item["hotel_name"]["S"]),
+        stay_period=StayPeriod(
+            check_in=item["check_in_date"]["S"],
+            check_out=item["check_out_date"]["S"],
+        ),
+        price=Money(
+            amount=Decimal(item["price_amount"]["S"]),
+            currency=Currency(item["price_currency"]["S"]),
+        ),
+        status=HotelBookingStatus(item["status"]["S"]),
+    )
@@ -31,5 +31,4 @@ class ProcessPaymentService:
         }
         payment: Payment = self._factory.create(trip_id, payment_details)
         payment.complete()
-        self._repository.save(payment)
-        return payment
+        return self._repository.save(payment)
@@ -1,4 +1,5 @@
 from services.payment.domain.entity import Payment
+from services.payment.domain.enum import PaymentStatus
 from services.payment.domain.repository import PaymentRepository
 from services.shared.domain import TripId
 
@@ -10,11 +11,17 @@ class RefundPaymentService:
         self._repository = repository
 
     def refund(self, trip_id: TripId) -> Payment | None:
-        """決済を払い戻す"""
-        payment = self._repository.find_by_trip_id(trip_id)
-        if payment is None:
-            return None
-        expected_status = payment.status
-        payment.refund()
-        self._repository.update(payment, expected_status=expected_status)
+        """決済を払い戻す
+
+        事前の読み取りは行わず、条件付き書き込み1回で遷移させる。
+        遷移しなかった場合は現在の状態に Payment.refund() の規則を適用する
+        （払い戻し済みなら何もせず、それ以外は BusinessRuleViolationException）。
+        """
+        payment = self._repository.transition_status(
+            trip_id,
+            to_status=PaymentStatus.REFUNDED,
+            from_statuses=Payment.REFUNDABLE_STATUSES,
+        )
+        if payment is not None:
+            payment.refund()
         return payment
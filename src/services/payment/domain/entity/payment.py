@@ -7,6 +7,9 @@ from services.shared.domain.exception import BusinessRuleViolationException
 class Payment(AggregateRoot[PaymentId]):
     """決済エンティティ"""
 
+    # 払い戻しできるステータス（条件付き書き込みの遷移元にも使う）
+    REFUNDABLE_STATUSES = (PaymentStatus.COMPLETED,)
+
     def __init__(
         self,
         id: PaymentId,
@@ -43,6 +46,6 @@ class Payment(AggregateRoot[PaymentId]):
         """払い戻しを行う（補償トランザクション用）"""
         if self._status == PaymentStatus.REFUNDED:
             return
-        if self._status != PaymentStatus.COMPLETED:
+        if self._status not in self.REFUNDABLE_STATUSES:
             raise BusinessRuleViolationException("Can only refund completed payments")
         self._status = PaymentStatus.REFUNDED
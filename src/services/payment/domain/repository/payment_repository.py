@@ -10,8 +10,8 @@ class PaymentRepository(Repository[Payment, PaymentId]):
     """決済リポジトリのインターフェース"""
 
     @abstractmethod
-    def save(self, payment: Payment) -> None:
-        """決済を保存する"""
+    def save(self, payment: Payment) -> Payment:
+        """決済を保存する（既に同じ決済があれば保存済みの決済を返す）"""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,9 +24,37 @@ class PaymentRepository(Repository[Payment, PaymentId]):
         """Trip ID で検索する"""
         raise NotImplementedError
 
+    @abstractmethod
+    def save_many(self, payments: list[Payment]) -> None:
+        """複数の決済をまとめて保存する（条件なしの上書き）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_ids(self, payment_ids: list[PaymentId]) -> list[Payment | None]:
+        """複数の決済IDでまとめて検索する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_trip_ids(self, trip_ids: list[TripId]) -> list[Payment | None]:
+        """複数の TripID でまとめて検索する"""
+        raise NotImplementedError
+
     @abstractmethod
     def update(
         self, payment: Payment, expected_status: PaymentStatus | None = None
     ) -> None:
         """決済を更新する"""
         raise NotImplementedError
+
+    @abstractmethod
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: PaymentStatus,
+        from_statuses: tuple[PaymentStatus, ...],
+    ) -> Payment | None:
+        """決済のステータスを1回の条件付き書き込みで遷移させる
+
+        存在しない場合は None。遷移元でなければ遷移させず、現在の決済を返す。
+        """
+        raise NotImplementedError
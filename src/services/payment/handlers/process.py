@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -8,16 +10,46 @@ from services.payment.handlers.response_models import to_response
 from services.payment.infrastructure.dynamodb_payment_repository import (
     DynamoDBPaymentRepository,
 )
+from services.payment.infrastructure.payment_codec import (
+    decode_payment,
+    encode_payment,
+)
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
+from services.shared.infrastructure.runtime_hooks import (
+    before_snapshot,
+    prime_aws_clients,
+    validate_example,
+)
+from services.shared.infrastructure.shard_map import ShardMap
 
 logger = Logger()
 
-repository = DynamoDBPaymentRepository()
-factory = PaymentFactory()
-service = ProcessPaymentService(repository=repository, factory=factory)
+
+@cache
+def get_service() -> ProcessPaymentService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return ProcessPaymentService(
+        repository=DynamoDBPaymentRepository(), factory=PaymentFactory()
+    )
+
+
+@before_snapshot
+def prime() -> None:
+    """SnapStart のスナップショット前に、初回呼び出しで行う初期化を済ませておく"""
+    request = validate_example(ProcessPaymentRequest)
+    trip_id = TripId(value=request.trip_id)
+    payment = PaymentFactory().create(
+        trip_id, {"amount": request.amount, "currency_code": request.currency}
+    )
+    gsi1pk = ShardMap().write_partition(request.trip_id)
+    to_response(decode_payment(encode_payment(payment, gsi1pk)))
+    get_service()
+    prime_aws_clients("dynamodb")
 
 
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """決済処理のLambdaハンドラー"""
     logger.info("Received process payment request")
@@ -26,7 +58,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     request = ProcessPaymentRequest.model_validate(payload)
 
     trip_id = TripId(value=request.trip_id)
-    payment = service.process(
+    payment = get_service().process(
         trip_id=trip_id,
         amount=request.amount,
         currency_code=request.currency,
@@ -1,3 +1,5 @@
+from functools import cache
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -8,14 +10,19 @@ from services.payment.infrastructure.dynamodb_payment_repository import (
     DynamoDBPaymentRepository,
 )
 from services.shared.domain import TripId
+from services.shared.infrastructure.deadline import with_deadline
 
 logger = Logger()
 
-repository = DynamoDBPaymentRepository()
-service = RefundPaymentService(repository=repository)
+
+@cache
+def get_service() -> RefundPaymentService:
+    """サービスを最初の呼び出し時に1回だけ組み立てる"""
+    return RefundPaymentService(repository=DynamoDBPaymentRepository())
 
 
 @logger.inject_lambda_context
+@with_deadline
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """払い戻し Lambda Handler（補償トランザクション用）"""
     logger.info("Received refund payment request")
@@ -23,7 +30,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     payload = event.get("Payload", event)
     request = RefundPaymentRequest.model_validate(payload)
     trip_id = TripId(value=request.trip_id)
-    payment = service.refund(trip_id)
+    payment = get_service().refund(trip_id)
 
     if payment is None:
         return {"status": "success", "message": "Already refunded or not found"}
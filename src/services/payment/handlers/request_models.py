@@ -20,6 +20,12 @@ class ProcessPaymentRequest(BaseModel):
         description="通貨コード（ISO 4217）",
     )
 
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"trip_id": "trip-123", "amount": 80000, "currency": "JPY"}]
+        }
+    }
+
     @field_validator("amount", mode="before")
     @classmethod
     def convert_amount_to_decimal(cls, v: object) -> Decimal:
@@ -1,107 +1,124 @@
-import hashlib
 import os
-from decimal import Decimal
 
-import boto3
-from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from services.payment.domain.entity import Payment
 from services.payment.domain.enum import PaymentStatus
 from services.payment.domain.repository import PaymentRepository
 from services.payment.domain.value_object import PaymentId
-from services.shared.domain import Currency, Money, TripId
-from services.shared.domain.exception.exceptions import (
-    DuplicateResourceException,
-    OptimisticLockException,
+from services.payment.infrastructure.payment_codec import (
+    QUERY_BY_TRIP_EXPRESSION,
+    SK_PREFIX,
+    decode_payment,
+    encode_payment,
+    key_from_payment_id,
+    payment_key,
 )
-
-NUM_SHARDS = 4
-
-
-def _compute_shard(trip_id: str) -> int:
-    """trip_id から決定論的にシャード番号を算出する"""
-    return int(hashlib.sha256(trip_id.encode()).hexdigest(), 16) % NUM_SHARDS
+from services.shared.domain import TripId
+from services.shared.domain.exception.exceptions import OptimisticLockException
+from services.shared.infrastructure.dynamodb import (
+    SET_STATUS_UPDATE,
+    STATUS_NAMES,
+    Item,
+    batch_get_items,
+    batch_write_items,
+    get_dynamodb_client,
+    is_conditional_check_failed,
+    put_item_idempotent,
+    transition_item_status,
+)
+from services.shared.infrastructure.shard_map import DynamoDBShardMapStore
 
 
 class DynamoDBPaymentRepository(PaymentRepository):
     """DynamoDBを使用したPaymentRepository の具象実装"""
 
-    def __init__(self, table_name: str | None = None) -> None:
+    def __init__(self, table_name: str | None = None, client=None) -> None:
         self.table_name = table_name or os.getenv("TABLE_NAME")
-        self.dynamodb = boto3.resource("dynamodb")
-        self.table = self.dynamodb.Table(self.table_name)
-
-    def save(self, payment: Payment) -> None:
-        """決済をDBに保存する"""
-        item = {
-            "PK": f"TRIP#{payment.trip_id}",
-            "SK": f"PAYMENT#{payment.id}",
-            "entity_type": "PAYMENT",
-            "payment_id": str(payment.id),
-            "trip_id": str(payment.trip_id),
-            "amount": str(payment.amount.amount),
-            "currency": str(payment.amount.currency),
-            "status": payment.status.value,
-            "GSI1PK": f"TRIPS#{_compute_shard(str(payment.trip_id))}",
-            "GSI1SK": f"TRIP#{payment.trip_id}",
-        }
-        try:
-            self.table.put_item(Item=item, ConditionExpression=Attr("PK").not_exists())
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise DuplicateResourceException(
-                    f"Payment already exists: {payment.id}"
-                )
+        self.client = client or get_dynamodb_client()
+        self.shard_map_store = DynamoDBShardMapStore(self.client, self.table_name)
+
+    def save(self, payment: Payment) -> Payment:
+        """決済をDBに保存する（同一内容の再保存は冪等）"""
+        item = self._encode(payment)
+        stored = put_item_idempotent(self.client, self.table_name, item)
+        if stored is None:
+            return payment
+        # リトライによる再実行: 保存済みの決済を返す
+        return decode_payment(stored)
 
     def find_by_id(self, payment_id: PaymentId) -> Payment | None:
         """決済IDで検索"""
-        trip_id = str(payment_id).removeprefix("payment_for_")
-        response = self.table.get_item(
-            Key={
-                "PK": f"TRIP#{trip_id}",
-                "SK": f"PAYMENT#{payment_id}",
-            },
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key=key_from_payment_id(payment_id),
             ConsistentRead=True,
         )
         item = response.get("Item")
         if not item:
             return None
-        return self._to_entity(item)
+        return decode_payment(item)
 
     def find_by_trip_id(self, trip_id: TripId) -> Payment | None:
         """Trip ID で決済を検索する"""
-        response = self.table.query(
-            KeyConditionExpression=Key("PK").eq(f"TRIP#{trip_id}")
-            & Key("SK").begins_with("PAYMENT#"),
+        response = self.client.query(
+            TableName=self.table_name,
+            KeyConditionExpression=QUERY_BY_TRIP_EXPRESSION,
+            ExpressionAttributeValues={
+                ":pk": {"S": f"TRIP#{trip_id}"},
+                ":sk": {"S": SK_PREFIX},
+            },
             ConsistentRead=True,
         )
+
         items = response.get("Items", [])
         if not items:
             return None
-        return self._to_entity(items[0])
+
+        return decode_payment(items[0])
+
+    def save_many(self, payments: list[Payment]) -> None:
+        """複数の決済を BatchWriteItem でまとめて保存する"""
+        batch_write_items(
+            self.client,
+            self.table_name,
+            [self._encode(payment) for payment in payments],
+        )
+
+    def find_many_by_ids(self, payment_ids: list[PaymentId]) -> list[Payment | None]:
+        """複数の決済IDで BatchGetItem する（結果は payment_ids と同じ順序）"""
+        keys = [key_from_payment_id(payment_id) for payment_id in payment_ids]
+        items = batch_get_items(self.client, self.table_name, keys)
+        return [decode_payment(item) if item else None for item in items]
+
+    def find_many_by_trip_ids(self, trip_ids: list[TripId]) -> list[Payment | None]:
+        """複数の Trip ID で決済をまとめて検索する"""
+        return self.find_many_by_ids(
+            [PaymentId.from_trip_id(trip_id) for trip_id in trip_ids]
+        )
 
     def update(
         self, payment: Payment, expected_status: PaymentStatus | None = None
     ) -> None:
         """決済のステータスを更新する"""
         kwargs: dict = {
-            "Key": {
-                "PK": f"TRIP#{payment.trip_id}",
-                "SK": f"PAYMENT#{payment.id}",
-            },
-            "UpdateExpression": "SET #status = :status",
-            "ExpressionAttributeNames": {"#status": "status"},
-            "ExpressionAttributeValues": {":status": payment.status.value},
+            "TableName": self.table_name,
+            "Key": payment_key(payment.trip_id, payment.id),
+            "UpdateExpression": SET_STATUS_UPDATE,
+            "ExpressionAttributeNames": STATUS_NAMES,
+            "ExpressionAttributeValues": {":status": {"S": payment.status.value}},
         }
 
         if expected_status is not None:
-            kwargs["ConditionExpression"] = Attr("status").eq(expected_status.value)
+            kwargs["ConditionExpression"] = "#status = :expected"
+            kwargs["ExpressionAttributeValues"][":expected"] = {
+                "S": expected_status.value
+            }
 
         try:
-            self.table.update_item(**kwargs)
+            self.client.update_item(**kwargs)
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if is_conditional_check_failed(e):
                 raise OptimisticLockException(
                     f"Payment status conflict: "
                     f"expected {expected_status}, "
@@ -109,14 +126,26 @@ class DynamoDBPaymentRepository(PaymentRepository):
                 )
             raise
 
-    def _to_entity(self, item: dict) -> Payment:
-        """DynamoDB アイテムをドメインエンティティに変換する"""
-        return Payment(
-            id=PaymentId(value=item["payment_id"]),
-            trip_id=TripId(value=item["trip_id"]),
-            amount=Money(
-                amount=Decimal(item["amount"]),
-                currency=Currency(item["currency"]),
-            ),
-            status=PaymentStatus(item["status"]),
+    def transition_status(
+        self,
+        trip_id: TripId,
+        to_status: PaymentStatus,
+        from_statuses: tuple[PaymentStatus, ...],
+    ) -> Payment | None:
+        """決済のステータスを遷移させる（Query を伴わない単一の UpdateItem）"""
+        payment_id = PaymentId.from_trip_id(trip_id)
+        item = transition_item_status(
+            self.client,
+            self.table_name,
+            key=payment_key(trip_id, payment_id),
+            to_status=to_status.value,
+            from_statuses=[status.value for status in from_statuses],
         )
+        if item is None:
+            return None
+        return decode_payment(item)
+
+    def _encode(self, payment: Payment) -> Item:
+        """現在のシャードマップで GSI1PK を決めてアイテムに変換する"""
+        shard_map = self.shard_map_store.get()
+        return encode_payment(payment, shard_map.write_partition(str(payment.trip_id)))
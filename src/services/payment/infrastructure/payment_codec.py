@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from services.payment.domain.entity import Payment
+from services.payment.domain.enum import PaymentStatus
+from services.payment.domain.value_object import PaymentId
+from services.shared.domain import Currency, Money, TripId
+from services.shared.infrastructure.dynamodb import Item
+
+ENTITY_TYPE = "PAYMENT"
+SK_PREFIX = "PAYMENT#"
+
+# Query 用の事前に組み立てた式
+QUERY_BY_TRIP_EXPRESSION = "PK = :pk AND begins_with(SK, :sk)"
+
+
+def payment_key(trip_id: TripId | str, payment_id: PaymentId | str) -> Item:
+    return {"PK": {"S": f"TRIP#{trip_id}"}, "SK": {"S": f"{SK_PREFIX}{payment_id}"}}
+
+
+def key_from_payment_id(payment_id: PaymentId) -> Item:
+    trip_id = str(payment_id).removeprefix("payment_for_")
+    return payment_key(trip_id, payment_id)
+
+
+def encode_payment(payment: Payment, gsi1pk: str) -> Item:
+    """Payment を AttributeValue 形式のアイテムに変換する"""
+    return {
+        **payment_key(payment.trip_id, payment.id),
+        "entity_type": {"S": ENTITY_TYPE},
+        "payment_id": {"S": str(payment.id)},
+        "trip_id": {"S": str(payment.trip_id)},
+        "amount": {"S": str(payment.amount.amount)},
+        "currency": {"S": str(payment.amount.currency)},
+        "status": {"S": payment.status.value},
+        "GSI1PK": {"S": gsi1pk},
+        "GSI1SK": {"S": f"TRIP#{payment.trip_id}"},
+    }
+
+
+def decode_payment(item: Item) -> Payment:
+    """AttributeValue 形式のアイテムを Payment に変換する"""
+    return Payment(
+        id=PaymentId(value=item["payment_id"]["S"]),
+        trip_id=TripId(value=item["trip_id"]["S"]),
+        amount=Money(
+            amount=Decimal(item["amount"]["S"]),
+            currency=Currency(item["currency"]["S"]),
+        ),
+        status=PaymentStatus(item["status"]["S"]),
+    )
@@ -1,27 +1,50 @@
-from .entity import AggregateRoot as AggregateRoot
-from .entity import Entity as Entity
-from .exception import (
-    BusinessRuleViolationException as BusinessRuleViolationException,
-)
-from .exception import (
-    DomainException as DomainException,
-)
-from .exception import (
-    DuplicateResourceException as DuplicateResourceException,
-)
-from .exception import (
-    ResourceNotFoundException as ResourceNotFoundException,
-)
-from .repository import Repository as Repository
-from .value_object import (
-    Currency as Currency,
-)
-from .value_object import (
-    IsoDateTime as IsoDateTime,
-)
-from .value_object import (
-    Money as Money,
-)
-from .value_object import (
-    TripId as TripId,
-)
+from typing import TYPE_CHECKING
+
+from services.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .entity import AggregateRoot as AggregateRoot
+    from .entity import Entity as Entity
+    from .exception import (
+        BusinessRuleViolationException as BusinessRuleViolationException,
+    )
+    from .exception import (
+        DomainException as DomainException,
+    )
+    from .exception import (
+        DuplicateResourceException as DuplicateResourceException,
+    )
+    from .exception import (
+        ResourceNotFoundException as ResourceNotFoundException,
+    )
+    from .repository import Repository as Repository
+    from .value_object import (
+        Currency as Currency,
+    )
+    from .value_object import (
+        IsoDateTime as IsoDateTime,
+    )
+    from .value_object import (
+        Money as Money,
+    )
+    from .value_object import (
+        TripId as TripId,
+    )
+
+# 使われるモジュールだけを読み込むよう、定義元のモジュールを直接指定する
+_EXPORTS = {
+    "AggregateRoot": ".entity.aggregate",
+    "Entity": ".entity.entity",
+    "BusinessRuleViolationException": ".exception.exceptions",
+    "DomainException": ".exception.exceptions",
+    "DuplicateResourceException": ".exception.exceptions",
+    "ResourceNotFoundException": ".exception.exceptions",
+    "Repository": ".repository.repository",
+    "Currency": ".value_object.currency",
+    "IsoDateTime": ".value_object.iso_date_time",
+    "Money": ".value_object.money",
+    "TripId": ".value_object.trip_id",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
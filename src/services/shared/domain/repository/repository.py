@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 
+from services.shared.domain.value_object.trip_id import TripId
+
 T = TypeVar("T")
 ID = TypeVar("ID")
 
@@ -12,8 +14,8 @@ class Repository(ABC, Generic[T, ID]):
     """
 
     @abstractmethod
-    def save(self, aggregate: T) -> None:
-        """集約を永続化する"""
+    def save(self, aggregate: T) -> T:
+        """集約を永続化し、永続化された集約を返す"""
         raise NotImplementedError
 
     @abstractmethod
@@ -25,3 +27,18 @@ class Repository(ABC, Generic[T, ID]):
     def update(self, aggregate: T) -> None:
         """集約を更新する"""
         raise NotImplementedError
+
+    @abstractmethod
+    def save_many(self, aggregates: list[T]) -> None:
+        """複数の集約をまとめて永続化する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_ids(self, ids: list[ID]) -> list[T | None]:
+        """複数のIDでまとめて検索する（結果は ids と同じ順序）"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_many_by_trip_ids(self, trip_ids: list[TripId]) -> list[T | None]:
+        """複数の TripID でまとめて検索する（結果は trip_ids と同じ順序）"""
+        raise NotImplementedError
@@ -1,4 +1,19 @@
-from .currency import Currency as Currency
-from .iso_date_time import IsoDateTime as IsoDateTime
-from .money import Money as Money
-from .trip_id import TripId as TripId
+from typing import TYPE_CHECKING
+
+from services.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .currency import Currency as Currency
+    from .iso_date_time import IsoDateTime as IsoDateTime
+    from .money import Money as Money
+    from .trip_id import TripId as TripId
+
+_EXPORTS = {
+    "Currency": ".currency",
+    "IsoDateTime": ".iso_date_time",
+    "Money": ".money",
+    "TripId": ".trip_id",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
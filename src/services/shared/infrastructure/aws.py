@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from services.shared.infrastructure.deadline import (
+    DeadlineExceededException,
+    check_deadline,
+    remaining_seconds,
+)
+
+if TYPE_CHECKING:
+    from botocore.config import Config
+    from botocore.session import Session
+
+# botocore の読み込み（数十ミリ秒）は最初のクライアント作成時まで遅らせる。
+# boto3 は s3transfer などの読み込みが加わるため使わず、botocore を直接使う。
+
+# 環境変数で上書きできる botocore クライアント設定の既定値
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 2.0
+DEFAULT_READ_TIMEOUT_SECONDS = 5.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_MODE = "adaptive"
+
+# 締め切りが近い呼び出しに使う読み取りタイムアウトの段階（秒）。
+# 残り時間ごとにクライアントを作ると接続プールが増え続けるため、
+# (段階, 試行回数) ごとに共有する。
+TIMEOUT_BUCKETS_SECONDS = (0.25, 0.5, 1.0, 2.0)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class AwsClientSettings:
+    """botocore クライアントの接続・再試行設定"""
+
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS
+    tcp_keepalive: bool = True
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS
+    read_timeout: float = DEFAULT_READ_TIMEOUT_SECONDS
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    retry_mode: str = DEFAULT_RETRY_MODE
+
+    @classmethod
+    def from_env(cls) -> AwsClientSettings:
+        """AWS_CLIENT_* 環境変数から設定を読み込む"""
+        return cls(
+            max_pool_connections=int(
+                os.getenv(
+                    "AWS_CLIENT_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS
+                )
+            ),
+            tcp_keepalive=_env_bool("AWS_CLIENT_TCP_KEEPALIVE", True),
+            connect_timeout=float(
+                os.getenv("AWS_CLIENT_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT_SECONDS)
+            ),
+            read_timeout=float(
+                os.getenv("AWS_CLIENT_READ_TIMEOUT", DEFAULT_READ_TIMEOUT_SECONDS)
+            ),
+            max_attempts=int(
+                os.getenv("AWS_CLIENT_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+            ),
+            retry_mode=os.getenv("AWS_CLIENT_RETRY_MODE", DEFAULT_RETRY_MODE),
+        )
+
+    def to_config(self) -> Config:
+        from botocore.config import Config
+
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            # botocore の max_attempts は初回を除く再試行回数のため、
+            # 初回を含む試行回数として total_max_attempts を渡す
+            retries={"mode": self.retry_mode, "total_max_attempts": self.max_attempts},
+        )
+
+    @property
+    def attempt_seconds(self) -> float:
+        """1回の試行にかかりうる最大秒数（接続 + 読み取りのタイムアウト）"""
+        return self.connect_timeout + self.read_timeout
+
+    def with_read_timeout(self, read_timeout: float) -> AwsClientSettings:
+        return replace(
+            self,
+            read_timeout=read_timeout,
+            connect_timeout=min(self.connect_timeout, read_timeout),
+        )
+
+    def within(self, remaining: float) -> AwsClientSettings | None:
+        """全試行が remaining 秒に収まる設定（収まらなければ None）
+
+        全試行が収まる最大の読み取りタイムアウトの段階を選ぶ。
+        どの段階でも収まらなければ、最小の段階で収まる回数だけ試行する。
+        """
+        candidates = sorted(
+            {
+                *(b for b in TIMEOUT_BUCKETS_SECONDS if b < self.read_timeout),
+                self.read_timeout,
+            }
+        )
+        for read_timeout in reversed(candidates):
+            settings = self.with_read_timeout(read_timeout)
+            if settings.attempt_seconds * settings.max_attempts <= remaining:
+                return settings
+        settings = self.with_read_timeout(candidates[0])
+        attempts = min(int(remaining // settings.attempt_seconds), self.max_attempts)
+        if attempts < 1:
+            return None
+        return replace(settings, max_attempts=attempts)
+
+
+@dataclass
+class ClientStats:
+    """サービスごとの呼び出し・再試行のカウンター
+
+    - calls: API 呼び出し回数（再試行は含まない）
+    - retries: SDK 内部で行われた再試行の合計
+    - errors: 応答を受け取れずに失敗した呼び出し（接続エラー・タイムアウト）
+    """
+
+    calls: int = 0
+    retries: int = 0
+    errors: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_call(self, retry_attempts: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += retry_attempts
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+
+class AwsClientRegistry:
+    """コンテナ内で共有する botocore セッションとサービスごとのクライアント
+
+    セッション・クライアントは最初に使われたときに1回だけ作成し、
+    以降の呼び出し（ウォームスタートを含む）では同じ接続プールを再利用する。
+    """
+
+    def __init__(self, settings: AwsClientSettings | None = None) -> None:
+        self._settings = settings
+        self._session: Session | None = None
+        self._clients: dict[tuple[str, AwsClientSettings | None], object] = {}
+        self._stats: dict[str, ClientStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self) -> AwsClientSettings:
+        if self._settings is None:
+            self._settings = AwsClientSettings.from_env()
+        return self._settings
+
+    def client(self, service_name: str, settings: AwsClientSettings | None = None):
+        """サービスのクライアントを返す（未作成なら作成する）
+
+        settings を指定した場合は、その設定専用のクライアントを返す。
+        """
+        if settings == self.settings:
+            settings = None
+        key = (service_name, settings)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create_client(service_name, settings or self.settings)
+                self._clients[key] = client
+        return client
+
+    def deadline_client(self, service_name: str):
+        """現在の締め切りに全試行が収まるタイムアウト・試行回数のクライアントを返す
+
+        最小の段階でも1回の試行が収まらない場合は、送信せずに
+        DeadlineExceededException とする。
+        """
+        remaining = remaining_seconds()
+        if remaining is None:
+            return self.client(service_name)
+        settings = self.settings.within(remaining)
+        if settings is None:
+            raise DeadlineExceededException(
+                f"{remaining * 1000:.0f} ms left is too short to call {service_name}"
+            )
+        return self.client(service_name, settings)
+
+    def _create_client(self, service_name: str, settings: AwsClientSettings):
+        if self._session is None:
+            import botocore.session
+
+            self._session = botocore.session.get_session()
+        client = self._session.create_client(service_name, config=settings.to_config())
+
+        stats = self._stats.setdefault(service_name, ClientStats())
+
+        def on_after_call(parsed=None, **kwargs) -> None:
+            metadata = (parsed or {}).get("ResponseMetadata", {})
+            stats.record_call(metadata.get("RetryAttempts", 0))
+
+        def on_after_call_error(**kwargs) -> None:
+            stats.record_error()
+
+        def on_before_send(**kwargs) -> None:
+            # 再試行を含む各試行の直前に確認し、タイムアウトまで待つと締め切りを
+            # 過ぎる試行（再試行の待機で残りが減った場合など）は送信しない
+            check_deadline(settings.attempt_seconds)
+
+        events = client.meta.events
+        events.register("after-call", on_after_call)
+        events.register("after-call-error", on_after_call_error)
+        events.register("before-send", on_before_send)
+        return client
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """サービスごとの呼び出し・再試行・接続プールのカウンター"""
+        result: dict[str, dict[str, int]] = {}
+        for (service_name, _), client in list(self._clients.items()):
+            stats = self._stats[service_name]
+            entry = result.setdefault(
+                service_name,
+                {
+                    "calls": stats.calls,
+                    "retries": stats.retries,
+                    "errors": stats.errors,
+                    "connections_opened": 0,
+                    "pool_requests": 0,
+                },
+            )
+            for name, value in _pool_stats(client).items():
+                entry[name] += value
+        return result
+
+    def refresh(self) -> None:
+        """セッション・クライアントを作り直す（SnapStart の復元後用）
+
+        読み込み済みのサービス定義は新しいセッションに引き継ぎ、
+        接続プールと認証情報だけを新しくする。カウンターは維持する。
+        """
+        with self._lock:
+            previous = self._session
+            self._session = None
+            self._clients.clear()
+            if previous is None:
+                return
+            import botocore.session
+
+            session = botocore.session.get_session()
+            session.register_component(
+                "data_loader", previous.get_component("data_loader")
+            )
+            self._session = session
+
+    def reset(self) -> None:
+        """作成済みのセッション・クライアントを破棄する（テスト用）"""
+        with self._lock:
+            self._session = None
+            self._clients.clear()
+            self._stats.clear()
+
+
+class DeadlineAwareClient:
+    """呼び出しごとに締め切りに合ったクライアントへ委譲するプロキシ
+
+    リポジトリはコンテナ起動時にクライアントを保持するため、
+    保持したままでも呼び出し時点の残り時間でタイムアウトを選べるようにする。
+    """
+
+    def __init__(self, service_name: str, registry: AwsClientRegistry) -> None:
+        self._service_name = service_name
+        self._registry = registry
+
+    def __getattr__(self, name: str):
+        return getattr(self._registry.deadline_client(self._service_name), name)
+
+
+def _pool_stats(client) -> dict[str, int]:
+    """urllib3 の接続プールから、開いた接続数と送信リクエスト数を集計する
+
+    connections_opened に対して pool_requests が大きいほど接続が再利用されている。
+    botocore の内部構造に依存するため、取得できない場合は 0 を返す。
+    """
+    opened = requests = 0
+    # プールが並行して入れ替わった場合の KeyError も無視する
+    errors = (AttributeError, KeyError)
+    try:
+        manager = client._endpoint.http_session._manager
+        for key in manager.pools.keys():
+            pool = manager.pools[key]
+            opened += pool.num_connections
+            requests += pool.num_requests
+    except errors:
+        pass
+    return {"connections_opened": opened, "pool_requests": requests}
+
+
+_registry = AwsClientRegistry()
+
+
+def get_registry() -> AwsClientRegistry:
+    return _registry
+
+
+def get_client(service_name: str):
+    """コンテナ内で共有するクライアントを返す"""
+    return _registry.client(service_name)
+
+
+def get_deadline_aware_client(service_name: str) -> DeadlineAwareClient:
+    """締め切りに合わせてタイムアウトを選ぶ、コンテナ内で共有するクライアントを返す"""
+    return DeadlineAwareClient(service_name, _registry)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import functools
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+# Lambda のタイムアウトより手前で打ち切るための余裕（レスポンス返却・ログ出力分）
+DEFAULT_SAFETY_MARGIN_MS = 500
+
+# 実行中の呼び出しの締め切り（time.monotonic() 基準、未設定なら None）
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededException(Exception):
+    """Lambda の残り時間内に処理を終えられない場合
+
+    Step Functions はエラー名（クラス名）で捕捉し、新しい実行として再試行する。
+    """
+
+    pass
+
+
+def safety_margin_ms() -> int:
+    return int(os.getenv("DEADLINE_SAFETY_MARGIN_MS", DEFAULT_SAFETY_MARGIN_MS))
+
+
+def remaining_seconds() -> float | None:
+    """締め切りまでの残り秒数（締め切りが未設定なら None）"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(required_seconds: float = 0.0) -> None:
+    """締め切りまでの残りが required_seconds 以下なら DeadlineExceededException"""
+    remaining = remaining_seconds()
+    if remaining is None or remaining > required_seconds:
+        return
+    if remaining <= 0:
+        raise DeadlineExceededException(
+            f"Deadline exceeded by {-remaining * 1000:.0f} ms"
+        )
+    raise DeadlineExceededException(
+        f"{remaining * 1000:.0f} ms left, {required_seconds * 1000:.0f} ms required"
+    )
+
+
+def with_deadline(handler: Callable) -> Callable:
+    """Lambda の残り時間から呼び出しごとの締め切りを設定するデコレーター
+
+    締め切りは context.get_remaining_time_in_millis() から安全マージンを引いた時刻。
+    AWS クライアントはこの締め切りに合わせてタイムアウトと再試行を打ち切る。
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        budget_ms = context.get_remaining_time_in_millis() - safety_margin_ms()
+        token = _deadline.set(time.monotonic() + budget_ms / 1000)
+        try:
+            check_deadline()
+            return handler(event, context)
+        finally:
+            _deadline.reset(token)
+
+    return wrapper
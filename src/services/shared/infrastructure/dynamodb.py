@@ -0,0 +1,236 @@
+import random
+import time
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    DuplicateResourceException,
+)
+from services.shared.infrastructure.aws import get_deadline_aware_client
+
+# アイテムはすべて低レベル API の AttributeValue 形式（{"S": ...}）で扱う
+AttributeValue = dict[str, Any]
+Item = dict[str, AttributeValue]
+
+# 冪等な再書き込みの判定で比較しない属性
+# （後続処理で変わるステータスと、シャード変更で変わる一覧用キー）
+IDEMPOTENCY_IGNORED_ATTRIBUTES = frozenset({"status", "GSI1PK", "GSI1SK"})
+
+# BatchGetItem / BatchWriteItem の1リクエストあたりの上限
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+# UnprocessedKeys / UnprocessedItems の再試行設定
+BATCH_MAX_ATTEMPTS = 8
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+BATCH_BACKOFF_MAX_SECONDS = 2.0
+
+# 事前に組み立てた式（呼び出しごとに Condition オブジェクトを構築しない）
+PUT_IF_NOT_EXISTS_CONDITION = "attribute_not_exists(PK)"
+SET_STATUS_UPDATE = "SET #status = :status"
+STATUS_NAMES = {"#status": "status"}
+
+
+class BatchIncompleteException(Exception):
+    """再試行しても未処理のキー・アイテムが残った場合"""
+
+    pass
+
+
+def get_dynamodb_client():
+    """コンテナ内で共有する DynamoDB 低レベルクライアント（締め切り対応）"""
+    return get_deadline_aware_client("dynamodb")
+
+
+def encode_value(value: Any) -> AttributeValue:
+    """Python の値を AttributeValue に変換する（スキーマのない属性用）"""
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, float):
+        return {"N": str(Decimal(str(value)))}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, dict):
+        return {"M": {k: encode_value(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [encode_value(v) for v in value]}
+    raise TypeError(f"Unsupported type for DynamoDB: {type(value).__name__}")
+
+
+def decode_value(value: AttributeValue) -> Any:
+    """AttributeValue を Python の値に変換する（スキーマのない属性用）"""
+    if "S" in value:
+        return value["S"]
+    if "N" in value:
+        return Decimal(value["N"])
+    if "M" in value:
+        return {k: decode_value(v) for k, v in value["M"].items()}
+    if "L" in value:
+        return [decode_value(v) for v in value["L"]]
+    if "BOOL" in value:
+        return value["BOOL"]
+    if "NULL" in value:
+        return None
+    raise TypeError(f"Unsupported AttributeValue: {list(value)}")
+
+
+def encode_item(item: dict) -> Item:
+    return {name: encode_value(value) for name, value in item.items()}
+
+
+def decode_item(item: Item) -> dict:
+    return {name: decode_value(value) for name, value in item.items()}
+
+
+def is_conditional_check_failed(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def put_item_idempotent(
+    client,
+    table_name: str,
+    item: Item,
+    ignored_attributes: frozenset[str] = IDEMPOTENCY_IGNORED_ATTRIBUTES,
+) -> Item | None:
+    """存在しない場合のみアイテムを書き込む（冪等）
+
+    - 新規に書き込んだ場合は None
+    - 同じ内容のアイテムが既に存在する場合は、保存済みのアイテムを返す
+    - 異なる内容のアイテムが既に存在する場合は DuplicateResourceException
+
+    既存アイテムは ReturnValuesOnConditionCheckFailure=ALL_OLD で
+    同じリクエストのエラー応答から受け取るため、追加の読み取りは発生しない。
+    """
+    try:
+        client.put_item(
+            TableName=table_name,
+            Item=item,
+            ConditionExpression=PUT_IF_NOT_EXISTS_CONDITION,
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+    except ClientError as e:
+        if not is_conditional_check_failed(e):
+            raise
+        stored = e.response.get("Item", {})
+        if _payload(stored, ignored_attributes) != _payload(item, ignored_attributes):
+            raise DuplicateResourceException(
+                f"Resource already exists with a different payload: "
+                f"PK={item['PK']['S']}, SK={item['SK']['S']}"
+            )
+        return stored
+    return None
+
+
+def _payload(item: Item, ignored_attributes: frozenset[str]) -> Item:
+    return {k: v for k, v in item.items() if k not in ignored_attributes}
+
+
+def transition_item_status(
+    client,
+    table_name: str,
+    key: Item,
+    to_status: str,
+    from_statuses: Iterable[str],
+) -> Item | None:
+    """1回の条件付き UpdateItem でステータスを遷移させ、遷移後のアイテムを返す
+
+    - アイテムが存在しない場合は None
+    - 遷移元ステータスでなければ、条件チェック失敗時の ALL_OLD（現在のアイテム）を返す。
+      遷移できない状態かどうか（すでに遷移済みなど）は呼び出し側のエンティティで判定する
+    """
+    values = {":status": {"S": to_status}}
+    placeholders = []
+    for index, status in enumerate(from_statuses):
+        values[f":from{index}"] = {"S": status}
+        placeholders.append(f":from{index}")
+
+    try:
+        response = client.update_item(
+            TableName=table_name,
+            Key=key,
+            UpdateExpression=SET_STATUS_UPDATE,
+            ConditionExpression=(
+                f"attribute_exists(PK) AND #status IN ({', '.join(placeholders)})"
+            ),
+            ExpressionAttributeNames=STATUS_NAMES,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+    except ClientError as e:
+        if not is_conditional_check_failed(e):
+            raise
+        return e.response.get("Item") or None
+    return response["Attributes"]
+
+
+def _key_of(item: Item) -> tuple[str, str]:
+    return (item["PK"]["S"], item["SK"]["S"])
+
+
+def _chunks(values: list, size: int) -> Iterable[list]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _backoff(attempt: int) -> None:
+    """Full Jitter による指数バックオフ"""
+    cap = min(BATCH_BACKOFF_MAX_SECONDS, BATCH_BACKOFF_BASE_SECONDS * 2**attempt)
+    time.sleep(random.uniform(0, cap))
+
+
+def batch_get_items(client, table_name: str, keys: list[Item]) -> list[Item | None]:
+    """BatchGetItem でアイテムをまとめて取得する
+
+    - 100 キーごとに分割し、重複したキーは1回だけ取得する
+    - UnprocessedKeys はジッター付きバックオフで再試行する
+    - 結果は keys と同じ順序で返す（存在しないキーは None）
+    """
+    unique_keys = list({_key_of(key): key for key in keys}.values())
+    found: dict[tuple[str, str], Item] = {}
+
+    for chunk in _chunks(unique_keys, BATCH_GET_MAX_KEYS):
+        request = {table_name: {"Keys": chunk, "ConsistentRead": True}}
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = client.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                found[_key_of(item)] = item
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                break
+            _backoff(attempt)
+        else:
+            raise BatchIncompleteException(
+                f"Unprocessed keys remain after {BATCH_MAX_ATTEMPTS} attempts"
+            )
+
+    return [found.get(_key_of(key)) for key in keys]
+
+
+def batch_write_items(client, table_name: str, items: list[Item]) -> None:
+    """BatchWriteItem でアイテムをまとめて書き込む（条件なしの上書き）
+
+    - 25 アイテムごとに分割し、同じキーが複数ある場合は後のアイテムを書き込む
+    - UnprocessedItems はジッター付きバックオフで再試行する
+    """
+    unique_items = list({_key_of(item): item for item in items}.values())
+
+    for chunk in _chunks(unique_items, BATCH_WRITE_MAX_ITEMS):
+        request = {table_name: [{"PutRequest": {"Item": item}} for item in chunk]}
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = client.batch_write_item(RequestItems=request)
+            request = response.get("UnprocessedItems") or {}
+            if not request:
+                break
+            _backoff(attempt)
+        else:
+            raise BatchIncompleteException(
+                f"Unprocessed items remain after {BATCH_MAX_ATTEMPTS} attempts"
+            )
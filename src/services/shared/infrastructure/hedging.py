@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+T = TypeVar("T")
+
+# ヘッジ送信を判断するレイテンシのパーセンタイル
+DEFAULT_HEDGE_PERCENTILE = 95.0
+
+# 追加リクエストの上限（通常リクエストに対する割合と、まとめて使える上限）
+DEFAULT_HEDGE_BUDGET_RATIO = 0.1
+DEFAULT_HEDGE_BUDGET_BURST = 10
+
+# サンプルが少ない間に使う待ち時間
+DEFAULT_HEDGE_DELAY_MS = 50
+
+# パーセンタイルの算出に使う直近のサンプル数と、算出に必要な最小サンプル数
+HISTOGRAM_WINDOW = 512
+HISTOGRAM_MIN_SAMPLES = 20
+
+
+class LatencyHistogram:
+    """直近のレイテンシを保持し、パーセンタイルを返すローリングヒストグラム"""
+
+    def __init__(
+        self,
+        window: int = HISTOGRAM_WINDOW,
+        min_samples: int = HISTOGRAM_MIN_SAMPLES,
+    ) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """percent パーセンタイルの秒数（サンプル不足なら None）"""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """ヘッジによる追加リクエストを通常リクエストの一定割合に抑えるトークンバケット"""
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_HEDGE_BUDGET_RATIO,
+        burst: int = DEFAULT_HEDGE_BUDGET_BURST,
+    ) -> None:
+        self._ratio = ratio
+        self._burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """通常リクエスト1回分のトークンを加える"""
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        """トークンが残っていれば1つ消費して True"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class Hedger:
+    """ヘッジ付きで読み取りを実行する
+
+    - 先行リクエストが percentile の待ち時間内に返らなければ、同じリクエストを
+      もう1つ送り、先に成功した応答を使う
+    - 追加リクエストの数は HedgeBudget で制限する
+    - 送信・勝利した回数を Metrics（HedgeFired / HedgeWon）に記録し、
+      ヘッジを送った呼び出しの終わりに出力する
+
+    読み取り専用の冪等なリクエストにだけ使うこと。
+    """
+
+    def __init__(
+        self,
+        histogram: LatencyHistogram | None = None,
+        budget: HedgeBudget | None = None,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        default_delay_ms: int = DEFAULT_HEDGE_DELAY_MS,
+        metrics: Metrics | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        self.histogram = histogram or LatencyHistogram()
+        self.budget = budget or HedgeBudget()
+        self.percentile = percentile
+        self.default_delay = default_delay_ms / 1000
+        self.metrics = metrics
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    @classmethod
+    def from_env(cls, metrics: Metrics | None = None) -> Hedger | None:
+        """HEDGING_ENABLED が有効なら環境変数の設定で作成する（無効なら None）"""
+        if os.getenv("HEDGING_ENABLED", "false").lower() not in ("1", "true"):
+            return None
+        return cls(
+            budget=HedgeBudget(
+                ratio=float(os.getenv("HEDGE_BUDGET_RATIO", DEFAULT_HEDGE_BUDGET_RATIO))
+            ),
+            percentile=float(os.getenv("HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE)),
+            default_delay_ms=int(
+                os.getenv("HEDGE_DEFAULT_DELAY_MS", DEFAULT_HEDGE_DELAY_MS)
+            ),
+            metrics=metrics,
+        )
+
+    def delay(self) -> float:
+        """ヘッジを送るまでの待ち時間（秒）"""
+        observed = self.histogram.percentile(self.percentile)
+        return self.default_delay if observed is None else observed
+
+    def call(self, request: Callable[[], T]) -> T:
+        self.budget.deposit()
+        primary = self._submit(request)
+        done, _ = wait([primary], timeout=self.delay())
+        if done or not self.budget.try_spend():
+            return primary.result()
+
+        self._add_metric("HedgeFired")
+        try:
+            return self._race(primary, self._submit(request))
+        finally:
+            self._flush_metrics()
+
+    def _race(self, primary: Future[T], hedge: Future[T]) -> T:
+        """先に成功した応答を返す"""
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded:
+                winner = primary if primary in succeeded else hedge
+                if winner is hedge:
+                    self._add_metric("HedgeWon")
+                return winner.result()
+            if not pending:
+                # 両方失敗した場合は先行リクエストのエラーを送出する
+                return primary.result()
+
+    def _submit(self, request: Callable[[], T]) -> Future[T]:
+        # 締め切りなどのコンテキスト変数を引き継いでワーカースレッドで実行する
+        context = contextvars.copy_context()
+        started = time.perf_counter()
+        future = self._executor.submit(context.run, request)
+        future.add_done_callback(
+            lambda _: self.histogram.record(time.perf_counter() - started)
+        )
+        return future
+
+    def _add_metric(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.add_metric(name=name, unit=MetricUnit.Count, value=1)
+
+    def _flush_metrics(self) -> None:
+        # メトリクスはヘッジを送った呼び出しでだけ記録されるため、その場で出力する
+        # （ハンドラーの log_metrics だと、ほとんどの呼び出しが空の出力の警告になる）
+        if self.metrics is not None:
+            self.metrics.flush_metrics()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel
+
+from services.shared.infrastructure.aws import get_registry
+
+F = TypeVar("F", bound=Callable[[], None])
+M = TypeVar("M", bound=BaseModel)
+
+# SnapStart のランタイムフック。snapshot_restore_py は Lambda の Python ランタイムに
+# 含まれるため、ローカル・テストでは読み込めず、フックは登録しない。
+try:
+    from snapshot_restore_py import register_after_restore, register_before_snapshot
+except ImportError:
+    register_after_restore = None
+    register_before_snapshot = None
+
+
+def before_snapshot(func: F) -> F:
+    """スナップショット作成前に実行する関数を登録するデコレーター"""
+    if register_before_snapshot is not None:
+        register_before_snapshot(func)
+    return func
+
+
+def after_restore(func: F) -> F:
+    """スナップショットからの復元後に実行する関数を登録するデコレーター"""
+    if register_after_restore is not None:
+        register_after_restore(func)
+    return func
+
+
+def validate_example(model: type[M]) -> M:
+    """モデルの json_schema_extra の先頭の例を検証する（バリデーターの初期化用）"""
+    example = model.model_config["json_schema_extra"]["examples"][0]
+    return model.model_validate(example)
+
+
+def prime_aws_clients(*service_names: str) -> None:
+    """クライアントを作成し、サービス定義・エンドポイント解決を読み込んでおく"""
+    registry = get_registry()
+    for service_name in service_names:
+        registry.client(service_name)
+
+
+@after_restore
+def refresh_aws_clients() -> None:
+    """復元後に接続と認証情報を作り直す
+
+    スナップショット内の接続は復元後には切断されており、認証情報も
+    スナップショット作成時のものになるため、クライアントを作り直す。
+    """
+    get_registry().refresh()
@@ -0,0 +1,135 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    BusinessRuleViolationException,
+)
+from services.shared.infrastructure.dynamodb import is_conditional_check_failed
+from services.shared.infrastructure.shard_map import (
+    SHARD_MAP_CACHE_TTL_SECONDS,
+    TRIP_SUMMARIES_PARTITION_PREFIX,
+    TRIPS_PARTITION_PREFIX,
+    DynamoDBShardMapStore,
+    ShardMap,
+)
+
+# entity_type ごとの GSI1PK プレフィックス
+DEFAULT_PARTITION_PREFIXES = {
+    "PAYMENT": TRIPS_PARTITION_PREFIX,
+    "TRIP_SUMMARY": TRIP_SUMMARIES_PARTITION_PREFIX,
+}
+
+
+@dataclass(frozen=True)
+class BackfillResult:
+    """バックフィルの集計結果"""
+
+    scanned: int = 0
+    rewritten: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: "BackfillResult") -> "BackfillResult":
+        return BackfillResult(
+            scanned=self.scanned + other.scanned,
+            rewritten=self.rewritten + other.rewritten,
+            skipped=self.skipped + other.skipped,
+        )
+
+
+class ShardBackfill:
+    """シャード数変更中に既存アイテムの GSI1PK を新しいシャードへ書き換えるジョブ
+
+    テーブルを total_segments 個のセグメントに分けて並列 Scan し、
+    GSI1PK が新しいシャードマップと一致しないアイテムだけを更新する。
+    更新は「GSI1PK が読み取った値のまま」を条件とするため、
+    並行する書き込みを上書きしない。
+
+    手順:
+        1. store.save(shard_map.begin_migration(n), expected_version=...)
+        2. SHARD_MAP_CACHE_TTL_SECONDS 経過後に ShardBackfill.run()
+        3. store.save(shard_map.complete_migration(), expected_version=...)
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        store: DynamoDBShardMapStore,
+        total_segments: int = 8,
+        partition_prefixes: dict[str, str] | None = None,
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+        self._store = store
+        self._total_segments = total_segments
+        self._partition_prefixes = partition_prefixes or DEFAULT_PARTITION_PREFIXES
+
+    def run(self) -> BackfillResult:
+        """全セグメントを並列に処理する"""
+        shard_map = self._store.get()
+        if not shard_map.migrating:
+            raise BusinessRuleViolationException("No shard migration in progress")
+        if time.time() < shard_map.updated_at + SHARD_MAP_CACHE_TTL_SECONDS:
+            # 古いシャードマップをキャッシュした書き込みが残っている可能性がある
+            raise BusinessRuleViolationException(
+                "Shard map change has not propagated to all writers yet"
+            )
+
+        with ThreadPoolExecutor(max_workers=self._total_segments) as executor:
+            results = executor.map(
+                lambda segment: self._backfill_segment(segment, shard_map),
+                range(self._total_segments),
+            )
+            return sum(results, BackfillResult())
+
+    def _backfill_segment(self, segment: int, shard_map: ShardMap) -> BackfillResult:
+        result = BackfillResult()
+        entity_types = {
+            f":type{index}": {"S": entity_type}
+            for index, entity_type in enumerate(self._partition_prefixes)
+        }
+        kwargs: dict = {
+            "TableName": self._table_name,
+            "Segment": segment,
+            "TotalSegments": self._total_segments,
+            "FilterExpression": (
+                f"entity_type IN ({', '.join(entity_types)}) "
+                "AND attribute_exists(GSI1PK)"
+            ),
+            "ExpressionAttributeValues": entity_types,
+            "ProjectionExpression": "PK, SK, entity_type, trip_id, GSI1PK",
+        }
+        while True:
+            response = self._client.scan(**kwargs)
+            for item in response.get("Items", []):
+                result += self._rewrite(item, shard_map)
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return result
+            kwargs["ExclusiveStartKey"] = last_key
+
+    def _rewrite(self, item: dict, shard_map: ShardMap) -> BackfillResult:
+        prefix = self._partition_prefixes[item["entity_type"]["S"]]
+        target = shard_map.write_partition(item["trip_id"]["S"], prefix=prefix)
+        if item["GSI1PK"]["S"] == target:
+            return BackfillResult(scanned=1)
+
+        try:
+            self._client.update_item(
+                TableName=self._table_name,
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET GSI1PK = :target",
+                ConditionExpression="GSI1PK = :current",
+                ExpressionAttributeValues={
+                    ":target": {"S": target},
+                    ":current": item["GSI1PK"],
+                },
+            )
+        except ClientError as e:
+            if is_conditional_check_failed(e):
+                return BackfillResult(scanned=1, skipped=1)
+            raise
+        return BackfillResult(scanned=1, rewritten=1)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    BusinessRuleViolationException,
+    OptimisticLockException,
+)
+from services.shared.infrastructure.dynamodb import is_conditional_check_failed
+
+DEFAULT_SHARD_COUNT = 4
+
+# シャードマップは一覧用 GSI1 と同じテーブルに1アイテムとして保持する
+SHARD_MAP_KEY = {"PK": {"S": "CONFIG#SHARD_MAP"}, "SK": {"S": "CONFIG#SHARD_MAP"}}
+
+TRIPS_PARTITION_PREFIX = "TRIPS"
+
+# 旅行サマリー（読み取りモデル）の一覧用パーティション
+TRIP_SUMMARIES_PARTITION_PREFIX = "TRIP_SUMMARIES"
+
+# 書き込み側がシャードマップをキャッシュする秒数。
+# マイグレーション開始からこの秒数が経過すれば、全コンテナが新しいシャード数で書き込む。
+SHARD_MAP_CACHE_TTL_SECONDS = 60
+
+
+def compute_shard(trip_id: str, shard_count: int) -> int:
+    """trip_id から決定論的にシャード番号を算出する"""
+    return int(hashlib.sha256(trip_id.encode()).hexdigest(), 16) % shard_count
+
+
+@dataclass(frozen=True)
+class ShardMap:
+    """GSI1 一覧パーティションのシャード構成（バージョン付き）
+
+    マイグレーション中は previous_shard_count が設定され、
+    書き込みは新しいシャード数、読み取りは新旧両方のパーティションに対して行う。
+    """
+
+    version: int = 0
+    shard_count: int = DEFAULT_SHARD_COUNT
+    previous_shard_count: int | None = None
+    updated_at: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.shard_count < 1:
+            raise ValueError("shard_count must be positive")
+
+    @property
+    def migrating(self) -> bool:
+        return self.previous_shard_count is not None
+
+    def write_partition(
+        self, trip_id: str, prefix: str = TRIPS_PARTITION_PREFIX
+    ) -> str:
+        """書き込み先の GSI1PK"""
+        return f"{prefix}#{compute_shard(trip_id, self.shard_count)}"
+
+    def read_partitions(self, prefix: str = TRIPS_PARTITION_PREFIX) -> list[str]:
+        """読み取り対象の GSI1PK 一覧（マイグレーション中は新旧の和集合）"""
+        shard_count = max(self.shard_count, self.previous_shard_count or 0)
+        return [f"{prefix}#{shard}" for shard in range(shard_count)]
+
+    def begin_migration(self, new_shard_count: int) -> ShardMap:
+        """シャード数の変更を開始する"""
+        if self.migrating:
+            raise BusinessRuleViolationException(
+                "Shard migration is already in progress"
+            )
+        if new_shard_count == self.shard_count:
+            raise BusinessRuleViolationException(
+                f"Shard count is already {new_shard_count}"
+            )
+        return ShardMap(
+            version=self.version + 1,
+            shard_count=new_shard_count,
+            previous_shard_count=self.shard_count,
+            updated_at=time.time(),
+        )
+
+    def complete_migration(self) -> ShardMap:
+        """バックフィル完了後、旧パーティションの読み取りをやめる"""
+        if not self.migrating:
+            raise BusinessRuleViolationException("No shard migration in progress")
+        return replace(
+            self,
+            version=self.version + 1,
+            previous_shard_count=None,
+            updated_at=time.time(),
+        )
+
+
+class DynamoDBShardMapStore:
+    """シャードマップを DynamoDB に保存・取得する
+
+    読み取りはコンテナ内で SHARD_MAP_CACHE_TTL_SECONDS だけキャッシュする。
+    アイテムが存在しない場合は DEFAULT_SHARD_COUNT の初期構成（version=0）を返す。
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        cache_ttl_seconds: float = SHARD_MAP_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+        self._cache_ttl_seconds = cache_ttl_seconds
+        self._cached: ShardMap | None = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> ShardMap:
+        """現在のシャードマップを取得する（キャッシュあり）"""
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is None or now - self._cached_at >= self._cache_ttl_seconds:
+                self._cached = self._load()
+                self._cached_at = now
+            return self._cached
+
+    def _load(self) -> ShardMap:
+        response = self._client.get_item(
+            TableName=self._table_name, Key=SHARD_MAP_KEY, ConsistentRead=True
+        )
+        item = response.get("Item")
+        if not item:
+            return ShardMap()
+        previous = item.get("previous_shard_count")
+        return ShardMap(
+            version=int(item["version"]["N"]),
+            shard_count=int(item["shard_count"]["N"]),
+            previous_shard_count=int(previous["N"]) if previous else None,
+            updated_at=float(item.get("updated_at", {"N": "0"})["N"]),
+        )
+
+    def save(self, shard_map: ShardMap, expected_version: int) -> None:
+        """シャードマップを保存する（version による楽観ロック）"""
+        item: dict = {
+            **SHARD_MAP_KEY,
+            "entity_type": {"S": "SHARD_MAP"},
+            "version": {"N": str(shard_map.version)},
+            "shard_count": {"N": str(shard_map.shard_count)},
+            "updated_at": {"N": repr(shard_map.updated_at)},
+        }
+        if shard_map.previous_shard_count is not None:
+            item["previous_shard_count"] = {"N": str(shard_map.previous_shard_count)}
+
+        kwargs: dict = {"TableName": self._table_name, "Item": item}
+        if expected_version == 0:
+            kwargs["ConditionExpression"] = "attribute_not_exists(PK)"
+        else:
+            kwargs["ConditionExpression"] = "version = :expected"
+            kwargs["ExpressionAttributeValues"] = {
+                ":expected": {"N": str(expected_version)}
+            }
+
+        try:
+            self._client.put_item(**kwargs)
+        except ClientError as e:
+            if is_conditional_check_failed(e):
+                raise OptimisticLockException(
+                    f"Shard map version conflict: expected {expected_version}"
+                )
+            raise
+
+        with self._lock:
+            self._cached = shard_map
+            self._cached_at = time.monotonic()
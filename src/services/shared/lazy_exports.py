@@ -0,0 +1,26 @@
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """パッケージの公開名を最初に参照されたときに読み込む（PEP 562）
+
+    exports は 公開名 → 定義しているモジュール（package からの相対名）。
+    返り値をパッケージの __getattr__ / __dir__ に設定して使う。
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module_name, package), name)
+        # 2回目以降はモジュール属性として直接参照させる
+        setattr(import_module(package), name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(import_module(package)), *exports})
+
+    return __getattr__, __dir__
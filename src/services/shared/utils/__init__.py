@@ -1,3 +1,9 @@
 from .http_response import api_response as api_response
+from .http_response import compute_etag as compute_etag
+from .http_response import etag_matches as etag_matches
+from .http_response import not_modified_response as not_modified_response
 from .logger import get_logger as get_logger
+from .serializer import dumps as dumps
+from .serializer import get_serializer as get_serializer
+from .ttl_cache import TTLCache as TTLCache
 from .validators import to_decimal as to_decimal
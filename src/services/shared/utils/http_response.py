@@ -1,10 +1,35 @@
-import json
+import hashlib
 
+from .serializer import dumps
 
-def api_response(status_code: int, body: dict) -> dict:
-    """API Gateway HTTP API のレスポンス形式を生成する"""
+
+def api_response(
+    status_code: int, body: dict | str, headers: dict[str, str] | None = None
+) -> dict:
+    """API Gateway HTTP API のレスポンス形式を生成する
+
+    body が str の場合はシリアライズ済みの JSON としてそのまま返す。
+    """
     return {
         "statusCode": status_code,
-        "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body, default=str),
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "body": body if isinstance(body, str) else dumps(body),
     }
+
+
+def compute_etag(body: str) -> str:
+    """レスポンスボディの内容から強い ETag を生成する"""
+    return '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match ヘッダーが ETag に一致するか（弱い比較）"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified_response(etag: str, headers: dict[str, str] | None = None) -> dict:
+    """304 Not Modified（ボディなし）"""
+    return {"statusCode": 304, "headers": {"ETag": etag, **(headers or {})}, "body": ""}
@@ -0,0 +1,63 @@
+import json
+import os
+from functools import cache
+from typing import Any, Protocol
+
+
+class JsonSerializer(Protocol):
+    """レスポンスボディの JSON シリアライザー"""
+
+    name: str
+
+    def dumps(self, obj: Any) -> str: ...
+
+
+class CompiledJsonSerializer:
+    """設定済みの JSONEncoder を使い回す実装
+
+    出力は json.dumps(obj, default=str) とバイト単位で同じ（ASCII エスケープ・
+    既定の区切り）で、ETag は切り替えの前後で変わらない。
+
+    - json.dumps にオプションを渡すと呼び出しごとに JSONEncoder が作られるため、
+      1つ作って使い回す。
+    - DynamoDB の Decimal は組み込みの str（C 実装）で文字列にする。
+      Python の関数を default に渡すと Decimal ごとにフレームが作られる。
+    - レスポンスは DynamoDB のアイテムから組み立てた木構造で循環しないため、
+      コンテナごとに id を記録する循環参照チェックは行わない。
+    """
+
+    name = "compiled"
+
+    def __init__(self) -> None:
+        self._encode = json.JSONEncoder(default=str, check_circular=False).encode
+
+    def dumps(self, obj: Any) -> str:
+        return self._encode(obj)
+
+
+class StdlibJsonSerializer:
+    """従来どおり json.dumps(obj, default=str) を呼ぶ実装"""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+
+SERIALIZERS = {
+    CompiledJsonSerializer.name: CompiledJsonSerializer,
+    StdlibJsonSerializer.name: StdlibJsonSerializer,
+}
+
+
+@cache
+def get_serializer() -> JsonSerializer:
+    """JSON_SERIALIZER（compiled / stdlib、既定は compiled）のシリアライザーを返す"""
+    name = os.getenv("JSON_SERIALIZER", CompiledJsonSerializer.name).lower()
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown JSON_SERIALIZER: {name}")
+    return SERIALIZERS[name]()
+
+
+def dumps(obj: Any) -> str:
+    return get_serializer().dumps(obj)
@@ -0,0 +1,21 @@
+from services.shared.domain import TripId
+from services.trip.domain import Trip, TripAggregateRepository
+
+
+class CancelTripService:
+    """旅行一括キャンセルサービス
+
+    フライト・ホテル・決済を1回の読み込みと1回のトランザクションで取り消す。
+    """
+
+    def __init__(self, repository: TripAggregateRepository) -> None:
+        self._repository = repository
+
+    def cancel(self, trip_id: TripId) -> Trip | None:
+        """旅行をキャンセルする"""
+        trip = self._repository.find_by_id(trip_id)
+        if trip is None:
+            return None
+        trip.cancel()
+        self._repository.save(trip)
+        return trip
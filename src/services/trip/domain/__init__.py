@@ -0,0 +1,2 @@
+from .entity import Trip as Trip
+from .repository import TripAggregateRepository as TripAggregateRepository
@@ -0,0 +1,2 @@
+from .trip import Trip as Trip
+from .trip import TripEntity as TripEntity
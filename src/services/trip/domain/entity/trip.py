@@ -0,0 +1,70 @@
+from enum import Enum
+
+from services.flight.domain.entity import Booking
+from services.hotel.domain.entity import HotelBooking
+from services.payment.domain.entity import Payment
+from services.payment.domain.enum import PaymentStatus
+from services.shared.domain import AggregateRoot, TripId
+
+TripEntity = Booking | HotelBooking | Payment
+
+
+class Trip(AggregateRoot[TripId]):
+    """旅行集約（フライト・ホテル・決済をまとめて扱う）
+
+    読み込み時点の各ステータスを保持し、変更されたエンティティだけを
+    changes() で返す。リポジトリはそのステータスを条件に一括で書き込む。
+    """
+
+    def __init__(
+        self,
+        id: TripId,
+        flight: Booking | None = None,
+        hotel: HotelBooking | None = None,
+        payment: Payment | None = None,
+    ) -> None:
+        super().__init__(id)
+        self._flight = flight
+        self._hotel = hotel
+        self._payment = payment
+        self._original_statuses: dict[TripEntity, Enum] = {}
+        self.clear_changes()
+
+    @property
+    def flight(self) -> Booking | None:
+        return self._flight
+
+    @property
+    def hotel(self) -> HotelBooking | None:
+        return self._hotel
+
+    @property
+    def payment(self) -> Payment | None:
+        return self._payment
+
+    @property
+    def entities(self) -> list[TripEntity]:
+        return [e for e in (self._flight, self._hotel, self._payment) if e is not None]
+
+    def cancel(self) -> None:
+        """旅行全体をキャンセルする（完了済みの決済は払い戻す）"""
+        if self._flight is not None:
+            self._flight.cancel()
+        if self._hotel is not None:
+            self._hotel.cancel()
+        if self._payment is not None and (
+            self._payment.status == PaymentStatus.COMPLETED
+        ):
+            self._payment.refund()
+
+    def changes(self) -> list[tuple[TripEntity, Enum]]:
+        """読み込み後にステータスが変わったエンティティと、元のステータス"""
+        return [
+            (entity, self._original_statuses[entity])
+            for entity in self.entities
+            if entity.status != self._original_statuses[entity]
+        ]
+
+    def clear_changes(self) -> None:
+        """現在のステータスを永続化済みの状態として記録する"""
+        self._original_statuses = {entity: entity.status for entity in self.entities}
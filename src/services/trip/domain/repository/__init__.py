@@ -0,0 +1,3 @@
+from .trip_aggregate_repository import (
+    TripAggregateRepository as TripAggregateRepository,
+)
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+from services.shared.domain import TripId
+from services.trip.domain.entity import Trip
+
+
+class TripAggregateRepository(ABC):
+    """旅行集約レポジトリ"""
+
+    @abstractmethod
+    def find_by_id(self, trip_id: TripId) -> Trip | None:
+        """旅行に属する予約・決済をまとめて取得する"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, trip: Trip) -> None:
+        """変更されたエンティティをまとめて書き込む"""
+        raise NotImplementedError
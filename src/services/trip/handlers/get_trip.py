@@ -1,22 +1,75 @@
 import os
-from typing import Callable
+from dataclasses import dataclass
+from functools import cache
 
-import boto3
-from aws_lambda_powertools import Logger
+from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.utilities.data_classes import (
     APIGatewayProxyEventV2,
     event_source,
 )
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from boto3.dynamodb.conditions import Key
 
-from services.shared.utils import api_response
+from services.shared.infrastructure.hedging import Hedger
+from services.shared.utils import (
+    TTLCache,
+    api_response,
+    compute_etag,
+    dumps,
+    etag_matches,
+    not_modified_response,
+)
+from services.trip.infrastructure.trip_read_model import (
+    DynamoDBTripReadModel,
+    is_settled,
+)
 
 logger = Logger()
+metrics = Metrics()
+
+
+@cache
+def get_read_model() -> DynamoDBTripReadModel:
+    """読み取りモデルを最初の呼び出し時に1回だけ組み立てる
+
+    HEDGING_ENABLED が有効な場合のみ、遅い読み取りにヘッジリクエストを送る。
+    """
+    return DynamoDBTripReadModel(hedger=Hedger.from_env(metrics))
 
-TABLE_NAME = os.environ["TABLE_NAME"]
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
+
+TRIP_CACHE_TTL_SECONDS = float(os.getenv("TRIP_CACHE_TTL_SECONDS", "30"))
+
+# CloudFront・クライアントのキャッシュも同じ方針にする。
+# 完了済みの旅行は trip_cache と同じ時間だけキャッシュさせ、
+# 実行中の旅行は毎回オリジンに問い合わせさせる（ETag が一致すれば 304）
+SETTLED_CACHE_CONTROL = f"max-age={int(TRIP_CACHE_TTL_SECONDS)}"
+IN_PROGRESS_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class CachedTrip:
+    """シリアライズ済みのレスポンスボディ・ETag・Cache-Control"""
+
+    body: str
+    etag: str
+    cache_control: str
+
+    @classmethod
+    def from_trip(cls, trip: dict) -> "CachedTrip":
+        body = dumps(trip)
+        return cls(
+            body=body,
+            etag=compute_etag(body),
+            cache_control=(
+                SETTLED_CACHE_CONTROL if is_settled(trip) else IN_PROGRESS_CACHE_CONTROL
+            ),
+        )
+
+
+# 完了済みの旅行だけをキャッシュする（サガ・補償の実行中の旅行は毎回読み取る）
+trip_cache: TTLCache[str, CachedTrip] = TTLCache(
+    max_size=int(os.getenv("TRIP_CACHE_MAX_SIZE", "256")),
+    ttl_seconds=TRIP_CACHE_TTL_SECONDS,
+)
 
 
 @logger.inject_lambda_context
@@ -33,70 +86,27 @@ def lambda_handler(event: APIGatewayProxyEventV2, context: LambdaContext) -> dic
     logger.info("Fetching trip details", extra={"trip_id": trip_id})
 
     try:
-        response = table.query(
-            KeyConditionExpression=Key("PK").eq(f"TRIP#{trip_id}"),
+        cached = trip_cache.get(trip_id)
+        if cached is None:
+            trip = get_read_model().get_trip(trip_id)
+            if trip is None:
+                return api_response(404, {"message": f"Trip not found: {trip_id}"})
+
+            cached = CachedTrip.from_trip(trip)
+            if is_settled(trip):
+                trip_cache.put(trip_id, cached)
+
+        if etag_matches(event.headers.get("If-None-Match"), cached.etag):
+            return not_modified_response(
+                cached.etag, headers={"Cache-Control": cached.cache_control}
+            )
+
+        return api_response(
+            200,
+            cached.body,
+            headers={"ETag": cached.etag, "Cache-Control": cached.cache_control},
         )
 
-        items = response.get("Items", [])
-        if not items:
-            return api_response(404, {"message": f"Trip not found: {trip_id}"})
-
-        trip = _assemble_trip(trip_id, items)
-        return api_response(200, trip)
-
     except Exception:
         logger.exception("Failed to fetch trip details")
         return api_response(500, {"message": "Internal server error"})
-
-
-def _build_flight(item: dict) -> dict:
-    return {
-        "booking_id": item["booking_id"],
-        "flight_number": item["flight_number"],
-        "departure_time": item["departure_time"],
-        "arrival_time": item["arrival_time"],
-        "price_amount": item["price_amount"],
-        "price_currency": item["price_currency"],
-        "status": item["status"],
-    }
-
-
-def _build_hotel(item: dict) -> dict:
-    return {
-        "booking_id": item["booking_id"],
-        "hotel_name": item["hotel_name"],
-        "check_in_date": item["check_in_date"],
-        "check_out_date": item["check_out_date"],
-        "price_amount": item["price_amount"],
-        "price_currency": item["price_currency"],
-        "status": item["status"],
-    }
-
-
-def _build_payment(item: dict) -> dict:
-    return {
-        "payment_id": item["payment_id"],
-        "amount": item["amount"],
-        "currency": item["currency"],
-        "status": item["status"],
-    }
-
-
-_ENTITY_ASSEMBLERS: dict[str, tuple[str, Callable[[dict], dict]]] = {
-    "FLIGHT": ("flight", _build_flight),
-    "HOTEL": ("hotel", _build_hotel),
-    "PAYMENT": ("payment", _build_payment),
-}
-
-
-def _assemble_trip(trip_id: str, items: list[dict]) -> dict:
-    """DynamoDB の複数アイテムを1つの旅行レスポンスに結合する"""
-    trip: dict = {"trip_id": trip_id}
-
-    for item in items:
-        entity_type = item.get("entity_type")
-        if entity_type in _ENTITY_ASSEMBLERS:
-            trip_key, build = _ENTITY_ASSEMBLERS[entity_type]
-            trip[trip_key] = build(item)
-
-    return trip
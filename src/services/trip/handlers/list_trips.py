@@ -1,44 +1,70 @@
 import os
+from functools import cache
 
-import boto3
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.data_classes import (
     APIGatewayProxyEventV2,
     event_source,
 )
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from boto3.dynamodb.conditions import Key
+from pydantic import ValidationError
 
 from services.shared.utils import api_response
+from services.trip.handlers.request_models import ListTripsRequest
+from services.trip.infrastructure.dynamodb_trip_query import (
+    DynamoDBTripQuery,
+    InvalidPageTokenException,
+)
+from services.trip.infrastructure.trip_read_model import summary_to_trip
 
 logger = Logger()
 
-TABLE_NAME = os.environ["TABLE_NAME"]
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
+# CloudFront は Cache-Control に従うため、一覧は短い時間だけキャッシュさせる
+# （新しい旅行や取り消しが一覧に反映されるまでの上限）
+LIST_CACHE_CONTROL = f"max-age={int(os.getenv('LIST_TRIPS_MAX_AGE_SECONDS', '5'))}"
+
 
-NUM_SHARDS = 4
+@cache
+def get_trip_query() -> DynamoDBTripQuery:
+    """クエリを最初の呼び出し時に1回だけ組み立てる"""
+    return DynamoDBTripQuery()
 
 
 @logger.inject_lambda_context
 @event_source(data_class=APIGatewayProxyEventV2)
 def lambda_handler(event: APIGatewayProxyEventV2, context: LambdaContext) -> dict:
-    """予約一覧取得 Lambda Handler"""
+    """予約一覧取得 Lambda Handler
 
-    logger.info("Listing all trips")
+    クエリ文字列 limit / next_token によるページネーションに対応する。
+    決済まで到達していない旅行も含め、TRIP_SUMMARY の内容を返す。
+    """
 
-    try:
-        all_items: list[dict] = []
-        for shard in range(NUM_SHARDS):
-            response = table.query(
-                IndexName="GSI1",
-                KeyConditionExpression=Key("GSI1PK").eq(f"TRIPS#{shard}"),
-            )
-            all_items.extend(response.get("Items", []))
+    logger.info("Listing trips")
 
-        trips = [{"trip_id": item["trip_id"]} for item in all_items]
-        return api_response(200, {"trips": trips, "count": len(trips)})
+    try:
+        request = ListTripsRequest.model_validate(event.query_string_parameters or {})
+    except ValidationError as e:
+        return api_response(
+            400,
+            {
+                "message": "Invalid query parameters",
+                "errors": e.errors(include_url=False),
+            },
+        )
 
+    try:
+        page = get_trip_query().list_trips(
+            limit=request.limit, page_token=request.next_token
+        )
+    except InvalidPageTokenException:
+        return api_response(400, {"message": "Invalid next_token"})
     except Exception:
         logger.exception("Failed to list trips")
         return api_response(500, {"message": "Internal server error"})
+
+    trips = [summary_to_trip(item) for item in page.items]
+    return api_response(
+        200,
+        {"trips": trips, "count": len(trips), "next_token": page.next_token},
+        headers={"Cache-Control": LIST_CACHE_CONTROL},
+    )
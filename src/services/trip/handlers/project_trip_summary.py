@@ -0,0 +1,57 @@
+import os
+from functools import cache
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.batch import (
+    BatchProcessor,
+    EventType,
+    process_partial_response,
+)
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import (
+    DynamoDBRecord,
+)
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from services.shared.infrastructure.dynamodb import get_dynamodb_client
+from services.shared.infrastructure.shard_map import DynamoDBShardMapStore
+from services.trip.infrastructure.trip_read_model import TripSummaryProjector
+
+logger = Logger()
+
+processor = BatchProcessor(event_type=EventType.DynamoDBStreams)
+
+
+@cache
+def get_projector() -> TripSummaryProjector:
+    """プロジェクターを最初の呼び出し時に1回だけ組み立てる"""
+    table_name = os.environ["TABLE_NAME"]
+    client = get_dynamodb_client()
+    return TripSummaryProjector(
+        client, table_name, DynamoDBShardMapStore(client, table_name)
+    )
+
+
+def record_handler(record: DynamoDBRecord) -> None:
+    """1件のストリームレコードを TRIP_SUMMARY に反映する"""
+    stream = record.dynamodb
+    applied = get_projector().apply(
+        new_image=stream.new_image or None,
+        old_image=stream.old_image or None,
+    )
+    if not applied:
+        logger.debug("Skipped record", extra={"keys": stream.keys})
+
+
+@logger.inject_lambda_context
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    """旅行サマリー投影 Lambda Handler（DynamoDB Streams）
+
+    失敗したレコードのみを batchItemFailures として返し、
+    そのレコード以降をストリームから再試行させる。
+    """
+    return process_partial_response(
+        event=event,
+        record_handler=record_handler,
+        processor=processor,
+        context=context,
+    )
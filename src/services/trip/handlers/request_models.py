@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class ListTripsRequest(BaseModel):
+    """旅行一覧取得リクエストモデル（クエリ文字列）"""
+
+    limit: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="1ページあたりの最大件数",
+    )
+    next_token: str | None = Field(
+        default=None,
+        min_length=1,
+        description="前ページのレスポンスに含まれる継続トークン",
+    )
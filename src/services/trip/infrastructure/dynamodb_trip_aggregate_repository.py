@@ -0,0 +1,102 @@
+import os
+
+from botocore.exceptions import ClientError
+
+from services.flight.domain.entity import Booking
+from services.flight.infrastructure.booking_codec import booking_key, decode_booking
+from services.hotel.domain.entity import HotelBooking
+from services.hotel.infrastructure.hotel_booking_codec import (
+    decode_hotel_booking,
+    hotel_booking_key,
+)
+from services.payment.infrastructure.payment_codec import decode_payment, payment_key
+from services.shared.domain import TripId
+from services.shared.domain.exception.exceptions import OptimisticLockException
+from services.shared.infrastructure.dynamodb import (
+    SET_STATUS_UPDATE,
+    STATUS_NAMES,
+    Item,
+    get_dynamodb_client,
+)
+from services.trip.domain import Trip, TripAggregateRepository
+from services.trip.domain.entity import TripEntity
+
+
+class DynamoDBTripAggregateRepository(TripAggregateRepository):
+    """DynamoDBを使用したTripAggregateRepository の具象実装
+
+    - 読み込み: TRIP#{trip_id} パーティションへの Query 1回
+      （アイテムの変換は各サービスのコーデックを使う）
+    - 書き込み: 変更されたエンティティを TransactWriteItems 1回で更新する
+      （読み込み時のステータスを条件にする）
+    """
+
+    def __init__(self, table_name: str | None = None, client=None) -> None:
+        self.table_name = table_name or os.getenv("TABLE_NAME")
+        self.client = client or get_dynamodb_client()
+
+    def find_by_id(self, trip_id: TripId) -> Trip | None:
+        """旅行に属する予約・決済を1回の Query で取得する"""
+        response = self.client.query(
+            TableName=self.table_name,
+            KeyConditionExpression="PK = :pk",
+            ExpressionAttributeValues={":pk": {"S": f"TRIP#{trip_id}"}},
+            ConsistentRead=True,
+        )
+        entities: dict = {}
+        for item in response.get("Items", []):
+            match item.get("entity_type", {}).get("S"):
+                case "FLIGHT":
+                    entities["flight"] = decode_booking(item)
+                case "HOTEL":
+                    entities["hotel"] = decode_hotel_booking(item)
+                case "PAYMENT":
+                    entities["payment"] = decode_payment(item)
+
+        if not entities:
+            return None
+        return Trip(id=trip_id, **entities)
+
+    def save(self, trip: Trip) -> None:
+        """変更されたエンティティを1回のトランザクションで書き込む"""
+        changes = trip.changes()
+        if not changes:
+            return
+
+        transact_items = [
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": self._key(entity),
+                    "UpdateExpression": SET_STATUS_UPDATE,
+                    "ConditionExpression": "#status = :expected",
+                    "ExpressionAttributeNames": STATUS_NAMES,
+                    "ExpressionAttributeValues": {
+                        ":status": {"S": entity.status.value},
+                        ":expected": {"S": original_status.value},
+                    },
+                }
+            }
+            for entity, original_status in changes
+        ]
+
+        try:
+            self.client.transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            reasons = e.response.get("CancellationReasons", [])
+            if any(r.get("Code") == "ConditionalCheckFailed" for r in reasons):
+                raise OptimisticLockException(
+                    f"Trip status conflict: trip_id={trip.id}, "
+                    f"reasons={[r.get('Code') for r in reasons]}"
+                )
+            raise
+
+        trip.clear_changes()
+
+    @staticmethod
+    def _key(entity: TripEntity) -> Item:
+        if isinstance(entity, Booking):
+            return booking_key(entity.trip_id, entity.id)
+        if isinstance(entity, HotelBooking):
+            return hotel_booking_key(entity.trip_id, entity.id)
+        return payment_key(entity.trip_id, entity.id)
@@ -0,0 +1,232 @@
+import base64
+import binascii
+import heapq
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from services.shared.infrastructure.dynamodb import decode_item, get_dynamodb_client
+from services.shared.infrastructure.shard_map import (
+    TRIP_SUMMARIES_PARTITION_PREFIX,
+    DynamoDBShardMapStore,
+)
+
+GSI1_INDEX_NAME = "GSI1"
+
+# シャードへの並列クエリ数の上限
+MAX_PARALLEL_QUERIES = 16
+
+# GSI1 のクエリで ExclusiveStartKey に必要なキー（テーブルキー + インデックスキー）
+_GSI1_CURSOR_ATTRIBUTES = ("PK", "SK", "GSI1PK", "GSI1SK")
+
+
+class InvalidPageTokenException(ValueError):
+    """継続トークンが不正な場合"""
+
+    pass
+
+
+@dataclass(frozen=True)
+class TripPage:
+    """旅行一覧の1ページ分の結果"""
+
+    items: list[dict]
+    next_token: str | None = None
+
+
+@dataclass
+class _PageCursor:
+    """継続トークンに埋め込むシャードごとのカーソル
+
+    - cursors: 読み取り途中のパーティション → ExclusiveStartKey（None は先頭から）
+    - exhausted: 読み切ったパーティション
+    """
+
+    cursors: dict[str, dict | None] = field(default_factory=dict)
+    exhausted: set[str] = field(default_factory=set)
+
+
+def encode_page_token(cursor: _PageCursor) -> str:
+    """シャードごとのカーソルを不透明な継続トークンに変換する"""
+    payload = {"c": cursor.cursors, "d": sorted(cursor.exhausted)}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_page_token(token: str) -> _PageCursor:
+    """継続トークンをシャードごとのカーソルに復元する"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursors = payload["c"]
+        exhausted = payload["d"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidPageTokenException(f"Invalid page token: {token}") from e
+
+    if not isinstance(cursors, dict) or not isinstance(exhausted, list):
+        raise InvalidPageTokenException(f"Invalid page token: {token}")
+    for key in cursors.values():
+        if key is not None and (
+            not isinstance(key, dict)
+            or set(key) != set(_GSI1_CURSOR_ATTRIBUTES)
+            or not all(isinstance(v, str) for v in key.values())
+        ):
+            raise InvalidPageTokenException(f"Invalid page token: {token}")
+
+    return _PageCursor(cursors=cursors, exhausted=set(exhausted))
+
+
+def _cursor_key(item: dict) -> dict:
+    return {name: item[name] for name in _GSI1_CURSOR_ATTRIBUTES}
+
+
+class _PartitionReader:
+    """GSI1 の1パーティションを GSI1SK 昇順に読み進めるリーダー
+
+    1MB 制限でページが途中で切れた場合は、バッファが空になった時点で
+    LastEvaluatedKey から続きを取得する。
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        partition_key: str,
+        start_key: dict | None,
+        page_size: int,
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+        self.partition_key = partition_key
+        self._start_key = start_key
+        self._next_key = start_key
+        self._page_size = page_size
+        self._buffer: deque[dict] = deque()
+        self._last_key: dict | None = None
+        self._fetched = False
+
+    def fetch(self) -> None:
+        """次のページを取得してバッファに積む"""
+        kwargs: dict = {
+            "TableName": self._table_name,
+            "IndexName": GSI1_INDEX_NAME,
+            "KeyConditionExpression": "GSI1PK = :pk",
+            "ExpressionAttributeValues": {":pk": {"S": self.partition_key}},
+            "Limit": self._page_size,
+        }
+        if self._next_key is not None:
+            kwargs["ExclusiveStartKey"] = {
+                name: {"S": value} for name, value in self._next_key.items()
+            }
+
+        response = self._client.query(**kwargs)
+        self._buffer.extend(decode_item(item) for item in response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        self._next_key = decode_item(last_key) if last_key else None
+        self._fetched = True
+
+    def peek(self) -> dict | None:
+        """次に返すアイテムを参照する（必要に応じて続きを取得する）"""
+        while not self._buffer and (not self._fetched or self._next_key):
+            self.fetch()
+        return self._buffer[0] if self._buffer else None
+
+    def pop(self) -> dict:
+        item = self._buffer.popleft()
+        self._last_key = _cursor_key(item)
+        return item
+
+    @property
+    def exhausted(self) -> bool:
+        return self._fetched and not self._buffer and self._next_key is None
+
+    def resume_key(self) -> dict | None:
+        """次ページの ExclusiveStartKey（最後に返したアイテムの直後から再開）"""
+        if self._last_key is not None:
+            return self._last_key
+        return self._start_key
+
+
+class DynamoDBTripQuery:
+    """GSI1 のシャード化パーティションを並列に読み、旅行一覧を返すクエリ
+
+    - シャードマップが示す各パーティション（TRIP_SUMMARIES#{shard}）へ
+      並列にクエリする（scatter）
+    - GSI1SK 順に k-way マージし、limit 件で打ち切る（gather）
+    - シャードごとの再開位置を継続トークンとして返す
+    """
+
+    def __init__(
+        self,
+        table_name: str | None = None,
+        client=None,
+        partition_prefix: str = TRIP_SUMMARIES_PARTITION_PREFIX,
+    ) -> None:
+        self.table_name = table_name or os.getenv("TABLE_NAME")
+        self.client = client or get_dynamodb_client()
+        self.partition_prefix = partition_prefix
+        self.shard_map_store = DynamoDBShardMapStore(self.client, self.table_name)
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_QUERIES)
+
+    def partition_keys(self) -> list[str]:
+        """読み取り対象のパーティション（シャード数変更中は新旧の和集合）"""
+        return self.shard_map_store.get().read_partitions(self.partition_prefix)
+
+    def list_trips(self, limit: int, page_token: str | None = None) -> TripPage:
+        """旅行一覧を GSI1SK 昇順で limit 件取得する"""
+        cursor = decode_page_token(page_token) if page_token else _PageCursor()
+
+        readers = [
+            _PartitionReader(
+                self.client,
+                self.table_name,
+                pk,
+                cursor.cursors.get(pk),
+                page_size=limit,
+            )
+            for pk in self.partition_keys()
+            if pk not in cursor.exhausted
+        ]
+
+        # 各シャードの先頭ページを並列に取得する
+        list(self._executor.map(lambda reader: reader.fetch(), readers))
+
+        items = self._merge(readers, limit)
+        return TripPage(items=items, next_token=self._next_token(readers, cursor))
+
+    def _merge(self, readers: list[_PartitionReader], limit: int) -> list[dict]:
+        """各シャードの結果を GSI1SK 順に k-way マージする"""
+        heap: list[tuple[str, int]] = []
+        for index, reader in enumerate(readers):
+            head = reader.peek()
+            if head is not None:
+                heap.append((head["GSI1SK"], index))
+        heapq.heapify(heap)
+
+        items: list[dict] = []
+        while heap and len(items) < limit:
+            _, index = heapq.heappop(heap)
+            reader = readers[index]
+            items.append(reader.pop())
+            if len(items) == limit:
+                break
+            head = reader.peek()
+            if head is not None:
+                heapq.heappush(heap, (head["GSI1SK"], index))
+        return items
+
+    def _next_token(
+        self, readers: list[_PartitionReader], previous: _PageCursor
+    ) -> str | None:
+        next_cursor = _PageCursor(exhausted=set(previous.exhausted))
+        for reader in readers:
+            if reader.exhausted:
+                next_cursor.exhausted.add(reader.partition_key)
+            else:
+                next_cursor.cursors[reader.partition_key] = reader.resume_key()
+
+        if not next_cursor.cursors:
+            return None
+        return encode_page_token(next_cursor)
@@ -0,0 +1,245 @@
+import os
+import time
+from typing import Callable
+
+from services.shared.infrastructure.dynamodb import (
+    decode_item,
+    encode_value,
+    get_dynamodb_client,
+)
+from services.shared.infrastructure.hedging import Hedger
+from services.shared.infrastructure.shard_map import (
+    TRIP_SUMMARIES_PARTITION_PREFIX,
+    DynamoDBShardMapStore,
+)
+
+TRIP_SUMMARY_SK = "TRIP_SUMMARY"
+TRIP_SUMMARY_ENTITY_TYPE = "TRIP_SUMMARY"
+
+# サガが完了した旅行ステータスごとに、各セクションの最終ステータス。
+# 補償の途中（ホテルだけ取り消し済みでフライトは未反映など）でも旅行ステータスは
+# CANCELLED になるため、セクションごとに確認する（以降はキャンセル操作でのみ変わる）。
+SETTLED_SECTION_STATUSES: dict[str, dict[str, frozenset[str]]] = {
+    "CONFIRMED": {
+        "flight": frozenset({"PENDING", "CONFIRMED"}),
+        "hotel": frozenset({"PENDING", "CONFIRMED"}),
+        "payment": frozenset({"COMPLETED"}),
+    },
+    "CANCELLED": {
+        "flight": frozenset({"CANCELLED"}),
+        "hotel": frozenset({"CANCELED"}),
+        "payment": frozenset({"REFUNDED"}),
+    },
+}
+
+
+def build_flight(item: dict) -> dict:
+    return {
+        "booking_id": item["booking_id"],
+        "flight_number": item["flight_number"],
+        "departure_time": item["departure_time"],
+        "arrival_time": item["arrival_time"],
+        "price_amount": item["price_amount"],
+        "price_currency": item["price_currency"],
+        "status": item["status"],
+    }
+
+
+def build_hotel(item: dict) -> dict:
+    return {
+        "booking_id": item["booking_id"],
+        "hotel_name": item["hotel_name"],
+        "check_in_date": item["check_in_date"],
+        "check_out_date": item["check_out_date"],
+        "price_amount": item["price_amount"],
+        "price_currency": item["price_currency"],
+        "status": item["status"],
+    }
+
+
+def build_payment(item: dict) -> dict:
+    return {
+        "payment_id": item["payment_id"],
+        "amount": item["amount"],
+        "currency": item["currency"],
+        "status": item["status"],
+    }
+
+
+# entity_type → (サマリー上のキー, 変換関数)
+ENTITY_ASSEMBLERS: dict[str, tuple[str, Callable[[dict], dict]]] = {
+    "FLIGHT": ("flight", build_flight),
+    "HOTEL": ("hotel", build_hotel),
+    "PAYMENT": ("payment", build_payment),
+}
+
+
+def derive_trip_status(trip: dict) -> str:
+    """各予約のステータスから旅行全体のステータスを導出する"""
+    flight_status = trip.get("flight", {}).get("status")
+    hotel_status = trip.get("hotel", {}).get("status")
+    payment_status = trip.get("payment", {}).get("status")
+
+    if (
+        flight_status == "CANCELLED"
+        or hotel_status == "CANCELED"
+        or payment_status == "REFUNDED"
+    ):
+        return "CANCELLED"
+    if payment_status == "COMPLETED":
+        return "CONFIRMED"
+    return "IN_PROGRESS"
+
+
+def is_settled(trip: dict) -> bool:
+    """サガが完了し、存在するすべてのセクションが最終ステータスに達しているか"""
+    settled = SETTLED_SECTION_STATUSES.get(trip["status"])
+    if settled is None:
+        return False
+    return all(
+        trip[trip_key]["status"] in statuses
+        for trip_key, statuses in settled.items()
+        if trip_key in trip
+    )
+
+
+def assemble_trip(trip_id: str, items: list[dict]) -> dict:
+    """DynamoDB の複数アイテムを1つの旅行レスポンスに結合する"""
+    trip: dict = {"trip_id": trip_id}
+
+    for item in items:
+        entity_type = item.get("entity_type")
+        if entity_type in ENTITY_ASSEMBLERS:
+            trip_key, build = ENTITY_ASSEMBLERS[entity_type]
+            trip[trip_key] = build(item)
+
+    trip["status"] = derive_trip_status(trip)
+    return trip
+
+
+def summary_to_trip(item: dict) -> dict:
+    """TRIP_SUMMARY アイテムを旅行レスポンスに変換する"""
+    trip: dict = {"trip_id": item["trip_id"]}
+    for trip_key, _ in ENTITY_ASSEMBLERS.values():
+        if trip_key in item:
+            trip[trip_key] = item[trip_key]
+
+    trip["status"] = derive_trip_status(trip)
+    return trip
+
+
+class TripSummaryProjector:
+    """FLIGHT / HOTEL / PAYMENT アイテムの変更を TRIP_SUMMARY アイテムに反映する
+
+    サマリーはエンティティごとのセクション（flight / hotel / payment）を
+    個別に SET / REMOVE するため、別々のシャードから届いたレコードが
+    互いのセクションを上書きすることはない。
+    """
+
+    def __init__(
+        self, client, table_name: str, shard_map_store: DynamoDBShardMapStore
+    ) -> None:
+        self.client = client
+        self.table_name = table_name
+        self.shard_map_store = shard_map_store
+
+    def apply(
+        self,
+        new_image: dict | None,
+        old_image: dict | None,
+        only_missing: bool = False,
+    ) -> bool:
+        """1件の変更を反映する（対象外のアイテムなら False）
+
+        only_missing=True の場合はセクションが未作成のときだけ書き込む
+        （バックフィル用。ストリームで反映済みの値を古い値で上書きしない）。
+        """
+        image = new_image if new_image is not None else old_image
+        if not image or image.get("entity_type") not in ENTITY_ASSEMBLERS:
+            return False
+
+        trip_id = image["trip_id"]
+        trip_key, build = ENTITY_ASSEMBLERS[image["entity_type"]]
+        shard_map = self.shard_map_store.get()
+
+        names = {"#section": trip_key}
+        gsi1pk = shard_map.write_partition(
+            trip_id, prefix=TRIP_SUMMARIES_PARTITION_PREFIX
+        )
+        values: dict = {
+            ":trip_id": {"S": trip_id},
+            ":entity_type": {"S": TRIP_SUMMARY_ENTITY_TYPE},
+            ":gsi1pk": {"S": gsi1pk},
+            ":gsi1sk": {"S": f"TRIP#{trip_id}"},
+            ":updated_at": {"N": repr(time.time())},
+        }
+        common = (
+            "trip_id = :trip_id, entity_type = :entity_type, "
+            "GSI1PK = :gsi1pk, GSI1SK = :gsi1sk, updated_at = :updated_at"
+        )
+        if new_image is not None:
+            values[":section"] = encode_value(build(new_image))
+            update_expression = f"SET #section = :section, {common}"
+        else:
+            update_expression = f"SET {common} REMOVE #section"
+
+        kwargs: dict = {
+            "TableName": self.table_name,
+            "Key": {"PK": {"S": f"TRIP#{trip_id}"}, "SK": {"S": TRIP_SUMMARY_SK}},
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+        }
+        if only_missing:
+            kwargs["ConditionExpression"] = "attribute_not_exists(#section)"
+        self.client.update_item(**kwargs)
+        return True
+
+
+class DynamoDBTripReadModel:
+    """旅行詳細の読み取りモデル
+
+    TRIP_SUMMARY アイテムを GetItem で1回読む。
+    ストリーム反映前のサマリー未作成の旅行は、従来どおり
+    TRIP# パーティションを Query して組み立てる。
+
+    hedger を渡した場合、各読み取りはヘッジ付きで実行する。
+    """
+
+    def __init__(
+        self,
+        table_name: str | None = None,
+        client=None,
+        hedger: Hedger | None = None,
+    ) -> None:
+        self.table_name = table_name or os.getenv("TABLE_NAME")
+        self.client = client or get_dynamodb_client()
+        self.hedger = hedger
+
+    def get_trip(self, trip_id: str) -> dict | None:
+        response = self._read(
+            lambda: self.client.get_item(
+                TableName=self.table_name,
+                Key={"PK": {"S": f"TRIP#{trip_id}"}, "SK": {"S": TRIP_SUMMARY_SK}},
+            )
+        )
+        item = response.get("Item")
+        if item:
+            return summary_to_trip(decode_item(item))
+
+        response = self._read(
+            lambda: self.client.query(
+                TableName=self.table_name,
+                KeyConditionExpression="PK = :pk",
+                ExpressionAttributeValues={":pk": {"S": f"TRIP#{trip_id}"}},
+            )
+        )
+        items = response.get("Items", [])
+        if not items:
+            return None
+        return assemble_trip(trip_id, [decode_item(item) for item in items])
+
+    def _read(self, request: Callable[[], dict]) -> dict:
+        if self.hedger is None:
+            return request()
+        return self.hedger.call(request)
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from services.shared.infrastructure.dynamodb import (
+    decode_item,
+    is_conditional_check_failed,
+)
+from services.shared.infrastructure.shard_backfill import BackfillResult
+from services.trip.infrastructure.trip_read_model import (
+    ENTITY_ASSEMBLERS,
+    TripSummaryProjector,
+)
+
+
+class TripSummaryBackfill:
+    """ストリーム投影の導入前から存在する旅行の TRIP_SUMMARY を作成するジョブ
+
+    テーブルを total_segments 個のセグメントに分けて並列 Scan し、
+    FLIGHT / HOTEL / PAYMENT アイテムをサマリーに反映する。
+    反映はセクションが未作成の場合に限るため、並行するストリームの
+    反映（より新しい値）を上書きせず、何度実行しても結果は変わらない。
+
+    list_trips は TRIP_SUMMARIES# パーティションだけを読むため、
+    投影の Lambda をデプロイした後に1回実行する。
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        projector: TripSummaryProjector,
+        total_segments: int = 8,
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+        self._projector = projector
+        self._total_segments = total_segments
+
+    def run(self) -> BackfillResult:
+        """全セグメントを並列に処理する"""
+        with ThreadPoolExecutor(max_workers=self._total_segments) as executor:
+            results = executor.map(self._backfill_segment, range(self._total_segments))
+            return sum(results, BackfillResult())
+
+    def _backfill_segment(self, segment: int) -> BackfillResult:
+        result = BackfillResult()
+        entity_types = {
+            f":type{index}": {"S": entity_type}
+            for index, entity_type in enumerate(ENTITY_ASSEMBLERS)
+        }
+        kwargs: dict = {
+            "TableName": self._table_name,
+            "Segment": segment,
+            "TotalSegments": self._total_segments,
+            "FilterExpression": f"entity_type IN ({', '.join(entity_types)})",
+            "ExpressionAttributeValues": entity_types,
+        }
+        while True:
+            response = self._client.scan(**kwargs)
+            for item in response.get("Items", []):
+                result += self._project(decode_item(item))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return result
+            kwargs["ExclusiveStartKey"] = last_key
+
+    def _project(self, item: dict) -> BackfillResult:
+        try:
+            self._projector.apply(new_image=item, old_image=None, only_missing=True)
+        except ClientError as e:
+            if is_conditional_check_failed(e):
+                return BackfillResult(scanned=1, skipped=1)
+            raise
+        return BackfillResult(scanned=1, rewritten=1)
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def bundle_cache_dir(tmp_path, monkeypatch):
+    """レイヤーのキャッシュをテストごとの一時ディレクトリに向ける"""
+    cache_dir = tmp_path / "bundle-cache"
+    monkeypatch.setenv("BUNDLE_CACHE_DIR", str(cache_dir))
+    return cache_dir
@@ -0,0 +1,129 @@
+from functools import cache
+
+import aws_cdk as cdk
+import pytest
+from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_secretsmanager as secretsmanager
+from aws_cdk import aws_stepfunctions as sfn
+from aws_cdk.assertions import Template
+
+from infra.constructs.api import Api
+
+
+@cache
+def render_methods(sync: bool) -> dict[tuple[str, str], dict]:
+    """Api を合成し、(パス, HTTP メソッド) → メソッドのプロパティ を返す"""
+    stack = cdk.Stack(cdk.App(), "TestStack")
+
+    def state_machine(id: str, state_machine_type: sfn.StateMachineType):
+        return sfn.StateMachine(
+            stack,
+            id,
+            definition_body=sfn.DefinitionBody.from_chainable(
+                sfn.Pass(stack, f"{id}Start")
+            ),
+            state_machine_type=state_machine_type,
+        )
+
+    function = _lambda.Function.from_function_arn(
+        stack, "Fn", "arn:aws:lambda:ap-northeast-1:123456789012:function:fn"
+    )
+    Api(
+        stack,
+        "Api",
+        state_machine=state_machine("Standard", sfn.StateMachineType.STANDARD),
+        sync_state_machine=(
+            state_machine("Express", sfn.StateMachineType.EXPRESS) if sync else None
+        ),
+        get_trip=function,
+        list_trips=function,
+        origin_verify_secret=secretsmanager.Secret(stack, "Secret"),
+    )
+
+    resources = Template.from_stack(stack).to_json()["Resources"]
+
+    def full_path(resource_id) -> str:
+        # ルートリソースは Fn::GetAtt で参照される
+        if "Ref" not in resource_id:
+            return ""
+        properties = resources[resource_id["Ref"]]["Properties"]
+        return f"{full_path(properties['ParentId'])}/{properties['PathPart']}"
+
+    return {
+        (
+            full_path(resource["Properties"]["ResourceId"]),
+            resource["Properties"]["HttpMethod"],
+        ): resource["Properties"]
+        for resource in resources.values()
+        if resource["Type"] == "AWS::ApiGateway::Method"
+    }
+
+
+def integration_action(method: dict) -> str:
+    _, parts = method["Integration"]["Uri"]["Fn::Join"]
+    return parts[-1].rpartition("/")[2]
+
+
+def state_machine_ref(method: dict) -> str:
+    (template,) = method["Integration"]["RequestTemplates"].values()
+    _, parts = template["Fn::Join"]
+    (ref,) = [part["Ref"] for part in parts if isinstance(part, dict)]
+    return ref
+
+
+class TestAsyncOnly:
+    """sync_state_machine を指定しない場合のテスト"""
+
+    def test_post_trips_starts_execution(self):
+        """POST /trips は StartExecution で非同期に実行する"""
+        # Act
+        methods = render_methods(sync=False)
+
+        # Assert
+        assert integration_action(methods[("/trips", "POST")]) == "StartExecution"
+        assert ("/trips/async", "POST") not in methods
+
+
+class TestSyncExecution:
+    """sync_state_machine を指定した場合のテスト"""
+
+    def test_post_trips_starts_sync_execution(self):
+        """POST /trips は EXPRESS ステートマシンを StartSyncExecution で実行する"""
+        # Act
+        method = render_methods(sync=True)[("/trips", "POST")]
+
+        # Assert
+        assert integration_action(method) == "StartSyncExecution"
+        assert state_machine_ref(method).startswith("Express")
+        assert "409" in [
+            response["StatusCode"] for response in method["MethodResponses"]
+        ]
+
+    def test_post_trips_async_falls_back_to_standard(self):
+        """POST /trips/async は STANDARD ステートマシンを非同期に実行する"""
+        # Act
+        method = render_methods(sync=True)[("/trips/async", "POST")]
+
+        # Assert
+        assert integration_action(method) == "StartExecution"
+        assert state_machine_ref(method).startswith("Standard")
+
+
+class TestStartExecutionBody:
+    """POST のリクエストボディの扱いのテスト"""
+
+    @pytest.mark.parametrize(
+        ("sync", "path"),
+        [(False, "/trips"), (True, "/trips"), (True, "/trips/async")],
+    )
+    def test_json_body_reaches_template_as_text(self, sync: bool, path: str):
+        """JSON ボディはバイナリ変換されずにマッピングテンプレートに渡る"""
+        # Act
+        method = render_methods(sync=sync)[(path, "POST")]
+
+        # Assert
+        assert "ContentHandling" not in method["Integration"]
+        assert all(
+            "ContentHandling" not in response
+            for response in method["Integration"]["IntegrationResponses"]
+        )
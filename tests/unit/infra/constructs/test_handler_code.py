@@ -0,0 +1,184 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from aws_cdk import aws_lambda as _lambda
+
+from infra.constructs.handler_code import (
+    HandlerLocalBundling,
+    closure_hash,
+    module_closure,
+)
+
+RUNTIME = _lambda.Runtime.PYTHON_3_14
+CURRENT_RUNTIME = _lambda.Runtime(
+    f"python{sys.version_info.major}.{sys.version_info.minor}",
+    _lambda.RuntimeFamily.PYTHON,
+)
+
+
+def write_tree(root: Path, files: dict[str, str]) -> None:
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def relative_paths(files: list[Path], root: Path) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in files]
+
+
+class TestModuleClosure:
+    """module_closure のテスト"""
+
+    def test_follows_imports_within_source_root(self, tmp_path: Path):
+        """ハンドラーから到達するモジュールと親パッケージだけを含める"""
+        # Arrange
+        write_tree(
+            tmp_path,
+            {
+                "svc/__init__.py": "",
+                "svc/flight/__init__.py": "",
+                "svc/flight/handler.py": (
+                    "import json\nfrom svc.shared import util\nfrom . import model\n"
+                ),
+                "svc/flight/model.py": "from ..shared.codec import encode\n",
+                "svc/shared/__init__.py": "",
+                "svc/shared/util.py": "",
+                "svc/shared/codec.py": "",
+                "svc/hotel/__init__.py": "",
+                "svc/hotel/handler.py": "",
+            },
+        )
+
+        # Act
+        files = module_closure("svc.flight.handler", tmp_path)
+
+        # Assert
+        assert relative_paths(files, tmp_path) == [
+            "svc/__init__.py",
+            "svc/flight/__init__.py",
+            "svc/flight/handler.py",
+            "svc/flight/model.py",
+            "svc/shared/__init__.py",
+            "svc/shared/codec.py",
+            "svc/shared/util.py",
+        ]
+
+    def test_includes_type_checking_and_function_imports(self, tmp_path: Path):
+        """TYPE_CHECKING ブロックや関数内の遅延 import もたどる"""
+        # Arrange
+        write_tree(
+            tmp_path,
+            {
+                "pkg/__init__.py": (
+                    "from typing import TYPE_CHECKING\n"
+                    "if TYPE_CHECKING:\n"
+                    "    from .lazy import Value\n"
+                    "def load():\n"
+                    "    import pkg.deferred\n"
+                ),
+                "pkg/lazy.py": "",
+                "pkg/deferred.py": "",
+            },
+        )
+
+        # Act
+        files = module_closure("pkg", tmp_path)
+
+        # Assert
+        assert relative_paths(files, tmp_path) == [
+            "pkg/__init__.py",
+            "pkg/deferred.py",
+            "pkg/lazy.py",
+        ]
+
+    def test_flight_cancel_excludes_other_services(self):
+        """フライトキャンセルのバンドルには他サービスのコードを含めない"""
+        # Arrange
+        root = Path("src")
+
+        # Act
+        files = relative_paths(
+            module_closure("services.flight.handlers.cancel", root), root
+        )
+
+        # Assert
+        assert "services/flight/handlers/cancel.py" in files
+        assert "services/shared/domain/value_object/trip_id.py" in files
+        assert not any(
+            path.startswith(
+                (
+                    "authorizer/",
+                    "services/hotel/",
+                    "services/payment/",
+                    "services/trip/",
+                )
+            )
+            for path in files
+        )
+
+
+class TestClosureHash:
+    """closure_hash のテスト"""
+
+    def test_changes_only_with_closure_files(self, tmp_path: Path):
+        """対象ファイルが変わったときだけハッシュが変わる"""
+        # Arrange
+        write_tree(tmp_path, {"a.py": "import b\n", "b.py": "", "c.py": ""})
+        files = module_closure("a", tmp_path)
+        before = closure_hash(files, tmp_path, RUNTIME)
+
+        # Act
+        (tmp_path / "c.py").write_text("changed = True\n")
+        unrelated = closure_hash(files, tmp_path, RUNTIME)
+        (tmp_path / "b.py").write_text("changed = True\n")
+        related = closure_hash(files, tmp_path, RUNTIME)
+
+        # Assert
+        assert unrelated == before
+        assert related != before
+
+
+class TestHandlerLocalBundling:
+    """HandlerLocalBundling のテスト"""
+
+    def test_copies_files_and_byte_compiles(self, tmp_path: Path):
+        """対象ファイルだけをコピーし、unchecked-hash の .pyc を作成する"""
+        # Arrange
+        source = tmp_path / "src"
+        write_tree(source, {"pkg/__init__.py": "", "pkg/other.py": ""})
+        output = tmp_path / "output"
+        output.mkdir()
+        bundling = HandlerLocalBundling(
+            str(source), ["pkg/__init__.py"], CURRENT_RUNTIME
+        )
+
+        # Act
+        result = bundling.try_bundle(str(output), MagicMock())
+
+        # Assert
+        assert result is True
+        assert (output / "pkg" / "__init__.py").is_file()
+        assert not (output / "pkg" / "other.py").exists()
+        pyc = next((output / "pkg" / "__pycache__").glob("__init__.*.pyc"))
+        # フラグ 0b01: ハッシュベースで、実行時にソースと照合しない（unchecked-hash）
+        assert int.from_bytes(pyc.read_bytes()[4:8], "little") == 0b01
+
+    def test_bundles_sources_when_runtime_differs(self, tmp_path: Path):
+        """synth の Python がランタイムと異なる場合は .pyc なしでバンドルする"""
+        # Arrange
+        source = tmp_path / "src"
+        write_tree(source, {"handler.py": ""})
+        output = tmp_path / "output"
+        output.mkdir()
+        other_runtime = _lambda.Runtime("python3.0", _lambda.RuntimeFamily.PYTHON)
+        bundling = HandlerLocalBundling(str(source), ["handler.py"], other_runtime)
+
+        # Act
+        result = bundling.try_bundle(str(output), MagicMock())
+
+        # Assert
+        assert result is True
+        assert (output / "handler.py").is_file()
+        assert not (output / "__pycache__").exists()
@@ -1,8 +1,16 @@
+import os
 import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from infra.constructs.layers import PythonLocalBundling
+from aws_cdk import aws_lambda as _lambda
+
+from infra.constructs.bundling import BundleCache
+from infra.constructs.layers import (
+    PythonLocalBundling,
+    handler_packages,
+    pinned_requirements,
+)
 
 
 class TestPythonLocalBundling:
@@ -135,3 +143,209 @@ class TestPythonLocalBundling:
             # Assert
             assert result is False
             assert mock_run.call_count == 2
+
+    def test_try_bundle_installs_packages_with_pinned_constraints(self, tmp_path: Path):
+        """packages を指定した場合、requirements.txt の固定バージョンを制約に使う"""
+        # Arrange
+        source_path = tmp_path / "source"
+        source_path.mkdir()
+        (source_path / "requirements.txt").write_text(
+            "pydantic==2.12.5 \\\n"
+            "    --hash=sha256:abc\n"
+            "    # via serverless-trip-saga-python\n"
+            "cffi==2.0.0 ; platform_python_implementation != 'PyPy' \\\n"
+            "    --hash=sha256:def\n"
+        )
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        constraints = []
+
+        def run(args, check):
+            constraints.append(Path(args[args.index("-c") + 1]).read_text())
+            return MagicMock(returncode=0)
+
+        bundling = PythonLocalBundling(str(source_path), packages=["pydantic"])
+
+        with patch("subprocess.run", side_effect=run) as mock_run:
+            # Act
+            result = bundling.try_bundle(str(output_dir), MagicMock())
+
+        # Assert
+        assert result is True
+        call_args = mock_run.call_args[0][0]
+        assert call_args[3] == "pydantic"
+        assert "-r" not in call_args
+        assert constraints == [
+            "pydantic==2.12.5\ncffi==2.0.0 ; platform_python_implementation != 'PyPy'\n"
+        ]
+
+    def test_try_bundle_targets_arm64_wheels(self, tmp_path: Path):
+        """arm64 では aarch64 の manylinux wheel をインストールする"""
+        # Arrange
+        source_path = tmp_path / "source"
+        source_path.mkdir()
+        (source_path / "requirements.txt").write_text("pydantic==2.12.5\n")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        bundling = PythonLocalBundling(
+            str(source_path), architecture=_lambda.Architecture.ARM_64
+        )
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.side_effect = [
+                FileNotFoundError("uv not found"),
+                MagicMock(returncode=0),
+            ]
+
+            # Act
+            bundling.try_bundle(str(output_dir), MagicMock())
+
+        # Assert
+        uv_args = mock_run.call_args_list[0][0][0]
+        pip_args = mock_run.call_args_list[1][0][0]
+        assert uv_args[uv_args.index("--python-platform") + 1] == (
+            "aarch64-manylinux2014"
+        )
+        assert pip_args[pip_args.index("--platform") + 1] == "manylinux2014_aarch64"
+        assert pip_args[pip_args.index("--python-version") + 1] == "3.14"
+
+    def test_try_bundle_prunes_installed_files(self, tmp_path: Path):
+        """インストール後にテスト・キャッシュ・型スタブ・RECORD を削除する"""
+        # Arrange
+        source_path = tmp_path / "source"
+        source_path.mkdir()
+        (source_path / "requirements.txt").write_text("pkg==1.0\n")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        site = output_dir / "python"
+
+        def install(args, check):
+            for relative in [
+                "pkg/__init__.py",
+                "pkg/__init__.pyi",
+                "pkg/tests/test_pkg.py",
+                "pkg/__pycache__/__init__.cpython-313.pyc",
+                "pkg-1.0.dist-info/METADATA",
+                "pkg-1.0.dist-info/RECORD",
+            ]:
+                path = site / relative
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("")
+            return MagicMock(returncode=0)
+
+        bundling = PythonLocalBundling(str(source_path))
+
+        with patch("subprocess.run", side_effect=install):
+            # Act
+            bundling.try_bundle(str(output_dir), MagicMock())
+
+        # Assert
+        remaining = sorted(
+            path.relative_to(site).as_posix()
+            for path in site.rglob("*")
+            if path.is_file() and path.suffix != ".pyc"
+        )
+        assert remaining == ["pkg-1.0.dist-info/METADATA", "pkg/__init__.py"]
+        assert not (site / "pkg" / "tests").exists()
+
+
+class TestHandlerPackages:
+    """handler_packages のテスト"""
+
+    def test_uses_only_packages_reached_from_handler(self):
+        """ハンドラーが import するパッケージだけを選び、ランタイム同梱のものは除く"""
+        # Arrange
+        pinned = pinned_requirements(Path("layers/common_layer/requirements.txt"))
+
+        # Act
+        reserve = handler_packages(
+            "services.flight.handlers.reserve.lambda_handler", pinned
+        )
+        get_trip = handler_packages(
+            "services.trip.handlers.get_trip.lambda_handler", pinned
+        )
+        authorizer = handler_packages("authorizer.handler.lambda_handler", pinned)
+
+        # Assert
+        assert reserve == ["aws-lambda-powertools", "pydantic"]
+        assert get_trip == ["aws-lambda-powertools"]
+        assert authorizer == []
+
+
+class TestLayerCache:
+    """PythonLocalBundling のキャッシュのテスト"""
+
+    @staticmethod
+    def install(args, check):
+        target = Path(args[args.index("--target") + 1])
+        (target / "pkg").mkdir(parents=True)
+        (target / "pkg" / "__init__.py").write_text("VERSION = 1\n")
+        return MagicMock(returncode=0)
+
+    def test_second_bundle_is_served_from_cache(self, tmp_path: Path):
+        """同じ requirements.txt の2回目はインストールせずにキャッシュから展開する"""
+        # Arrange
+        source_path = tmp_path / "source"
+        source_path.mkdir()
+        (source_path / "requirements.txt").write_text("pkg==1.0\n")
+        first, second = tmp_path / "first", tmp_path / "second"
+
+        with patch("subprocess.run", side_effect=self.install) as mock_run:
+            PythonLocalBundling(str(source_path)).try_bundle(str(first), MagicMock())
+
+            # Act
+            result = PythonLocalBundling(str(source_path)).try_bundle(
+                str(second), MagicMock()
+            )
+
+        # Assert
+        assert result is True
+        assert mock_run.call_count == 1
+        assert (second / "python" / "pkg" / "__init__.py").read_text() == (
+            "VERSION = 1\n"
+        )
+
+    def test_changed_requirements_or_architecture_miss_cache(self, tmp_path: Path):
+        """requirements.txt・アーキテクチャが変わった場合は再インストールする"""
+        # Arrange
+        source_path = tmp_path / "source"
+        source_path.mkdir()
+        requirements = source_path / "requirements.txt"
+        requirements.write_text("pkg==1.0\n")
+
+        with patch("subprocess.run", side_effect=self.install) as mock_run:
+            PythonLocalBundling(str(source_path)).try_bundle(
+                str(tmp_path / "a"), MagicMock()
+            )
+
+            # Act
+            PythonLocalBundling(
+                str(source_path), architecture=_lambda.Architecture.ARM_64
+            ).try_bundle(str(tmp_path / "b"), MagicMock())
+            requirements.write_text("pkg==2.0\n")
+            PythonLocalBundling(str(source_path)).try_bundle(
+                str(tmp_path / "c"), MagicMock()
+            )
+
+        # Assert
+        assert mock_run.call_count == 3
+
+    def test_evicts_least_recently_used_entries(self, tmp_path: Path):
+        """max_entries を超えたら最近使われていないエントリから削除する"""
+        # Arrange
+        cache = BundleCache(tmp_path / "cache", max_entries=2)
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "module.py").write_text("")
+        cache.store("a", source)
+        cache.store("b", source)
+        os.utime(cache.root / "a", (0, 0))
+        os.utime(cache.root / "b", (1, 1))
+
+        # Act
+        cache.restore("a", tmp_path / "restored")
+        cache.store("c", source)
+
+        # Assert
+        assert sorted(path.name for path in cache.root.iterdir()) == ["a", "c"]
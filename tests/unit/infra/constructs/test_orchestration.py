@@ -0,0 +1,270 @@
+import json
+from functools import cache
+
+import aws_cdk as cdk
+from aws_cdk import aws_dynamodb as dynamodb
+from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_stepfunctions as sfn
+from aws_cdk.assertions import Template
+
+from infra.constructs.orchestration import CANCEL_TARGETS, Orchestration
+from services.flight.domain.enum import BookingStatus
+from services.flight.domain.value_object import BookingId
+from services.flight.infrastructure.booking_codec import booking_key
+from services.hotel.domain.enum import HotelBookingStatus
+from services.hotel.domain.value_object import HotelBookingId
+from services.hotel.infrastructure.hotel_booking_codec import hotel_booking_key
+from services.shared.domain import TripId
+
+FUNCTIONS = (
+    "flight_reserve",
+    "flight_cancel",
+    "hotel_reserve",
+    "hotel_cancel",
+    "payment_process",
+)
+
+
+def synthesize(**options) -> dict:
+    """Orchestration を合成したテンプレートのステートマシンリソースを返す"""
+    stack = cdk.Stack(cdk.App(), "TestStack")
+    functions = {
+        name: _lambda.Function.from_function_arn(
+            stack,
+            name,
+            f"arn:aws:lambda:ap-northeast-1:123456789012:function:{name}",
+        )
+        for name in FUNCTIONS
+    }
+    table = dynamodb.Table.from_table_name(stack, "Table", "TripTable")
+    Orchestration(stack, "Orchestration", **functions, table=table, **options)
+
+    template = Template.from_stack(stack).to_json()
+    (state_machine,) = [
+        resource
+        for resource in template["Resources"].values()
+        if resource["Type"] == "AWS::StepFunctions::StateMachine"
+    ]
+    return state_machine
+
+
+@cache
+def render_definition(**options) -> dict:
+    """Orchestration を合成し、ステートマシンの ASL を dict で返す
+
+    DefinitionString の Fn::Join に含まれる参照（関数 ARN など）は文字列に置き換える。
+    """
+    definition = synthesize(**options)["Properties"]["DefinitionString"]
+    if isinstance(definition, dict):
+        _, parts = definition["Fn::Join"]
+        definition = "".join(part if isinstance(part, str) else "ref" for part in parts)
+    return json.loads(definition)
+
+
+class TestSequentialReservations:
+    """既定（直列予約）のステートマシンのテスト"""
+
+    def test_reserves_flight_then_hotel_then_payment(self):
+        """フライト → ホテル → 決済の順に実行する"""
+        # Act
+        asl = render_definition()
+
+        # Assert
+        states = asl["States"]
+        assert asl["StartAt"] == "ReserveFlight"
+        assert states["ReserveFlight"]["Next"] == "ReserveHotel"
+        assert states["ReserveHotel"]["Next"] == "ProcessPayment"
+        assert states["ReserveHotel"]["Catch"][0]["Next"] == "CancelFlightFromHotel"
+
+
+class TestStateMachineType:
+    """state_machine_type のテスト"""
+
+    def test_defaults_to_standard(self):
+        """既定は STANDARD ステートマシン"""
+        # Act
+        state_machine = synthesize()
+
+        # Assert
+        assert state_machine["Properties"].get("StateMachineType", "STANDARD") == (
+            "STANDARD"
+        )
+
+    def test_creates_express_state_machine(self):
+        """EXPRESS を指定すると同じ定義の EXPRESS ステートマシンを作成する"""
+        # Act
+        state_machine = synthesize(state_machine_type=sfn.StateMachineType.EXPRESS)
+
+        # Assert
+        assert state_machine["Properties"]["StateMachineType"] == "EXPRESS"
+
+
+class TestParallelReservations:
+    """parallel_reservations=True のステートマシンのテスト"""
+
+    def test_runs_flight_and_hotel_in_parallel(self):
+        """フライトとホテルを Parallel で予約し、結果を $.results.* に格納する"""
+        # Act
+        asl = render_definition(parallel_reservations=True)
+
+        # Assert
+        parallel = asl["States"][asl["StartAt"]]
+        assert parallel["Type"] == "Parallel"
+        assert [branch["StartAt"] for branch in parallel["Branches"]] == [
+            "ReserveFlight",
+            "ReserveHotel",
+        ]
+        assert parallel["ResultPath"] == "$.results"
+        assert parallel["ResultSelector"] == {
+            "flight.$": "$[0].results.flight",
+            "hotel.$": "$[1].results.hotel",
+        }
+        assert parallel["Next"] == "CheckReservations"
+
+    def test_branch_failures_are_caught_inside_branch(self):
+        """片方の失敗で Parallel 全体を失敗させず、エラーを結果として返す"""
+        # Act
+        asl = render_definition(parallel_reservations=True)
+
+        # Assert
+        flight_branch, _ = asl["States"]["ReserveFlightAndHotel"]["Branches"]
+        catch = flight_branch["States"]["ReserveFlight"]["Catch"][0]
+        failed = flight_branch["States"][catch["Next"]]
+        assert catch["ErrorEquals"] == ["States.ALL"]
+        assert failed["Type"] == "Pass"
+        assert failed["ResultPath"] == "$.results.flight"
+
+    def test_cancels_only_the_side_that_succeeded(self):
+        """失敗していない側の予約だけを取り消してから失敗で終了する"""
+        # Act
+        asl = render_definition(parallel_reservations=True)
+
+        # Assert
+        states = asl["States"]
+        choices = [choice["Next"] for choice in states["CheckReservations"]["Choices"]]
+        assert sorted(choices) == [
+            "CancelFlightFromHotel",
+            "CancelHotelFromFlight",
+            "SagaFailedFromReservations",
+        ]
+        assert states["CheckReservations"]["Default"] == "ProcessPayment"
+        assert states["CancelHotelFromFlight"]["Next"] == "SagaFailedFromFlight"
+        assert states["CancelFlightFromHotel"]["Next"] == "SagaFailedFromHotel"
+
+
+class TestPaymentCompensations:
+    """決済失敗時の補償のテスト"""
+
+    def test_cancels_hotel_and_flight_in_parallel(self):
+        """ホテルとフライトの取り消しを Parallel で同時に実行する"""
+        # Act
+        states = render_definition()["States"]
+
+        # Assert
+        catch = states["ProcessPayment"]["Catch"][0]
+        parallel = states[catch["Next"]]
+        assert parallel["Type"] == "Parallel"
+        assert [branch["StartAt"] for branch in parallel["Branches"]] == [
+            "CancelHotelFromPayment",
+            "CancelFlightFromPayment",
+        ]
+        assert parallel["ResultPath"] == "$.results"
+        assert parallel["ResultSelector"]["hotel_cancel.$"] == (
+            "$[0].results.hotel_cancel"
+        )
+        assert parallel["ResultSelector"]["flight_cancel.$"] == (
+            "$[1].results.flight_cancel"
+        )
+
+    def test_branches_retry_then_return_error(self):
+        """各ブランチは再試行し、それでも失敗した場合はエラーを結果として返す"""
+        # Act
+        states = render_definition()["States"]
+
+        # Assert
+        _, flight_branch = states["CancelReservationsFromPayment"]["Branches"]
+        task = flight_branch["States"]["CancelFlightFromPayment"]
+        assert ["States.TaskFailed"] in [
+            retry["ErrorEquals"] for retry in task["Retry"]
+        ]
+        failed = flight_branch["States"][task["Catch"][0]["Next"]]
+        assert failed["Type"] == "Pass"
+        assert failed["ResultPath"] == "$.results.flight_cancel"
+
+    def test_records_partial_failure_for_redrive(self):
+        """取り消しに失敗した場合は COMPENSATION_FAILURE を記録してから失敗する"""
+        # Act
+        states = render_definition()["States"]
+
+        # Assert
+        check = states["CheckCompensations"]
+        assert check["Default"] == "SagaFailedFromPayment"
+        (choice,) = check["Choices"]
+        record = states[choice["Next"]]
+        assert record["Resource"].endswith(":dynamodb:putItem")
+        item = record["Parameters"]["Item"]
+        assert item["PK"]["S.$"] == "States.Format('TRIP#{}', $.trip_id)"
+        assert item["entity_type"] == {"S": "COMPENSATION_FAILURE"}
+        assert states[record["Next"]]["Error"] == "SagaCompensationFailed"
+
+
+class TestDirectCompensations:
+    """direct_compensations=True のステートマシンのテスト"""
+
+    def test_cancels_with_conditional_update_item(self):
+        """キャンセル Lambda と同じ条件で予約のステータスを直接更新する"""
+        # Act
+        states = render_definition(direct_compensations=True)["States"]
+
+        # Assert
+        task = states["CancelFlightFromHotel"]
+        parameters = task["Parameters"]
+        assert task["Resource"].endswith(":dynamodb:updateItem")
+        assert parameters["Key"]["SK"]["S.$"] == (
+            "States.Format('FLIGHT#flight_for_{}', $.trip_id)"
+        )
+        assert parameters["UpdateExpression"] == "SET #status = :status"
+        assert parameters["ConditionExpression"] == (
+            "attribute_exists(PK) AND #status IN (:from0, :from1)"
+        )
+        assert parameters["ExpressionAttributeValues"][":status"] == {"S": "CANCELLED"}
+        assert task["ResultPath"] == "$.results.flight_cancel"
+
+    def test_treats_conditional_check_failure_as_cancelled(self):
+        """条件チェックの失敗（取り消し済み・存在しない）は再試行せず成功として扱う"""
+        # Act
+        states = render_definition(direct_compensations=True)["States"]
+
+        # Assert
+        task = states["CancelFlightFromHotel"]
+        assert task["Retry"][0] == {
+            "ErrorEquals": ["DynamoDB.ConditionalCheckFailedException"],
+            "MaxAttempts": 0,
+        }
+        catch = task["Catch"][0]
+        assert catch["ErrorEquals"] == ["DynamoDB.ConditionalCheckFailedException"]
+        already_cancelled = states[catch["Next"]]
+        assert already_cancelled["Type"] == "Pass"
+        assert already_cancelled["ResultPath"] == "$.results.flight_cancel"
+        assert already_cancelled["Next"] == task["Next"] == "SagaFailedFromHotel"
+
+    def test_targets_match_service_codecs(self):
+        """キーとステータスが各サービスのコーデック・取り消し後のステータスと一致する"""
+        # Arrange
+        trip_id = TripId(value="trip-001")
+        expected = {
+            "flight": (
+                booking_key(trip_id, BookingId.from_trip_id(trip_id)),
+                BookingStatus.CANCELLED,
+            ),
+            "hotel": (
+                hotel_booking_key(trip_id, HotelBookingId.from_trip_id(trip_id)),
+                HotelBookingStatus.CANCELED,
+            ),
+        }
+
+        # Act & Assert
+        for target, (sk_format, status) in CANCEL_TARGETS.items():
+            key, cancelled = expected[target]
+            assert key["SK"]["S"] == sk_format.format(trip_id)
+            assert status == cancelled.value
@@ -0,0 +1,275 @@
+import json
+import traceback
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.flight.domain.factory import BookingFactory
+from services.flight.handlers import cancel as flight_cancel
+from services.flight.handlers import reserve as flight_reserve
+from services.hotel.domain.factory import HotelBookingFactory
+from services.hotel.handlers import cancel as hotel_cancel
+from services.hotel.handlers import reserve as hotel_reserve
+from services.payment.domain.factory import PaymentFactory
+from services.payment.handlers import process as payment_process
+
+from .test_orchestration import render_definition
+
+EVENTS_DIR = Path(__file__).resolve().parents[4] / "events"
+
+# サンプル入力で実行したときの状態（ステートの入力）の上限
+# Step Functions の上限は 256 KB。結果を絞り込んでいれば数 KB に収まる
+MAX_STATE_BYTES = 4 * 1024
+
+# LambdaInvoke の結果のうち Payload 以外（実際の呼び出し結果と同程度の大きさ）
+INVOKE_METADATA = {
+    "ExecutedVersion": "$LATEST",
+    "SdkHttpMetadata": {
+        "AllHttpHeaders": {
+            "X-Amz-Executed-Version": ["$LATEST"],
+            "x-amzn-Remapped-Content-Length": ["0"],
+            "Connection": ["keep-alive"],
+            "x-amzn-RequestId": ["6f4c1a2e-0d9b-4b57-9a8f-3c1f0f5d2b7e"],
+            "Content-Length": ["312"],
+            "Date": ["Sun, 01 Mar 2026 10:00:00 GMT"],
+            "X-Amzn-Trace-Id": ["root=1-65e1a8f0-1c2d3e4f5a6b7c8d9e0f1a2b;sampled=1"],
+            "Content-Type": ["application/json"],
+        },
+        "HttpHeaders": {
+            "Connection": "keep-alive",
+            "Content-Length": "312",
+            "Content-Type": "application/json",
+            "Date": "Sun, 01 Mar 2026 10:00:00 GMT",
+            "X-Amz-Executed-Version": "$LATEST",
+            "x-amzn-Remapped-Content-Length": "0",
+            "x-amzn-RequestId": "6f4c1a2e-0d9b-4b57-9a8f-3c1f0f5d2b7e",
+            "X-Amzn-Trace-Id": "root=1-65e1a8f0-1c2d3e4f5a6b7c8d9e0f1a2b;sampled=1",
+        },
+        "HttpStatusCode": 200,
+    },
+    "SdkResponseMetadata": {"RequestId": "6f4c1a2e-0d9b-4b57-9a8f-3c1f0f5d2b7e"},
+    "StatusCode": 200,
+}
+
+
+# コンテキストオブジェクト（$$.*）
+CONTEXT = {
+    "Execution": {"Id": "arn:aws:states:ap-northeast-1:123456789012:execution:sm:1"},
+    "State": {"Name": "state", "EnteredTime": "2026-03-01T10:00:00Z"},
+    "StateMachine": {"Id": "arn:aws:states:ap-northeast-1:123456789012:sm"},
+}
+
+
+class TaskFailed(Exception):
+    def __init__(self, error: str, cause: str) -> None:
+        super().__init__(error)
+        self.error = error
+        self.cause = cause
+
+
+def read_path(data, path: str):
+    """$.a.b / $[0].a / $$.a 形式の JSONPath で値を取り出す"""
+    if path.startswith("$$"):
+        data, path = CONTEXT, path[1:]
+    for part in path.removeprefix("$").replace("[", ".[").split("."):
+        if not part:
+            continue
+        data = data[int(part[1:-1])] if part.startswith("[") else data[part]
+    return data
+
+
+def write_path(data: dict, path: str | None, value):
+    """ResultPath に従って結果を状態に書き込む（None は結果を捨てる）"""
+    if path is None:
+        return data
+    if path == "$":
+        return value
+    data = json.loads(json.dumps(data))
+    *parents, name = path.removeprefix("$.").split(".")
+    target = data
+    for parent in parents:
+        target = target.setdefault(parent, {})
+    target[name] = value
+    return data
+
+
+def evaluate(template, data):
+    """Parameters / ResultSelector のテンプレートを評価する"""
+    if isinstance(template, dict):
+        return {
+            key.removesuffix(".$"): (
+                read_path(data, value) if key.endswith(".$") else evaluate(value, data)
+            )
+            for key, value in template.items()
+        }
+    return template
+
+
+def matches(condition: dict, data: dict) -> bool:
+    if "And" in condition:
+        return all(matches(c, data) for c in condition["And"])
+    if "Or" in condition:
+        return any(matches(c, data) for c in condition["Or"])
+    try:
+        read_path(data, condition["Variable"])
+        present = True
+    except KeyError:
+        present = False
+    return present == condition["IsPresent"]
+
+
+def invoke(function_name: str, payload: dict) -> dict:
+    """ハンドラーを呼び出し、Lambda の関数エラーと同じ形式で失敗を返す"""
+    handler = HANDLERS[function_name]
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 30_000
+    try:
+        result = handler({"Payload": payload}, context)
+    except Exception as e:
+        cause = {
+            "errorMessage": str(e),
+            "errorType": type(e).__name__,
+            "requestId": "6f4c1a2e-0d9b-4b57-9a8f-3c1f0f5d2b7e",
+            "stackTrace": traceback.format_tb(e.__traceback__),
+        }
+        raise TaskFailed(type(e).__name__, json.dumps(cause)) from e
+    return {**INVOKE_METADATA, "Payload": result}
+
+
+HANDLERS = {
+    "flight_reserve": flight_reserve.lambda_handler,
+    "flight_cancel": flight_cancel.lambda_handler,
+    "hotel_reserve": hotel_reserve.lambda_handler,
+    "hotel_cancel": hotel_cancel.lambda_handler,
+    "payment_process": payment_process.lambda_handler,
+}
+
+
+def execute(states: dict, start_at: str, data: dict, sizes: list[int]) -> dict:
+    """ASL を実行し、各ステートに入るときの状態のサイズを sizes に記録する"""
+    name = start_at
+    while True:
+        state = states[name]
+        sizes.append(len(json.dumps(data, separators=(",", ":")).encode()))
+        match state["Type"]:
+            case "Succeed" | "Fail":
+                return data
+            case "Pass":
+                result = (
+                    evaluate(state["Parameters"], data)
+                    if "Parameters" in state
+                    else state.get("Result", data)
+                )
+                data = write_path(data, state.get("ResultPath", "$"), result)
+            case "Choice":
+                name = next(
+                    (c["Next"] for c in state["Choices"] if matches(c, data)),
+                    state["Default"],
+                )
+                continue
+            case "Parallel":
+                outputs = [
+                    execute(branch["States"], branch["StartAt"], data, sizes)
+                    for branch in state["Branches"]
+                ]
+                result = evaluate(state.get("ResultSelector", {}), outputs) or outputs
+                data = write_path(data, state.get("ResultPath", "$"), result)
+            case "Task":
+                parameters = state["Parameters"]
+                try:
+                    if not state["Resource"].endswith(":lambda:invoke"):
+                        raw = {}
+                    else:
+                        function_name = parameters["FunctionName"].rpartition(":")[2]
+                        payload = evaluate(parameters["Payload"], data)["Payload"]
+                        raw = invoke(function_name, payload)
+                except TaskFailed as e:
+                    catcher = next(
+                        c
+                        for c in state["Catch"]
+                        if {e.error, "States.ALL", "States.TaskFailed"}
+                        & set(c["ErrorEquals"])
+                    )
+                    error_info = {"Error": e.error, "Cause": e.cause}
+                    data = write_path(data, catcher.get("ResultPath", "$"), error_info)
+                    name = catcher["Next"]
+                    continue
+                result = evaluate(state.get("ResultSelector", {}), raw) or raw
+                data = write_path(data, state.get("ResultPath", "$"), result)
+        if state.get("End"):
+            return data
+        name = state["Next"]
+
+
+@pytest.fixture(autouse=True)
+def in_memory_services(monkeypatch):
+    """ハンドラーのサービスを DynamoDB を使わないものに置き換える"""
+    monkeypatch.setattr(
+        flight_reserve,
+        "get_service",
+        lambda: SimpleNamespace(reserve=BookingFactory().create),
+    )
+    monkeypatch.setattr(
+        hotel_reserve,
+        "get_service",
+        lambda: SimpleNamespace(reserve=HotelBookingFactory().create),
+    )
+    monkeypatch.setattr(
+        payment_process,
+        "get_service",
+        lambda: SimpleNamespace(
+            process=lambda trip_id, amount, currency_code: PaymentFactory().create(
+                trip_id, {"amount": amount, "currency_code": currency_code}
+            )
+        ),
+    )
+    for module in (flight_cancel, hotel_cancel):
+        monkeypatch.setattr(
+            module, "get_service", lambda: SimpleNamespace(cancel=lambda trip_id: None)
+        )
+
+
+@pytest.mark.parametrize(
+    ("event", "expected_end"),
+    [
+        ("sfn_input_success.json", "payment"),
+        ("sfn_input_hotel_fail.json", "flight_cancel"),
+        ("sfn_input_payment_fail.json", "flight_cancel"),
+    ],
+)
+@pytest.mark.parametrize("parallel_reservations", [False, True])
+class TestStateSize:
+    """サンプル入力で実行したときの状態のサイズのテスト"""
+
+    def test_state_stays_within_budget(
+        self, event: str, expected_end: str, parallel_reservations: bool
+    ):
+        """実行中の状態が MAX_STATE_BYTES を超えない"""
+        # Arrange
+        asl = render_definition(parallel_reservations=parallel_reservations)
+        data = json.loads((EVENTS_DIR / event).read_text())
+        sizes: list[int] = []
+
+        # Act
+        output = execute(asl["States"], asl["StartAt"], data, sizes)
+
+        # Assert
+        assert expected_end in output["results"]
+        assert max(sizes) <= MAX_STATE_BYTES
+
+    def test_results_keep_only_selected_fields(
+        self, event: str, expected_end: str, parallel_reservations: bool
+    ):
+        """結果には LambdaInvoke のメタデータや Payload 全体を残さない"""
+        # Arrange
+        asl = render_definition(parallel_reservations=parallel_reservations)
+        data = json.loads((EVENTS_DIR / event).read_text())
+
+        # Act
+        output = execute(asl["States"], asl["StartAt"], data, [])
+
+        # Assert
+        for result in output["results"].values():
+            assert not {"Payload", "SdkHttpMetadata", "ExecutedVersion"} & set(result)
@@ -13,5 +13,10 @@ def trip_id():
 
 @pytest.fixture
 def mock_repository():
-    """リポジトリのモックフィクスチャ"""
-    return MagicMock()
+    """リポジトリのモックフィクスチャ
+
+    save は渡された集約をそのまま返す（新規保存時の振る舞い）。
+    """
+    repository = MagicMock()
+    repository.save.side_effect = lambda aggregate: aggregate
+    return repository
@@ -0,0 +1,54 @@
+import pytest
+
+from services.flight.applications.cancel_flight import CancelFlightService
+from services.flight.domain.entity import Booking
+from services.flight.domain.enum import BookingStatus
+from services.shared.domain.exception.exceptions import BusinessRuleViolationException
+
+
+class TestCancelFlightService:
+    """CancelFlightService のテスト"""
+
+    def test_cancel_transitions_status_without_read(
+        self, mock_repository, trip_id, create_booking
+    ):
+        """事前の検索なしに、ステータス遷移1回でキャンセルする"""
+        # Arrange
+        cancelled = create_booking(status=BookingStatus.CANCELLED)
+        mock_repository.transition_status.return_value = cancelled
+        service = CancelFlightService(repository=mock_repository)
+
+        # Act
+        result = service.cancel(trip_id)
+
+        # Assert
+        assert result is cancelled
+        mock_repository.find_by_trip_id.assert_not_called()
+        mock_repository.transition_status.assert_called_once_with(
+            trip_id,
+            to_status=BookingStatus.CANCELLED,
+            from_statuses=Booking.CANCELLABLE_STATUSES,
+        )
+        assert result.status == BookingStatus.CANCELLED
+
+    def test_cancel_returns_none_when_not_found(self, mock_repository, trip_id):
+        """予約が存在しなければ None"""
+        mock_repository.transition_status.return_value = None
+        service = CancelFlightService(repository=mock_repository)
+
+        assert service.cancel(trip_id) is None
+
+    def test_cancel_rejects_status_outside_entity_rule(
+        self, mock_repository, trip_id, create_booking, monkeypatch
+    ):
+        """遷移しなかった予約は Booking.cancel() の規則で判定する"""
+        # Arrange
+        monkeypatch.setattr(Booking, "CANCELLABLE_STATUSES", (BookingStatus.PENDING,))
+        mock_repository.transition_status.return_value = create_booking(
+            status=BookingStatus.CONFIRMED
+        )
+        service = CancelFlightService(repository=mock_repository)
+
+        # Act & Assert
+        with pytest.raises(BusinessRuleViolationException):
+            service.cancel(trip_id)
@@ -36,3 +36,31 @@ class TestReserveFlightService:
         mock_repository.save.assert_called_once()
         saved_booking = mock_repository.save.call_args[0][0]
         assert saved_booking == booking
+
+    def test_reserve_returns_stored_booking_on_replay(
+        self, mock_repository, trip_id, create_booking
+    ):
+        """リトライ時は Repository が返す保存済みの予約を返す"""
+
+        # Arrange
+        stored = create_booking(status=BookingStatus.CONFIRMED)
+        mock_repository.save.side_effect = None
+        mock_repository.save.return_value = stored
+        service = ReserveFlightService(
+            repository=mock_repository, factory=BookingFactory()
+        )
+
+        flight_details: FlightDetails = {
+            "flight_number": "NH001",
+            "departure_time": "2024-01-01T10:00:00",
+            "arrival_time": "2024-01-01T12:00:00",
+            "price_amount": Decimal("50000"),
+            "price_currency": "JPY",
+        }
+
+        # Act
+        booking = service.reserve(trip_id, flight_details)
+
+        # Assert
+        assert booking is stored
+        assert booking.status == BookingStatus.CONFIRMED
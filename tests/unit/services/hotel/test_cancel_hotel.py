@@ -0,0 +1,36 @@
+from services.hotel.applications.cancel_hotel import CancelHotelService
+from services.hotel.domain.entity import HotelBooking
+from services.hotel.domain.enum import HotelBookingStatus
+
+
+class TestCancelHotelService:
+    """CancelHotelService のテスト"""
+
+    def test_cancel_transitions_from_entity_cancellable_statuses(
+        self, mock_repository, trip_id, create_hotel_booking
+    ):
+        """エンティティのキャンセル可能なステータスを遷移元として1回で遷移させる"""
+        # Arrange
+        cancelled = create_hotel_booking(status=HotelBookingStatus.CANCELED)
+        mock_repository.transition_status.return_value = cancelled
+        service = CancelHotelService(repository=mock_repository)
+
+        # Act
+        result = service.cancel(trip_id)
+
+        # Assert
+        assert result is cancelled
+        assert result.status == HotelBookingStatus.CANCELED
+        mock_repository.find_by_trip_id.assert_not_called()
+        mock_repository.transition_status.assert_called_once_with(
+            trip_id,
+            to_status=HotelBookingStatus.CANCELED,
+            from_statuses=HotelBooking.CANCELLABLE_STATUSES,
+        )
+
+    def test_cancel_returns_none_when_not_found(self, mock_repository, trip_id):
+        """予約が存在しなければ None"""
+        mock_repository.transition_status.return_value = None
+        service = CancelHotelService(repository=mock_repository)
+
+        assert service.cancel(trip_id) is None
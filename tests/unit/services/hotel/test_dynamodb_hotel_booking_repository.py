@@ -0,0 +1,72 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.hotel.domain.enum import HotelBookingStatus
+from services.hotel.infrastructure.dynamodb_hotel_booking_repository import (
+    DynamoDBHotelBookingRepository,
+)
+from services.hotel.infrastructure.hotel_booking_codec import encode_hotel_booking
+from services.shared.domain.exception.exceptions import DuplicateResourceException
+
+
+def _already_exists(stored: dict) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}, "Item": stored},
+        "PutItem",
+    )
+
+
+@pytest.fixture
+def repository():
+    return DynamoDBHotelBookingRepository(table_name="TripTable", client=MagicMock())
+
+
+class TestDynamoDBHotelBookingRepositorySave:
+    """DynamoDBHotelBookingRepository.save の冪等な再書き込みのテスト"""
+
+    def test_save_writes_new_booking(self, repository, create_hotel_booking):
+        """新規の予約は条件付き PutItem 1回で書き込み、渡した予約を返す"""
+        # Arrange
+        booking = create_hotel_booking()
+
+        # Act
+        saved = repository.save(booking)
+
+        # Assert
+        assert saved is booking
+        kwargs = repository.client.put_item.call_args.kwargs
+        assert kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+        repository.client.get_item.assert_not_called()
+
+    def test_replay_returns_stored_booking(self, repository, create_hotel_booking):
+        """同じ内容の再書き込みは、追加の読み取りなしに保存済みの予約を返す"""
+        # Arrange
+        stored = create_hotel_booking(status=HotelBookingStatus.CONFIRMED)
+        repository.client.put_item.side_effect = _already_exists(
+            encode_hotel_booking(stored)
+        )
+
+        # Act
+        saved = repository.save(create_hotel_booking())
+
+        # Assert
+        assert saved.status == HotelBookingStatus.CONFIRMED
+        assert saved.id == stored.id
+        repository.client.get_item.assert_not_called()
+
+    def test_replay_with_different_payload_raises(
+        self, repository, create_hotel_booking
+    ):
+        """異なる内容の予約が保存済みなら DuplicateResourceException"""
+        # Arrange
+        stored = create_hotel_booking(price_amount=Decimal("99999"))
+        repository.client.put_item.side_effect = _already_exists(
+            encode_hotel_booking(stored)
+        )
+
+        # Act & Assert
+        with pytest.raises(DuplicateResourceException):
+            repository.save(create_hotel_booking())
@@ -0,0 +1,71 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.payment.domain.enum.payment_status import PaymentStatus
+from services.payment.infrastructure.dynamodb_payment_repository import (
+    DynamoDBPaymentRepository,
+)
+from services.payment.infrastructure.payment_codec import encode_payment
+from services.shared.domain.exception.exceptions import DuplicateResourceException
+
+
+def _already_exists(stored: dict) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}, "Item": stored},
+        "PutItem",
+    )
+
+
+@pytest.fixture
+def repository():
+    client = MagicMock()
+    # シャードマップ未作成（既定の構成）
+    client.get_item.return_value = {}
+    return DynamoDBPaymentRepository(table_name="TripTable", client=client)
+
+
+class TestDynamoDBPaymentRepositorySave:
+    """DynamoDBPaymentRepository.save の冪等な再書き込みのテスト"""
+
+    def test_save_writes_new_payment(self, repository, create_payment):
+        """新規の決済は条件付き PutItem 1回で書き込み、渡した決済を返す"""
+        # Arrange
+        payment = create_payment()
+
+        # Act
+        saved = repository.save(payment)
+
+        # Assert
+        assert saved is payment
+        kwargs = repository.client.put_item.call_args.kwargs
+        assert kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+
+    def test_replay_returns_stored_payment(self, repository, create_payment):
+        """同じ内容の再書き込みは保存済みの決済を返す（GSI1PK の違いは無視する）"""
+        # Arrange
+        stored = create_payment(status=PaymentStatus.COMPLETED)
+        repository.client.put_item.side_effect = _already_exists(
+            encode_payment(stored, "TRIPS#7")
+        )
+
+        # Act
+        saved = repository.save(create_payment())
+
+        # Assert
+        assert saved.status == PaymentStatus.COMPLETED
+        assert saved.id == stored.id
+
+    def test_replay_with_different_payload_raises(self, repository, create_payment):
+        """異なる金額の決済が保存済みなら DuplicateResourceException"""
+        # Arrange
+        stored = create_payment(amount=Decimal("1"))
+        repository.client.put_item.side_effect = _already_exists(
+            encode_payment(stored, "TRIPS#0")
+        )
+
+        # Act & Assert
+        with pytest.raises(DuplicateResourceException):
+            repository.save(create_payment())
@@ -0,0 +1,52 @@
+import pytest
+
+from services.payment.applications.refund_payment import RefundPaymentService
+from services.payment.domain.entity.payment import Payment
+from services.payment.domain.enum.payment_status import PaymentStatus
+from services.shared.domain.exception.exceptions import BusinessRuleViolationException
+
+
+class TestRefundPaymentService:
+    """RefundPaymentService のテスト"""
+
+    def test_refund_transitions_from_entity_refundable_statuses(
+        self, mock_repository, trip_id, create_payment
+    ):
+        """エンティティの払い戻し可能なステータスを遷移元として1回で遷移させる"""
+        # Arrange
+        refunded = create_payment(status=PaymentStatus.REFUNDED)
+        mock_repository.transition_status.return_value = refunded
+        service = RefundPaymentService(repository=mock_repository)
+
+        # Act
+        result = service.refund(trip_id)
+
+        # Assert
+        assert result is refunded
+        mock_repository.find_by_trip_id.assert_not_called()
+        mock_repository.transition_status.assert_called_once_with(
+            trip_id,
+            to_status=PaymentStatus.REFUNDED,
+            from_statuses=Payment.REFUNDABLE_STATUSES,
+        )
+
+    def test_refund_pending_payment_raises_business_rule_violation(
+        self, mock_repository, trip_id, create_payment
+    ):
+        """未完了の決済は遷移せず、エンティティの規則で BusinessRuleViolation"""
+        # Arrange
+        mock_repository.transition_status.return_value = create_payment(
+            status=PaymentStatus.PENDING
+        )
+        service = RefundPaymentService(repository=mock_repository)
+
+        # Act & Assert
+        with pytest.raises(BusinessRuleViolationException):
+            service.refund(trip_id)
+
+    def test_refund_returns_none_when_not_found(self, mock_repository, trip_id):
+        """決済が存在しなければ None"""
+        mock_repository.transition_status.return_value = None
+        service = RefundPaymentService(repository=mock_repository)
+
+        assert service.refund(trip_id) is None
@@ -0,0 +1,197 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.stub import Stubber
+
+from services.shared.infrastructure.aws import AwsClientRegistry, AwsClientSettings
+from services.shared.infrastructure.deadline import (
+    DeadlineExceededException,
+    with_deadline,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    return AwsClientRegistry(AwsClientSettings())
+
+
+class TestAwsClientSettings:
+    """AwsClientSettings のテスト"""
+
+    def test_from_env_overrides_defaults(self, monkeypatch):
+        """AWS_CLIENT_* 環境変数で設定を上書きできる"""
+        # Arrange
+        monkeypatch.setenv("AWS_CLIENT_MAX_POOL_CONNECTIONS", "64")
+        monkeypatch.setenv("AWS_CLIENT_TCP_KEEPALIVE", "false")
+        monkeypatch.setenv("AWS_CLIENT_READ_TIMEOUT", "1.5")
+        monkeypatch.setenv("AWS_CLIENT_RETRY_MODE", "standard")
+
+        # Act
+        config = AwsClientSettings.from_env().to_config()
+
+        # Assert
+        assert config.max_pool_connections == 64
+        assert config.tcp_keepalive is False
+        assert config.read_timeout == 1.5
+        assert config.retries == {"mode": "standard", "total_max_attempts": 3}
+
+    def test_defaults_use_adaptive_retry_and_keepalive(self):
+        """既定では adaptive リトライと TCP キープアライブを有効にする"""
+        config = AwsClientSettings().to_config()
+
+        assert config.tcp_keepalive is True
+        assert config.retries["mode"] == "adaptive"
+
+    @pytest.mark.parametrize(
+        ("remaining", "read_timeout", "max_attempts"),
+        [
+            # 既定（接続 2 秒 + 読み取り 5 秒）× 3 回が収まる
+            (30.0, 5.0, 3),
+            # 全試行が収まる最大の段階（(1 + 1) 秒 × 3 回）
+            (9.5, 1.0, 3),
+            # どの段階でも3回は収まらない → 最小の段階で収まる回数だけ
+            (1.3, 0.25, 2),
+        ],
+    )
+    def test_within_fits_every_attempt(self, remaining, read_timeout, max_attempts):
+        """全試行の最大所要時間が残り時間に収まる設定を選ぶ"""
+        # Act
+        settings = AwsClientSettings().within(remaining)
+
+        # Assert
+        assert settings.read_timeout == read_timeout
+        assert settings.max_attempts == max_attempts
+        assert settings.attempt_seconds * settings.max_attempts <= remaining
+
+    def test_within_returns_none_when_one_attempt_does_not_fit(self):
+        """最小の段階でも1回の試行が収まらなければ None"""
+        assert AwsClientSettings().within(0.4) is None
+
+
+class TestAwsClientRegistry:
+    """AwsClientRegistry のテスト"""
+
+    def test_client_is_created_once_per_service(self, registry):
+        """同じサービスには同じクライアントを返す"""
+        # Act
+        first = registry.client("dynamodb")
+        second = registry.client("dynamodb")
+
+        # Assert
+        assert first is second
+        assert registry.client("secretsmanager") is not first
+        assert first.meta.config.max_pool_connections == 32
+
+    def test_stats_count_calls_and_retries(self, registry):
+        """API 呼び出し回数と SDK 内部の再試行回数を集計する"""
+        # Arrange
+        client = registry.client("dynamodb")
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                "get_item",
+                {"ResponseMetadata": {"RetryAttempts": 2}},
+                {"TableName": "table", "Key": {"PK": {"S": "A"}}},
+            )
+
+            # Act
+            client.get_item(TableName="table", Key={"PK": {"S": "A"}})
+
+        # Assert
+        stats = registry.stats()["dynamodb"]
+        assert stats["calls"] == 1
+        assert stats["retries"] == 2
+        assert stats["errors"] == 0
+
+    def test_deadline_client_caps_timeout_and_attempts(self, registry, monkeypatch):
+        """締め切りが近い場合は全試行が残り時間に収まるクライアントを使う"""
+        # Arrange
+        monkeypatch.setenv("DEADLINE_SAFETY_MARGIN_MS", "500")
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 1800
+
+        # Act
+        client = with_deadline(
+            lambda event, context: registry.deadline_client("dynamodb")
+        )({}, context)
+
+        # Assert
+        assert client.meta.config.read_timeout == 0.25
+        assert client.meta.config.retries["total_max_attempts"] == 2
+        assert registry.deadline_client("dynamodb") is registry.client("dynamodb")
+
+    def test_deadline_client_fails_fast_without_time_for_one_attempt(
+        self, registry, monkeypatch
+    ):
+        """1回の試行も収まらない場合はクライアントを作らずに失敗する"""
+        # Arrange
+        monkeypatch.setenv("DEADLINE_SAFETY_MARGIN_MS", "500")
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 900
+
+        # Act / Assert
+        with pytest.raises(DeadlineExceededException):
+            with_deadline(lambda event, context: registry.deadline_client("dynamodb"))(
+                {}, context
+            )
+        assert registry.stats() == {}
+
+    def test_refresh_recreates_clients_with_loaded_models(self, registry):
+        """refresh 後はクライアントを作り直し、サービス定義は再利用する"""
+        # Arrange
+        before = registry.client("dynamodb")
+        loader = registry._session.get_component("data_loader")
+
+        # Act
+        registry.refresh()
+        after = registry.client("dynamodb")
+
+        # Assert
+        assert after is not before
+        assert registry._session.get_component("data_loader") is loader
+
+    def test_retry_that_cannot_finish_before_deadline_is_not_sent(
+        self, registry, monkeypatch
+    ):
+        """タイムアウトまで待つと締め切りを過ぎる試行は送信しない"""
+        # Arrange
+        monkeypatch.setenv("DEADLINE_SAFETY_MARGIN_MS", "500")
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 1800
+
+        @with_deadline
+        def handler(event, context):
+            client = registry.deadline_client("dynamodb")
+            # 再試行の待機などで、1回の試行の最大所要時間より残りが短くなった
+            with patch(
+                "services.shared.infrastructure.deadline.remaining_seconds",
+                return_value=client.meta.config.read_timeout,
+            ):
+                client.get_item(TableName="table", Key={"PK": {"S": "A"}})
+
+        # Act / Assert
+        with pytest.raises(DeadlineExceededException):
+            handler({}, context)
+        assert registry.stats()["dynamodb"]["pool_requests"] == 0
+
+    def test_send_after_deadline_raises(self, registry):
+        """締め切りを過ぎた試行は送信せずに DeadlineExceededException"""
+        # Arrange
+        client = registry.client("dynamodb")
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 10_000
+
+        @with_deadline
+        def handler(event, context):
+            with patch(
+                "services.shared.infrastructure.deadline.time.monotonic",
+                return_value=float("inf"),
+            ):
+                client.get_item(TableName="table", Key={"PK": {"S": "A"}})
+
+        # Act / Assert
+        with pytest.raises(DeadlineExceededException):
+            handler({}, context)
+        assert registry.stats()["dynamodb"]["pool_requests"] == 0
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared.infrastructure.deadline import (
+    DeadlineExceededException,
+    check_deadline,
+    remaining_seconds,
+    with_deadline,
+)
+
+
+def lambda_context(remaining_ms: int) -> MagicMock:
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = remaining_ms
+    return context
+
+
+class TestWithDeadline:
+    """with_deadline デコレーターのテスト"""
+
+    def test_sets_deadline_minus_safety_margin(self, monkeypatch):
+        """残り時間から安全マージンを引いた締め切りをハンドラー内で参照できる"""
+        # Arrange
+        monkeypatch.setenv("DEADLINE_SAFETY_MARGIN_MS", "500")
+        seen = []
+
+        @with_deadline
+        def handler(event, context):
+            seen.append(remaining_seconds())
+            return "ok"
+
+        # Act
+        result = handler({}, lambda_context(3000))
+
+        # Assert
+        assert result == "ok"
+        assert 2.4 < seen[0] <= 2.5
+        assert remaining_seconds() is None
+
+    def test_fails_fast_when_no_time_left(self, monkeypatch):
+        """残り時間が安全マージン以下ならハンドラー本体を実行しない"""
+        # Arrange
+        monkeypatch.setenv("DEADLINE_SAFETY_MARGIN_MS", "500")
+        body = MagicMock()
+
+        # Act / Assert
+        with pytest.raises(DeadlineExceededException):
+            with_deadline(body)({}, lambda_context(400))
+        body.assert_not_called()
+
+
+class TestCheckDeadline:
+    """check_deadline のテスト"""
+
+    def test_without_deadline_does_nothing(self):
+        """締め切りが未設定（ハンドラー外）なら何もしない"""
+        check_deadline()
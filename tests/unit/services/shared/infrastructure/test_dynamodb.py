@@ -0,0 +1,277 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    DuplicateResourceException,
+)
+from services.shared.infrastructure.dynamodb import (
+    BatchIncompleteException,
+    batch_get_items,
+    batch_write_items,
+    decode_item,
+    encode_item,
+    put_item_idempotent,
+    transition_item_status,
+)
+
+KEY = {"PK": {"S": "TRIP#trip-123"}, "SK": {"S": "FLIGHT#flight_for_trip-123"}}
+
+
+def _condition_failed(old_item: dict | None = None) -> ClientError:
+    response: dict = {"Error": {"Code": "ConditionalCheckFailedException"}}
+    if old_item is not None:
+        response["Item"] = old_item
+    return ClientError(response, "UpdateItem")
+
+
+class TestTransitionItemStatus:
+    """transition_item_status のテスト"""
+
+    def test_returns_new_item_on_success(self):
+        """遷移できた場合は ALL_NEW のアイテムを返す"""
+        # Arrange
+        client = MagicMock()
+        client.update_item.return_value = {
+            "Attributes": {**KEY, "status": {"S": "CANCELLED"}}
+        }
+
+        # Act
+        item = transition_item_status(
+            client, "table", KEY, "CANCELLED", from_statuses=["PENDING", "CONFIRMED"]
+        )
+
+        # Assert
+        assert item["status"] == {"S": "CANCELLED"}
+        kwargs = client.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == (
+            "attribute_exists(PK) AND #status IN (:from0, :from1)"
+        )
+        assert kwargs["ReturnValues"] == "ALL_NEW"
+        assert kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+        client.get_item.assert_not_called()
+        client.query.assert_not_called()
+
+    def test_returns_none_when_item_missing(self):
+        """アイテムが存在しなければ None"""
+        client = MagicMock()
+        client.update_item.side_effect = _condition_failed()
+
+        assert (
+            transition_item_status(client, "table", KEY, "CANCELLED", ["PENDING"])
+            is None
+        )
+
+    def test_returns_old_item_when_condition_fails(self):
+        """遷移元のステータスでなければ、失敗時のアイテム（現在の状態）を返す"""
+        # Arrange
+        client = MagicMock()
+        client.update_item.side_effect = _condition_failed(
+            {"PK": {"S": "TRIP#trip-123"}, "status": {"S": "CANCELLED"}}
+        )
+
+        # Act
+        item = transition_item_status(client, "table", KEY, "CANCELLED", ["PENDING"])
+
+        # Assert
+        assert item == {"PK": {"S": "TRIP#trip-123"}, "status": {"S": "CANCELLED"}}
+
+    def test_does_not_judge_unexpected_status(self):
+        """遷移先以外のステータスでも例外にせず返す（判定はエンティティで行う）"""
+        client = MagicMock()
+        old_item = {"PK": {"S": "TRIP#trip-123"}, "status": {"S": "PENDING"}}
+        client.update_item.side_effect = _condition_failed(old_item)
+
+        item = transition_item_status(client, "table", KEY, "REFUNDED", ["COMPLETED"])
+
+        assert item == old_item
+
+
+class TestPutItemIdempotent:
+    """put_item_idempotent のテスト"""
+
+    ITEM = {
+        "PK": {"S": "TRIP#trip-123"},
+        "SK": {"S": "PAYMENT#payment_for_trip-123"},
+        "amount": {"S": "50000"},
+        "status": {"S": "COMPLETED"},
+        "GSI1PK": {"S": "TRIPS#1"},
+    }
+
+    def test_returns_none_when_written(self):
+        """新規に書き込んだ場合は None"""
+        client = MagicMock()
+
+        assert put_item_idempotent(client, "table", self.ITEM) is None
+        kwargs = client.put_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "attribute_not_exists(PK)"
+        assert kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+
+    def test_replay_returns_stored_item(self):
+        """同じ内容なら保存済みのアイテムを返す（ステータスと一覧用キーは比較しない）"""
+        # Arrange
+        client = MagicMock()
+        client.put_item.side_effect = _condition_failed(
+            {
+                "PK": {"S": "TRIP#trip-123"},
+                "SK": {"S": "PAYMENT#payment_for_trip-123"},
+                "amount": {"S": "50000"},
+                "status": {"S": "REFUNDED"},
+                "GSI1PK": {"S": "TRIPS#5"},
+            }
+        )
+
+        # Act
+        stored = put_item_idempotent(client, "table", self.ITEM)
+
+        # Assert
+        assert stored["status"] == {"S": "REFUNDED"}
+        client.get_item.assert_not_called()
+
+    def test_different_payload_raises_duplicate(self):
+        """内容が異なる場合は重複エラー"""
+        client = MagicMock()
+        client.put_item.side_effect = _condition_failed(
+            {
+                "PK": {"S": "TRIP#trip-123"},
+                "SK": {"S": "PAYMENT#payment_for_trip-123"},
+                "amount": {"S": "99999"},
+                "status": {"S": "COMPLETED"},
+            }
+        )
+
+        with pytest.raises(DuplicateResourceException):
+            put_item_idempotent(client, "table", self.ITEM)
+
+    def test_other_client_errors_are_raised(self):
+        """条件チェック以外のエラーは握りつぶさない"""
+        client = MagicMock()
+        client.put_item.side_effect = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "PutItem"
+        )
+
+        with pytest.raises(ClientError):
+            put_item_idempotent(client, "table", self.ITEM)
+
+
+def _key(i: int) -> dict:
+    return {
+        "PK": {"S": f"TRIP#trip-{i}"},
+        "SK": {"S": f"PAYMENT#payment_for_trip-{i}"},
+    }
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(
+        "services.shared.infrastructure.dynamodb.time.sleep", lambda _: None
+    )
+
+
+class TestBatchGetItems:
+    """batch_get_items のテスト"""
+
+    def test_preserves_order_and_dedupes_keys(self, no_sleep):
+        """結果はキーと同じ順序で、存在しないキーは None、重複キーは1回だけ取得する"""
+        # Arrange
+        client = MagicMock()
+        client.batch_get_item.return_value = {
+            "Responses": {
+                "table": [{**_key(2), "v": {"N": "2"}}, {**_key(1), "v": {"N": "1"}}]
+            }
+        }
+
+        # Act
+        items = batch_get_items(client, "table", [_key(1), _key(2), _key(3), _key(1)])
+
+        # Assert
+        assert [item and item["v"]["N"] for item in items] == ["1", "2", None, "1"]
+        requested = client.batch_get_item.call_args.kwargs["RequestItems"]
+        assert len(requested["table"]["Keys"]) == 3
+
+    def test_chunks_by_100_keys(self, no_sleep):
+        """100 キーごとに分割してリクエストする"""
+        client = MagicMock()
+        client.batch_get_item.return_value = {"Responses": {"table": []}}
+
+        batch_get_items(client, "table", [_key(i) for i in range(250)])
+
+        sizes = [
+            len(call.kwargs["RequestItems"]["table"]["Keys"])
+            for call in client.batch_get_item.call_args_list
+        ]
+        assert sizes == [100, 100, 50]
+
+    def test_retries_unprocessed_keys(self, no_sleep):
+        """UnprocessedKeys は再試行する"""
+        # Arrange
+        client = MagicMock()
+        unprocessed = {"table": {"Keys": [_key(2)], "ConsistentRead": True}}
+        client.batch_get_item.side_effect = [
+            {"Responses": {"table": [_key(1)]}, "UnprocessedKeys": unprocessed},
+            {"Responses": {"table": [_key(2)]}},
+        ]
+
+        # Act
+        items = batch_get_items(client, "table", [_key(1), _key(2)])
+
+        # Assert
+        assert items == [_key(1), _key(2)]
+        second = client.batch_get_item.call_args_list[1].kwargs["RequestItems"]
+        assert second == unprocessed
+
+
+class TestBatchWriteItems:
+    """batch_write_items のテスト"""
+
+    def test_chunks_by_25_items_and_retries_unprocessed(self, no_sleep):
+        """25 アイテムごとに分割し、UnprocessedItems は再試行する"""
+        # Arrange
+        client = MagicMock()
+        unprocessed = {"table": [{"PutRequest": {"Item": _key(0)}}]}
+        client.batch_write_item.side_effect = [
+            {"UnprocessedItems": unprocessed},
+            {},
+            {},
+        ]
+
+        # Act
+        batch_write_items(client, "table", [_key(i) for i in range(30)])
+
+        # Assert
+        calls = client.batch_write_item.call_args_list
+        assert [len(c.kwargs["RequestItems"]["table"]) for c in calls] == [25, 1, 5]
+        assert calls[1].kwargs["RequestItems"] == unprocessed
+
+    def test_raises_when_items_remain_unprocessed(self, no_sleep):
+        """再試行しても未処理が残れば例外"""
+        client = MagicMock()
+        client.batch_write_item.return_value = {
+            "UnprocessedItems": {"table": [{"PutRequest": {"Item": _key(0)}}]}
+        }
+
+        with pytest.raises(BatchIncompleteException):
+            batch_write_items(client, "table", [_key(0)])
+
+
+class TestAttributeValueCodec:
+    """encode_item / decode_item のテスト"""
+
+    def test_round_trip(self):
+        """スキーマのない値も往復で変換できる"""
+        item = {
+            "name": "trip",
+            "count": Decimal("3"),
+            "active": True,
+            "none": None,
+            "section": {"status": "PENDING", "tags": ["a", "b"]},
+        }
+
+        encoded = encode_item(item)
+
+        assert encoded["count"] == {"N": "3"}
+        assert encoded["active"] == {"BOOL": True}
+        assert encoded["section"]["M"]["tags"] == {"L": [{"S": "a"}, {"S": "b"}]}
+        assert decode_item(encoded) == item
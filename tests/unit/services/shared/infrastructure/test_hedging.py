@@ -0,0 +1,123 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared.infrastructure.hedging import (
+    HedgeBudget,
+    Hedger,
+    LatencyHistogram,
+)
+
+
+@pytest.fixture
+def metrics():
+    return MagicMock()
+
+
+def metric_names(metrics: MagicMock) -> list[str]:
+    return [call.kwargs["name"] for call in metrics.add_metric.call_args_list]
+
+
+class TestLatencyHistogram:
+    """LatencyHistogram のテスト"""
+
+    def test_percentile_requires_min_samples(self):
+        """サンプルが足りない間は None"""
+        histogram = LatencyHistogram(min_samples=3)
+        histogram.record(0.1)
+
+        assert histogram.percentile(95) is None
+
+    def test_percentile_over_rolling_window(self):
+        """直近のウィンドウ内のサンプルからパーセンタイルを返す"""
+        # Arrange
+        histogram = LatencyHistogram(window=100, min_samples=1)
+        for ms in range(1, 201):
+            histogram.record(ms / 1000)
+
+        # Act / Assert
+        assert histogram.percentile(50) == pytest.approx(0.151)
+        assert histogram.percentile(99) == pytest.approx(0.2)
+
+
+class TestHedgeBudget:
+    """HedgeBudget のテスト"""
+
+    def test_budget_limits_extra_requests(self):
+        """トークンを使い切ると通常リクエストの割合分しか追加できない"""
+        # Arrange
+        budget = HedgeBudget(ratio=0.5, burst=1)
+
+        # Act / Assert
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_spend() is True
+
+
+class TestHedger:
+    """Hedger のテスト"""
+
+    def test_fast_primary_does_not_hedge(self, metrics):
+        """待ち時間内に返れば追加リクエストを送らない"""
+        # Arrange
+        hedger = Hedger(default_delay_ms=1000, metrics=metrics)
+        request = MagicMock(return_value="primary")
+
+        # Act
+        result = hedger.call(request)
+
+        # Assert
+        assert result == "primary"
+        request.assert_called_once()
+        metrics.add_metric.assert_not_called()
+        metrics.flush_metrics.assert_not_called()
+
+    def test_slow_primary_is_hedged_and_hedge_wins(self, metrics):
+        """先行リクエストが遅い場合はヘッジを送り、先に返った応答を使う"""
+        # Arrange
+        hedger = Hedger(default_delay_ms=10, metrics=metrics)
+        release = threading.Event()
+        calls = []
+
+        def request():
+            calls.append(None)
+            if len(calls) == 1:
+                release.wait(timeout=5)
+                return "primary"
+            return "hedge"
+
+        # Act
+        result = hedger.call(request)
+        release.set()
+
+        # Assert
+        assert result == "hedge"
+        assert metric_names(metrics) == ["HedgeFired", "HedgeWon"]
+        metrics.flush_metrics.assert_called_once()
+
+    def test_no_hedge_without_budget(self, metrics):
+        """予算がなければ遅くても先行リクエストを待つ"""
+        # Arrange
+        hedger = Hedger(
+            budget=HedgeBudget(ratio=0, burst=0), default_delay_ms=1, metrics=metrics
+        )
+        event = threading.Event()
+        request = MagicMock(side_effect=lambda: event.wait(0.05) or "primary")
+
+        # Act
+        result = hedger.call(request)
+
+        # Assert
+        assert result == "primary"
+        request.assert_called_once()
+        metrics.add_metric.assert_not_called()
+        metrics.flush_metrics.assert_not_called()
+
+    def test_from_env_disabled_by_default(self, monkeypatch):
+        """HEDGING_ENABLED が未設定ならヘッジしない"""
+        monkeypatch.delenv("HEDGING_ENABLED", raising=False)
+
+        assert Hedger.from_env() is None
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.flight.handlers import reserve as flight_reserve
+from services.hotel.handlers import reserve as hotel_reserve
+from services.payment.handlers import process as payment_process
+from services.payment.handlers.request_models import ProcessPaymentRequest
+from services.shared.infrastructure import runtime_hooks
+from services.shared.infrastructure.aws import get_registry
+
+
+@pytest.fixture
+def aws_env(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    yield
+    get_registry().reset()
+
+
+class TestHookRegistration:
+    """before_snapshot / after_restore のテスト"""
+
+    def test_registers_with_snapstart_runtime(self, monkeypatch):
+        """SnapStart のランタイムではフックを登録し、関数自体はそのまま返す"""
+        # Arrange
+        register = MagicMock()
+        monkeypatch.setattr(runtime_hooks, "register_before_snapshot", register)
+
+        def prime() -> None:
+            pass
+
+        # Act
+        decorated = runtime_hooks.before_snapshot(prime)
+
+        # Assert
+        register.assert_called_once_with(prime)
+        assert decorated is prime
+
+    def test_noop_outside_snapstart(self, monkeypatch):
+        """snapshot_restore_py がない環境では登録せずに関数を返す"""
+        # Arrange
+        monkeypatch.setattr(runtime_hooks, "register_after_restore", None)
+
+        def refresh() -> None:
+            pass
+
+        # Act / Assert
+        assert runtime_hooks.after_restore(refresh) is refresh
+
+
+class TestPriming:
+    """スナップショット前の初期化のテスト"""
+
+    def test_validate_example_uses_schema_example(self):
+        """json_schema_extra の例をモデルとして検証する"""
+        request = runtime_hooks.validate_example(ProcessPaymentRequest)
+
+        assert request.trip_id == "trip-123"
+
+    @pytest.mark.parametrize(
+        "handler", [flight_reserve, hotel_reserve, payment_process]
+    )
+    def test_prime_creates_clients_without_calling_aws(self, aws_env, handler):
+        """prime は AWS を呼び出さずにクライアントとサービスを作成する"""
+        # Act
+        handler.prime()
+
+        # Assert
+        stats = get_registry().stats()["dynamodb"]
+        assert stats["calls"] == 0
+        assert stats["pool_requests"] == 0
+
+    def test_refresh_after_restore_drops_primed_clients(self, aws_env):
+        """復元後のフックはスナップショット前に作成したクライアントを作り直す"""
+        # Arrange
+        runtime_hooks.prime_aws_clients("dynamodb")
+        primed = get_registry().client("dynamodb")
+
+        # Act
+        runtime_hooks.refresh_aws_clients()
+
+        # Assert
+        assert get_registry().client("dynamodb") is not primed
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    BusinessRuleViolationException,
+)
+from services.shared.infrastructure.shard_backfill import ShardBackfill
+from services.shared.infrastructure.shard_map import ShardMap, compute_shard
+
+
+def _payment_item(trip_id: str, shard_count: int) -> dict:
+    return {
+        "PK": {"S": f"TRIP#{trip_id}"},
+        "SK": {"S": f"PAYMENT#payment_for_{trip_id}"},
+        "entity_type": {"S": "PAYMENT"},
+        "trip_id": {"S": trip_id},
+        "GSI1PK": {"S": f"TRIPS#{compute_shard(trip_id, shard_count)}"},
+    }
+
+
+@pytest.fixture
+def migrating_store():
+    store = MagicMock()
+    store.get.return_value = ShardMap(
+        version=2, shard_count=8, previous_shard_count=4, updated_at=0.0
+    )
+    return store
+
+
+class TestShardBackfill:
+    """ShardBackfill のテスト"""
+
+    def test_run_rewrites_only_items_on_wrong_shard(self, migrating_store):
+        """新しいシャードと異なる GSI1PK のアイテムだけ書き換える"""
+        # Arrange
+        items = [_payment_item(f"trip-{i}", 4) for i in range(10)]
+        expected_rewrites = sum(
+            1
+            for i in range(10)
+            if compute_shard(f"trip-{i}", 4) != compute_shard(f"trip-{i}", 8)
+        )
+        client = MagicMock()
+        client.scan.side_effect = lambda **kwargs: {
+            "Items": items if kwargs["Segment"] == 0 else []
+        }
+        backfill = ShardBackfill(client, "table", migrating_store, total_segments=2)
+
+        # Act
+        result = backfill.run()
+
+        # Assert
+        assert result.scanned == 10
+        assert result.rewritten == expected_rewrites
+        assert client.update_item.call_count == expected_rewrites
+        segments = sorted(call.kwargs["Segment"] for call in client.scan.call_args_list)
+        assert segments == [0, 1]
+
+    def test_concurrent_update_is_skipped(self, migrating_store):
+        """並行して GSI1PK が変わったアイテムは上書きしない"""
+        # Arrange
+        trip_id = next(
+            f"trip-{i}"
+            for i in range(100)
+            if compute_shard(f"trip-{i}", 4) != compute_shard(f"trip-{i}", 8)
+        )
+        client = MagicMock()
+        client.scan.return_value = {"Items": [_payment_item(trip_id, 4)]}
+        client.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        backfill = ShardBackfill(client, "table", migrating_store, total_segments=1)
+
+        # Act
+        result = backfill.run()
+
+        # Assert
+        assert result.skipped == 1
+        assert result.rewritten == 0
+
+    def test_run_requires_migration_in_progress(self):
+        """マイグレーション中でなければ実行できない"""
+        store = MagicMock()
+        store.get.return_value = ShardMap()
+        backfill = ShardBackfill(MagicMock(), "table", store)
+
+        with pytest.raises(BusinessRuleViolationException):
+            backfill.run()
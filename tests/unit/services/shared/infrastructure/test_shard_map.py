@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.shared.domain.exception.exceptions import (
+    BusinessRuleViolationException,
+    OptimisticLockException,
+)
+from services.shared.infrastructure.shard_map import (
+    DynamoDBShardMapStore,
+    ShardMap,
+    compute_shard,
+)
+
+
+class TestShardMap:
+    """ShardMap のテスト"""
+
+    def test_compute_shard_is_deterministic(self):
+        """同じ trip_id は常に同じシャードになる"""
+        assert compute_shard("trip-123", 4) == compute_shard("trip-123", 4)
+        assert 0 <= compute_shard("trip-123", 4) < 4
+
+    def test_default_shard_map(self):
+        """初期構成は4シャードで、読み書きとも TRIPS#0〜3"""
+        shard_map = ShardMap()
+        assert shard_map.read_partitions() == [f"TRIPS#{i}" for i in range(4)]
+        assert shard_map.write_partition("trip-123") in shard_map.read_partitions()
+
+    def test_migration_reads_union_and_writes_new_count(self):
+        """マイグレーション中は新旧の和集合を読み、新しいシャード数で書く"""
+        # Arrange
+        shard_map = ShardMap(version=1, shard_count=4)
+
+        # Act
+        migrating = shard_map.begin_migration(8)
+
+        # Assert
+        assert migrating.version == 2
+        assert migrating.migrating
+        assert migrating.read_partitions() == [f"TRIPS#{i}" for i in range(8)]
+        assert migrating.write_partition("trip-123") == (
+            f"TRIPS#{compute_shard('trip-123', 8)}"
+        )
+
+    def test_shrinking_keeps_reading_old_partitions_until_completed(self):
+        """シャード数を減らす場合も、完了までは旧パーティションを読む"""
+        migrating = ShardMap(version=1, shard_count=8).begin_migration(2)
+        assert len(migrating.read_partitions()) == 8
+
+        completed = migrating.complete_migration()
+        assert completed.version == 3
+        assert completed.read_partitions() == ["TRIPS#0", "TRIPS#1"]
+
+    def test_cannot_begin_migration_twice(self):
+        """マイグレーション中に次のマイグレーションは開始できない"""
+        migrating = ShardMap().begin_migration(8)
+        with pytest.raises(BusinessRuleViolationException):
+            migrating.begin_migration(16)
+
+
+class TestDynamoDBShardMapStore:
+    """DynamoDBShardMapStore のテスト"""
+
+    def test_get_returns_default_when_item_missing(self):
+        """アイテムがなければデフォルト構成を返す"""
+        client = MagicMock()
+        client.get_item.return_value = {}
+        store = DynamoDBShardMapStore(client, "table")
+
+        assert store.get() == ShardMap()
+
+    def test_get_is_cached(self):
+        """TTL 内は DynamoDB を再読込しない"""
+        client = MagicMock()
+        client.get_item.return_value = {
+            "Item": {
+                "version": {"N": "3"},
+                "shard_count": {"N": "8"},
+                "previous_shard_count": {"N": "4"},
+            }
+        }
+        store = DynamoDBShardMapStore(client, "table")
+
+        first = store.get()
+        second = store.get()
+
+        assert first == second
+        assert first.shard_count == 8
+        assert first.previous_shard_count == 4
+        client.get_item.assert_called_once()
+
+    def test_save_conflict_raises_optimistic_lock(self):
+        """バージョンが一致しない場合は楽観ロック例外"""
+        client = MagicMock()
+        client.put_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+        )
+        store = DynamoDBShardMapStore(client, "table")
+
+        with pytest.raises(OptimisticLockException):
+            store.save(ShardMap(version=2, shard_count=8), expected_version=1)
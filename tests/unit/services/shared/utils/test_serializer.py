@@ -0,0 +1,80 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from services.shared.utils.serializer import (
+    CompiledJsonSerializer,
+    StdlibJsonSerializer,
+    get_serializer,
+)
+
+PAYLOAD = {
+    "trip_id": "trip-123",
+    "amount": Decimal("80000"),
+    "created_at": datetime(2024, 1, 1, 10, 0, 0),
+    "items": [{"hotel_name": "東京ホテル", "price_amount": Decimal("1.50")}],
+    "next_token": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_serializer_cache():
+    get_serializer.cache_clear()
+    yield
+    get_serializer.cache_clear()
+
+
+class TestCompiledJsonSerializer:
+    """CompiledJsonSerializer のテスト"""
+
+    def test_output_matches_json_dumps_default_str(self):
+        """json.dumps(default=str) とバイト単位で同じ出力になる"""
+        assert CompiledJsonSerializer().dumps(PAYLOAD) == json.dumps(
+            PAYLOAD, default=str
+        )
+
+    def test_escapes_non_ascii_and_stringifies_decimal(self):
+        """非 ASCII は \\uXXXX にエスケープし、Decimal は文字列にする"""
+        # Act
+        body = CompiledJsonSerializer().dumps(PAYLOAD["items"][0])
+
+        # Assert
+        assert body == (
+            '{"hotel_name": "\\u6771\\u4eac\\u30db\\u30c6\\u30eb", '
+            '"price_amount": "1.50"}'
+        )
+
+
+class TestStdlibJsonSerializer:
+    """StdlibJsonSerializer のテスト"""
+
+    def test_output_matches_compiled(self):
+        """CompiledJsonSerializer と同じ出力になる"""
+        assert StdlibJsonSerializer().dumps(PAYLOAD) == (
+            CompiledJsonSerializer().dumps(PAYLOAD)
+        )
+
+
+class TestGetSerializer:
+    """get_serializer のテスト"""
+
+    def test_compiled_by_default(self, monkeypatch):
+        """JSON_SERIALIZER がなければ compiled を使う"""
+        monkeypatch.delenv("JSON_SERIALIZER", raising=False)
+
+        assert get_serializer().name == "compiled"
+
+    def test_stdlib_can_be_forced(self, monkeypatch):
+        """JSON_SERIALIZER=stdlib で従来の json.dumps を使う"""
+        monkeypatch.setenv("JSON_SERIALIZER", "stdlib")
+
+        assert get_serializer().name == "stdlib"
+
+    def test_unknown_serializer_raises(self, monkeypatch):
+        """未知の名前は設定ミスとして ValueError"""
+        monkeypatch.setenv("JSON_SERIALIZER", "orjson")
+
+        with pytest.raises(ValueError):
+            get_serializer()
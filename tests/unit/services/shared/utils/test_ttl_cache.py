@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from services.shared.utils import TTLCache
+
+
+class TestTTLCache:
+    """TTLCache のテスト"""
+
+    def test_get_returns_put_value(self):
+        """保存した値を取得できる"""
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えると最も長く参照されていないエントリを破棄する"""
+        # Arrange
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.put("c", 3)
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+    def test_expired_entry_is_dropped(self):
+        """有効期限を過ぎたエントリは返さない"""
+        # Arrange
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=10)
+        with patch("services.shared.utils.ttl_cache.time.monotonic", return_value=0):
+            cache.put("a", 1)
+
+        # Act / Assert
+        with patch("services.shared.utils.ttl_cache.time.monotonic", return_value=11):
+            assert cache.get("a") is None
+        assert len(cache) == 0
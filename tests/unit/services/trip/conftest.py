@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+import pytest
+
+from services.flight.domain.entity import Booking
+from services.flight.domain.enum import BookingStatus
+from services.flight.domain.value_object import BookingId, FlightNumber
+from services.hotel.domain.entity import HotelBooking
+from services.hotel.domain.enum import HotelBookingStatus
+from services.hotel.domain.value_object import HotelBookingId, HotelName, StayPeriod
+from services.payment.domain.entity import Payment
+from services.payment.domain.enum import PaymentStatus
+from services.payment.domain.value_object import PaymentId
+from services.shared.domain import Currency, IsoDateTime, Money, TripId
+from services.trip.domain import Trip
+
+
+@pytest.fixture
+def create_trip():
+    """Trip を生成する Factory fixture（Factories as fixtures パターン）"""
+
+    def _factory(
+        trip_id: str = "trip-123",
+        flight_status: BookingStatus | None = BookingStatus.CONFIRMED,
+        hotel_status: HotelBookingStatus | None = HotelBookingStatus.CONFIRMED,
+        payment_status: PaymentStatus | None = PaymentStatus.COMPLETED,
+    ) -> Trip:
+        tid = TripId(value=trip_id)
+        flight = hotel = payment = None
+        if flight_status is not None:
+            flight = Booking(
+                id=BookingId.from_trip_id(tid),
+                trip_id=tid,
+                flight_number=FlightNumber(value="NH001"),
+                departure_time=IsoDateTime.from_string("2024-01-01T10:00:00"),
+                arrival_time=IsoDateTime.from_string("2024-01-01T12:00:00"),
+                price=Money(amount=Decimal("50000"), currency=Currency.jpy()),
+                status=flight_status,
+            )
+        if hotel_status is not None:
+            hotel = HotelBooking(
+                id=HotelBookingId.from_trip_id(tid),
+                trip_id=tid,
+                hotel_name=HotelName(value="Grand Hotel"),
+                stay_period=StayPeriod(check_in="2024-01-01", check_out="2024-01-03"),
+                price=Money(amount=Decimal("30000"), currency=Currency.jpy()),
+                status=hotel_status,
+            )
+        if payment_status is not None:
+            payment = Payment(
+                id=PaymentId.from_trip_id(tid),
+                trip_id=tid,
+                amount=Money(amount=Decimal("80000"), currency=Currency.jpy()),
+                status=payment_status,
+            )
+        return Trip(id=tid, flight=flight, hotel=hotel, payment=payment)
+
+    return _factory
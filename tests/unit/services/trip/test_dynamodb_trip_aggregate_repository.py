@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.flight.domain.enum import BookingStatus
+from services.payment.domain.enum import PaymentStatus
+from services.shared.domain.exception.exceptions import OptimisticLockException
+from services.shared.infrastructure.dynamodb import encode_item
+from services.trip.infrastructure.dynamodb_trip_aggregate_repository import (
+    DynamoDBTripAggregateRepository,
+)
+
+
+@pytest.fixture
+def repository():
+    return DynamoDBTripAggregateRepository(table_name="TripTable", client=MagicMock())
+
+
+class TestDynamoDBTripAggregateRepository:
+    """DynamoDBTripAggregateRepository のテスト"""
+
+    def test_find_by_id_maps_items_with_one_query(self, repository, trip_id):
+        """1回の Query で予約・決済を集約に組み立てる"""
+        # Arrange
+        repository.client.query.return_value = {
+            "Items": [
+                encode_item(
+                    {
+                        "PK": "TRIP#trip-123",
+                        "SK": "PAYMENT#payment_for_trip-123",
+                        "entity_type": "PAYMENT",
+                        "payment_id": "payment_for_trip-123",
+                        "trip_id": "trip-123",
+                        "amount": "80000",
+                        "currency": "JPY",
+                        "status": "COMPLETED",
+                    }
+                ),
+                encode_item({"entity_type": "TRIP_SUMMARY", "trip_id": "trip-123"}),
+            ]
+        }
+
+        # Act
+        trip = repository.find_by_id(trip_id)
+
+        # Assert
+        repository.client.query.assert_called_once()
+        assert trip.payment.status == PaymentStatus.COMPLETED
+        assert trip.flight is None
+        assert trip.changes() == []
+
+    def test_find_by_id_returns_none_when_empty(self, repository, trip_id):
+        """アイテムがなければ None"""
+        repository.client.query.return_value = {"Items": []}
+
+        assert repository.find_by_id(trip_id) is None
+
+    def test_save_commits_changes_in_one_transaction(self, repository, create_trip):
+        """変更されたエンティティだけを、元のステータスを条件に1回で書き込む"""
+        # Arrange
+        trip = create_trip(payment_status=PaymentStatus.FAILED)
+        trip.cancel()
+
+        # Act
+        repository.save(trip)
+
+        # Assert
+        client = repository.client
+        client.transact_write_items.assert_called_once()
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [i["Update"]["Key"]["SK"]["S"] for i in items] == [
+            "FLIGHT#flight_for_trip-123",
+            "HOTEL#hotel_for_trip-123",
+        ]
+        values = items[0]["Update"]["ExpressionAttributeValues"]
+        assert values == {
+            ":status": {"S": BookingStatus.CANCELLED.value},
+            ":expected": {"S": BookingStatus.CONFIRMED.value},
+        }
+        assert trip.changes() == []
+
+    def test_save_without_changes_does_nothing(self, repository, create_trip):
+        """変更がなければ書き込まない"""
+        repository.save(create_trip())
+
+        repository.client.transact_write_items.assert_not_called()
+
+    def test_save_conflict_raises_optimistic_lock(self, repository, create_trip):
+        """条件チェックで取り消された場合は楽観ロック例外"""
+        # Arrange
+        trip = create_trip()
+        trip.cancel()
+        repository.client.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "ConditionalCheckFailed"},
+                    {"Code": "None"},
+                    {"Code": "None"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        # Act / Assert
+        with pytest.raises(OptimisticLockException):
+            repository.save(trip)
+        assert trip.changes() != []
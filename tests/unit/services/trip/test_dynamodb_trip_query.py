@@ -0,0 +1,158 @@
+import pytest
+
+from services.shared.infrastructure.dynamodb import decode_item, encode_item
+from services.shared.infrastructure.shard_map import ShardMap
+from services.trip.infrastructure.dynamodb_trip_query import (
+    DynamoDBTripQuery,
+    InvalidPageTokenException,
+    decode_page_token,
+)
+
+
+class FakeGsiClient:
+    """GSI1 クエリのページング挙動（Limit / ExclusiveStartKey）を再現するフェイク"""
+
+    def __init__(self, items: list[dict], max_page_size: int | None = None) -> None:
+        self._items = items
+        self._max_page_size = max_page_size
+        self.calls: list[dict] = []
+
+    def get_item(self, **kwargs) -> dict:
+        # シャードマップ未登録（デフォルトの4シャード）
+        return {}
+
+    def query(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        partition_key = kwargs["ExpressionAttributeValues"][":pk"]["S"]
+        partition = sorted(
+            (item for item in self._items if item["GSI1PK"] == partition_key),
+            key=lambda item: item["GSI1SK"],
+        )
+        start = kwargs.get("ExclusiveStartKey")
+        if start is not None:
+            start_sk = decode_item(start)["GSI1SK"]
+            partition = [i for i in partition if i["GSI1SK"] > start_sk]
+
+        page_size = kwargs["Limit"]
+        if self._max_page_size is not None:
+            page_size = min(page_size, self._max_page_size)
+        page = partition[:page_size]
+
+        response: dict = {"Items": [encode_item(item) for item in page]}
+        if len(partition) > page_size:
+            last = page[-1]
+            response["LastEvaluatedKey"] = encode_item(
+                {k: last[k] for k in ("PK", "SK", "GSI1PK", "GSI1SK")}
+            )
+        return response
+
+
+def _item(trip_id: str, shard: int) -> dict:
+    return {
+        "PK": f"TRIP#{trip_id}",
+        "SK": "TRIP_SUMMARY",
+        "GSI1PK": f"TRIP_SUMMARIES#{shard}",
+        "GSI1SK": f"TRIP#{trip_id}",
+        "trip_id": trip_id,
+    }
+
+
+@pytest.fixture
+def items():
+    """4シャードに分散した旅行アイテム（trip-000 〜 trip-019）"""
+    return [_item(f"trip-{i:03d}", i % 4) for i in range(20)]
+
+
+class TestDynamoDBTripQuery:
+    """DynamoDBTripQuery のテスト"""
+
+    def test_list_trips_merges_shards_in_gsi1sk_order(self, items):
+        """全シャードの結果が GSI1SK 昇順にマージされる"""
+        # Arrange
+        query = DynamoDBTripQuery(table_name="table", client=FakeGsiClient(items))
+
+        # Act
+        page = query.list_trips(limit=100)
+
+        # Assert
+        assert [i["trip_id"] for i in page.items] == [
+            f"trip-{i:03d}" for i in range(20)
+        ]
+        assert page.next_token is None
+
+    def test_list_trips_paginates_without_gaps_or_duplicates(self, items):
+        """継続トークンで全件を重複・欠落なく取得できる"""
+        # Arrange
+        query = DynamoDBTripQuery(table_name="table", client=FakeGsiClient(items))
+
+        # Act
+        trip_ids: list[str] = []
+        token = None
+        pages = 0
+        while True:
+            page = query.list_trips(limit=3, page_token=token)
+            trip_ids.extend(i["trip_id"] for i in page.items)
+            pages += 1
+            token = page.next_token
+            if token is None:
+                break
+
+        # Assert
+        assert trip_ids == [f"trip-{i:03d}" for i in range(20)]
+        assert pages == 7
+
+    def test_list_trips_follows_last_evaluated_key(self, items):
+        """1MB 制限でページが切れても続きを取得してマージする"""
+        # Arrange
+        client = FakeGsiClient(items, max_page_size=2)
+        query = DynamoDBTripQuery(table_name="table", client=client)
+
+        # Act
+        page = query.list_trips(limit=10)
+
+        # Assert
+        assert [i["trip_id"] for i in page.items] == [
+            f"trip-{i:03d}" for i in range(10)
+        ]
+        assert any("ExclusiveStartKey" in call for call in client.calls)
+
+    def test_exhausted_shards_are_not_queried_again(self):
+        """読み切ったシャードは次ページ以降クエリしない"""
+        # Arrange
+        items = [_item("trip-000", 0)] + [_item(f"trip-{i:03d}", 1) for i in (1, 2)]
+        client = FakeGsiClient(items)
+        query = DynamoDBTripQuery(table_name="table", client=client)
+        first = query.list_trips(limit=1)
+        client.calls.clear()
+
+        # Act
+        second = query.list_trips(limit=1, page_token=first.next_token)
+
+        # Assert
+        assert [i["trip_id"] for i in second.items] == ["trip-001"]
+        queried = {
+            call["ExpressionAttributeValues"][":pk"]["S"] for call in client.calls
+        }
+        assert queried == {"TRIP_SUMMARIES#1"}
+
+    def test_partitions_added_by_resharding_are_read_from_start(self, items):
+        """トークン発行後に増えたパーティションは先頭から読む"""
+        # Arrange
+        client = FakeGsiClient(items + [_item("trip-100", 4)])
+        query = DynamoDBTripQuery(table_name="table", client=client)
+        first = query.list_trips(limit=19)
+        query.shard_map_store.get = lambda: ShardMap(
+            version=1, shard_count=8, previous_shard_count=4
+        )
+
+        # Act
+        second = query.list_trips(limit=10, page_token=first.next_token)
+
+        # Assert
+        assert [i["trip_id"] for i in second.items] == ["trip-019", "trip-100"]
+        assert second.next_token is None
+
+    def test_invalid_token_raises_error(self):
+        """不正な継続トークンは例外になる"""
+        with pytest.raises(InvalidPageTokenException):
+            decode_page_token("not-a-token")
@@ -0,0 +1,146 @@
+import json
+import warnings
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared.utils import TTLCache
+from services.trip.handlers import get_trip
+
+
+@pytest.fixture
+def read_model(monkeypatch):
+    read_model = MagicMock()
+    monkeypatch.setattr(get_trip, "get_read_model", lambda: read_model)
+    monkeypatch.setattr(get_trip, "trip_cache", TTLCache(max_size=8, ttl_seconds=60))
+    return read_model
+
+
+def api_event(headers: dict | None = None) -> dict:
+    return {
+        "version": "2.0",
+        "rawPath": "/trips/trip-123",
+        "pathParameters": {"trip_id": "trip-123"},
+        "headers": headers or {},
+        "requestContext": {"http": {"method": "GET"}},
+    }
+
+
+class TestGetTripHandler:
+    """get_trip ハンドラーのキャッシュ・ETag のテスト"""
+
+    def test_returns_etag_and_caches_terminal_trip(self, read_model):
+        """完了済みの旅行は ETag 付きで返し、2回目以降は読み取らない"""
+        # Arrange
+        read_model.get_trip.return_value = {
+            "trip_id": "trip-123",
+            "status": "CONFIRMED",
+        }
+
+        # Act
+        first = get_trip.lambda_handler(api_event(), MagicMock())
+        second = get_trip.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert first["statusCode"] == 200
+        assert first["headers"]["ETag"].startswith('"')
+        assert second == first
+        read_model.get_trip.assert_called_once()
+
+    def test_in_progress_trip_bypasses_cache(self, read_model):
+        """サガ実行中の旅行は毎回読み取る"""
+        # Arrange
+        read_model.get_trip.return_value = {
+            "trip_id": "trip-123",
+            "status": "IN_PROGRESS",
+        }
+
+        # Act
+        get_trip.lambda_handler(api_event(), MagicMock())
+        get_trip.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert read_model.get_trip.call_count == 2
+
+    def test_partially_compensated_trip_bypasses_cache(self, read_model):
+        """補償の途中（ホテルだけ取り消し済み）の旅行はキャッシュしない"""
+        # Arrange
+        read_model.get_trip.side_effect = [
+            {
+                "trip_id": "trip-123",
+                "flight": {"status": "PENDING"},
+                "hotel": {"status": "CANCELED"},
+                "status": "CANCELLED",
+            },
+            {
+                "trip_id": "trip-123",
+                "flight": {"status": "CANCELLED"},
+                "hotel": {"status": "CANCELED"},
+                "status": "CANCELLED",
+            },
+        ]
+
+        # Act
+        first = get_trip.lambda_handler(api_event(), MagicMock())
+        second = get_trip.lambda_handler(api_event(), MagicMock())
+        third = get_trip.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert read_model.get_trip.call_count == 2
+        assert json.loads(second["body"])["flight"]["status"] == "CANCELLED"
+        assert second["headers"]["ETag"] != first["headers"]["ETag"]
+        assert third == second
+
+    def test_if_none_match_returns_304(self, read_model):
+        """If-None-Match が ETag に一致すれば 304 を返す"""
+        # Arrange
+        read_model.get_trip.return_value = {
+            "trip_id": "trip-123",
+            "status": "IN_PROGRESS",
+        }
+        etag = get_trip.lambda_handler(api_event(), MagicMock())["headers"]["ETag"]
+
+        # Act
+        response = get_trip.lambda_handler(
+            api_event({"if-none-match": f"W/{etag}"}), MagicMock()
+        )
+
+        # Assert
+        assert response["statusCode"] == 304
+        assert response["body"] == ""
+        assert response["headers"]["ETag"] == etag
+        assert response["headers"]["Cache-Control"] == "no-cache"
+
+    @pytest.mark.parametrize(
+        ("status", "expected"),
+        [
+            ("IN_PROGRESS", "no-cache"),
+            ("CONFIRMED", f"max-age={int(get_trip.TRIP_CACHE_TTL_SECONDS)}"),
+        ],
+    )
+    def test_cache_control_follows_settlement(self, read_model, status, expected):
+        """実行中の旅行は no-cache、完了済みの旅行は trip_cache と同じ max-age"""
+        # Arrange
+        read_model.get_trip.return_value = {"trip_id": "trip-123", "status": status}
+
+        # Act
+        response = get_trip.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert response["headers"]["Cache-Control"] == expected
+
+    def test_unhedged_call_publishes_no_empty_metrics(self, read_model):
+        """ヘッジを送らない呼び出しは空のメトリクスを出力しない（警告も出ない）"""
+        # Arrange
+        read_model.get_trip.return_value = {
+            "trip_id": "trip-123",
+            "status": "CONFIRMED",
+        }
+
+        # Act
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            get_trip.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert not [w for w in caught if "metrics" in str(w.message)]
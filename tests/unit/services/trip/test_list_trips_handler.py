@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.trip.handlers import list_trips
+from services.trip.infrastructure.dynamodb_trip_query import TripPage
+
+
+@pytest.fixture
+def trip_query(monkeypatch):
+    trip_query = MagicMock()
+    monkeypatch.setattr(list_trips, "get_trip_query", lambda: trip_query)
+    return trip_query
+
+
+def api_event(query: dict | None = None) -> dict:
+    return {
+        "version": "2.0",
+        "rawPath": "/trips",
+        "queryStringParameters": query,
+        "headers": {},
+        "requestContext": {"http": {"method": "GET"}},
+    }
+
+
+class TestListTripsHandler:
+    """list_trips ハンドラーのテスト"""
+
+    def test_page_is_cached_only_briefly(self, trip_query):
+        """一覧は短い max-age の Cache-Control 付きで返す"""
+        # Arrange
+        trip_query.list_trips.return_value = TripPage(items=[], next_token=None)
+
+        # Act
+        response = list_trips.lambda_handler(api_event(), MagicMock())
+
+        # Assert
+        assert response["statusCode"] == 200
+        assert response["headers"]["Cache-Control"] == "max-age=5"
@@ -0,0 +1,78 @@
+from services.flight.domain.enum import BookingStatus
+from services.hotel.domain.enum import HotelBookingStatus
+from services.payment.domain.enum import PaymentStatus
+from services.trip.applications.cancel_trip import CancelTripService
+
+
+class TestTrip:
+    """Trip 集約のテスト"""
+
+    def test_no_changes_after_load(self, create_trip):
+        """読み込み直後は変更なし"""
+        assert create_trip().changes() == []
+
+    def test_cancel_tracks_changed_entities(self, create_trip):
+        """キャンセルで変わったエンティティと元のステータスを返す"""
+        # Arrange
+        trip = create_trip()
+
+        # Act
+        trip.cancel()
+
+        # Assert
+        assert [(e.status, original) for e, original in trip.changes()] == [
+            (BookingStatus.CANCELLED, BookingStatus.CONFIRMED),
+            (HotelBookingStatus.CANCELED, HotelBookingStatus.CONFIRMED),
+            (PaymentStatus.REFUNDED, PaymentStatus.COMPLETED),
+        ]
+
+    def test_cancel_skips_unchanged_entities(self, create_trip):
+        """既にキャンセル済み・未完了の決済は変更しない"""
+        # Arrange
+        trip = create_trip(
+            flight_status=BookingStatus.CANCELLED,
+            payment_status=PaymentStatus.FAILED,
+        )
+
+        # Act
+        trip.cancel()
+
+        # Assert
+        assert [e for e, _ in trip.changes()] == [trip.hotel]
+
+    def test_clear_changes(self, create_trip):
+        """書き込み後は変更なしに戻る"""
+        trip = create_trip()
+        trip.cancel()
+
+        trip.clear_changes()
+
+        assert trip.changes() == []
+
+
+class TestCancelTripService:
+    """CancelTripService のテスト"""
+
+    def test_cancel_loads_once_and_saves_once(self, mock_repository, create_trip):
+        """1回の読み込みと1回の書き込みで旅行全体をキャンセルする"""
+        # Arrange
+        trip = create_trip()
+        mock_repository.find_by_id.return_value = trip
+        service = CancelTripService(repository=mock_repository)
+
+        # Act
+        result = service.cancel(trip.id)
+
+        # Assert
+        assert result is trip
+        mock_repository.find_by_id.assert_called_once_with(trip.id)
+        mock_repository.save.assert_called_once_with(trip)
+        assert trip.flight.status == BookingStatus.CANCELLED
+
+    def test_cancel_returns_none_when_not_found(self, mock_repository, trip_id):
+        """旅行が存在しなければ None"""
+        mock_repository.find_by_id.return_value = None
+        service = CancelTripService(repository=mock_repository)
+
+        assert service.cancel(trip_id) is None
+        mock_repository.save.assert_not_called()
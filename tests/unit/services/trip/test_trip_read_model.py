@@ -0,0 +1,225 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared.infrastructure.dynamodb import encode_item
+from services.shared.infrastructure.shard_map import ShardMap, compute_shard
+from services.trip.infrastructure.trip_read_model import (
+    DynamoDBTripReadModel,
+    TripSummaryProjector,
+    derive_trip_status,
+    is_settled,
+)
+
+
+@pytest.fixture
+def flight_item():
+    return {
+        "PK": "TRIP#trip-123",
+        "SK": "FLIGHT#flight_for_trip-123",
+        "entity_type": "FLIGHT",
+        "booking_id": "flight_for_trip-123",
+        "trip_id": "trip-123",
+        "flight_number": "NH001",
+        "departure_time": "2024-01-01T10:00:00",
+        "arrival_time": "2024-01-01T12:00:00",
+        "price_amount": "50000",
+        "price_currency": "JPY",
+        "status": "PENDING",
+    }
+
+
+@pytest.fixture
+def payment_item():
+    return {
+        "PK": "TRIP#trip-123",
+        "SK": "PAYMENT#payment_for_trip-123",
+        "entity_type": "PAYMENT",
+        "payment_id": "payment_for_trip-123",
+        "trip_id": "trip-123",
+        "amount": "80000",
+        "currency": "JPY",
+        "status": "COMPLETED",
+    }
+
+
+@pytest.fixture
+def projector():
+    store = MagicMock()
+    store.get.return_value = ShardMap()
+    return TripSummaryProjector(MagicMock(), "table", store)
+
+
+class TestDeriveTripStatus:
+    """旅行ステータス導出のテスト"""
+
+    @pytest.mark.parametrize(
+        ("trip", "expected"),
+        [
+            ({"flight": {"status": "PENDING"}}, "IN_PROGRESS"),
+            ({"payment": {"status": "COMPLETED"}}, "CONFIRMED"),
+            ({"payment": {"status": "REFUNDED"}}, "CANCELLED"),
+            (
+                {"flight": {"status": "CANCELLED"}, "hotel": {"status": "CANCELED"}},
+                "CANCELLED",
+            ),
+        ],
+    )
+    def test_derive_trip_status(self, trip, expected):
+        """各予約のステータスから旅行全体のステータスが決まる"""
+        assert derive_trip_status(trip) == expected
+
+
+class TestIsSettled:
+    """キャッシュ可否（サガ・補償の完了）判定のテスト"""
+
+    @pytest.mark.parametrize(
+        ("sections", "expected"),
+        [
+            ({"flight": "PENDING", "hotel": "PENDING"}, False),
+            ({"flight": "PENDING", "hotel": "PENDING", "payment": "COMPLETED"}, True),
+            # 決済失敗の補償途中（フライトの取り消しが未反映）
+            ({"flight": "PENDING", "hotel": "CANCELED"}, False),
+            ({"flight": "CANCELLED", "hotel": "CANCELED"}, True),
+            # ホテル予約失敗（ホテルのセクションなし）
+            ({"flight": "CANCELLED"}, True),
+        ],
+    )
+    def test_is_settled(self, sections, expected):
+        """存在するすべてのセクションが最終ステータスの場合だけ True"""
+        trip = {key: {"status": status} for key, status in sections.items()}
+        trip["status"] = derive_trip_status(trip)
+
+        assert is_settled(trip) is expected
+
+
+class TestTripSummaryProjector:
+    """TripSummaryProjector のテスト"""
+
+    def test_apply_sets_section_and_gsi1_keys(self, projector, flight_item):
+        """変更後のアイテムをサマリーのセクションに反映する"""
+        # Act
+        applied = projector.apply(new_image=flight_item, old_image=None)
+
+        # Assert
+        assert applied is True
+        kwargs = projector.client.update_item.call_args.kwargs
+        assert kwargs["Key"] == {
+            "PK": {"S": "TRIP#trip-123"},
+            "SK": {"S": "TRIP_SUMMARY"},
+        }
+        assert kwargs["ExpressionAttributeNames"] == {"#section": "flight"}
+        values = kwargs["ExpressionAttributeValues"]
+        assert values[":section"]["M"]["flight_number"] == {"S": "NH001"}
+        assert values[":gsi1pk"] == {
+            "S": f"TRIP_SUMMARIES#{compute_shard('trip-123', 4)}"
+        }
+        assert values[":gsi1sk"] == {"S": "TRIP#trip-123"}
+
+    def test_apply_removes_section_on_delete(self, projector, flight_item):
+        """アイテム削除時はセクションを取り除く"""
+        # Act
+        projector.apply(new_image=None, old_image=flight_item)
+
+        # Assert
+        kwargs = projector.client.update_item.call_args.kwargs
+        assert "REMOVE #section" in kwargs["UpdateExpression"]
+        assert ":section" not in kwargs["ExpressionAttributeValues"]
+
+    def test_apply_only_missing_adds_condition(self, projector, flight_item):
+        """only_missing=True はセクションが未作成の場合だけ書き込む"""
+        # Act
+        projector.apply(new_image=flight_item, old_image=None, only_missing=True)
+
+        # Assert
+        kwargs = projector.client.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "attribute_not_exists(#section)"
+
+    def test_apply_ignores_summary_items(self, projector):
+        """サマリー自身の変更は反映しない"""
+        # Act
+        applied = projector.apply(
+            new_image={"entity_type": "TRIP_SUMMARY", "trip_id": "trip-123"},
+            old_image=None,
+        )
+
+        # Assert
+        assert applied is False
+        projector.client.update_item.assert_not_called()
+
+
+class TestDynamoDBTripReadModel:
+    """DynamoDBTripReadModel のテスト"""
+
+    def test_get_trip_reads_summary_item(self, flight_item):
+        """サマリーがあれば GetItem 1回で返す"""
+        # Arrange
+        client = MagicMock()
+        client.get_item.return_value = {
+            "Item": encode_item(
+                {
+                    "trip_id": "trip-123",
+                    "entity_type": "TRIP_SUMMARY",
+                    "payment": {"status": "COMPLETED"},
+                }
+            )
+        }
+        read_model = DynamoDBTripReadModel(table_name="table", client=client)
+
+        # Act
+        trip = read_model.get_trip("trip-123")
+
+        # Assert
+        assert trip == {
+            "trip_id": "trip-123",
+            "payment": {"status": "COMPLETED"},
+            "status": "CONFIRMED",
+        }
+        client.query.assert_not_called()
+
+    def test_get_trip_falls_back_to_items(self, flight_item, payment_item):
+        """サマリー未作成の場合は TRIP# パーティションから組み立てる"""
+        # Arrange
+        client = MagicMock()
+        client.get_item.return_value = {}
+        client.query.return_value = {
+            "Items": [encode_item(flight_item), encode_item(payment_item)]
+        }
+        read_model = DynamoDBTripReadModel(table_name="table", client=client)
+
+        # Act
+        trip = read_model.get_trip("trip-123")
+
+        # Assert
+        assert trip["flight"]["flight_number"] == "NH001"
+        assert trip["payment"]["amount"] == "80000"
+        assert trip["status"] == "CONFIRMED"
+
+    def test_get_trip_returns_none_when_not_found(self):
+        """旅行が存在しなければ None"""
+        client = MagicMock()
+        client.get_item.return_value = {}
+        client.query.return_value = {"Items": []}
+
+        read_model = DynamoDBTripReadModel(table_name="table", client=client)
+        assert read_model.get_trip("trip-404") is None
+
+    def test_get_trip_reads_through_hedger(self):
+        """hedger を渡した場合は読み取りをヘッジ付きで実行する"""
+        # Arrange
+        client = MagicMock()
+        client.get_item.return_value = {
+            "Item": encode_item({"trip_id": "trip-123", "entity_type": "TRIP_SUMMARY"})
+        }
+        hedger = MagicMock()
+        hedger.call.side_effect = lambda request: request()
+        read_model = DynamoDBTripReadModel(
+            table_name="table", client=client, hedger=hedger
+        )
+
+        # Act
+        trip = read_model.get_trip("trip-123")
+
+        # Assert
+        assert trip["trip_id"] == "trip-123"
+        hedger.call.assert_called_once()
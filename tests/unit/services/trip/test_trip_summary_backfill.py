@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from services.shared.infrastructure.dynamodb import encode_item
+from services.shared.infrastructure.shard_map import ShardMap
+from services.trip.infrastructure.trip_read_model import TripSummaryProjector
+from services.trip.infrastructure.trip_summary_backfill import TripSummaryBackfill
+
+
+def _payment_item(trip_id: str) -> dict:
+    return encode_item(
+        {
+            "PK": f"TRIP#{trip_id}",
+            "SK": f"PAYMENT#payment_for_{trip_id}",
+            "entity_type": "PAYMENT",
+            "payment_id": f"payment_for_{trip_id}",
+            "trip_id": trip_id,
+            "amount": "80000",
+            "currency": "JPY",
+            "status": "COMPLETED",
+        }
+    )
+
+
+def _backfill(client: MagicMock, total_segments: int) -> TripSummaryBackfill:
+    store = MagicMock()
+    store.get.return_value = ShardMap()
+    projector = TripSummaryProjector(client, "table", store)
+    return TripSummaryBackfill(
+        client, "table", projector, total_segments=total_segments
+    )
+
+
+class TestTripSummaryBackfill:
+    """TripSummaryBackfill のテスト"""
+
+    def test_run_projects_every_entity_item(self):
+        """全セグメントの FLIGHT / HOTEL / PAYMENT アイテムをサマリーに反映する"""
+        # Arrange
+        items = [_payment_item(f"trip-{i}") for i in range(3)]
+        client = MagicMock()
+        client.scan.side_effect = lambda **kwargs: {
+            "Items": items if kwargs["Segment"] == 0 else []
+        }
+        backfill = _backfill(client, total_segments=2)
+
+        # Act
+        result = backfill.run()
+
+        # Assert
+        assert result.scanned == 3
+        assert result.rewritten == 3
+        scan = client.scan.call_args.kwargs
+        assert {value["S"] for value in scan["ExpressionAttributeValues"].values()} == {
+            "FLIGHT",
+            "HOTEL",
+            "PAYMENT",
+        }
+        update = client.update_item.call_args.kwargs
+        assert update["Key"]["SK"] == {"S": "TRIP_SUMMARY"}
+        assert update["ConditionExpression"] == "attribute_not_exists(#section)"
+
+    def test_run_follows_last_evaluated_key(self):
+        """1MB 制限で Scan が途中で切れた場合は続きを読む"""
+        # Arrange
+        client = MagicMock()
+        client.scan.side_effect = [
+            {"Items": [_payment_item("trip-1")], "LastEvaluatedKey": {"PK": "x"}},
+            {"Items": [_payment_item("trip-2")]},
+        ]
+        backfill = _backfill(client, total_segments=1)
+
+        # Act
+        result = backfill.run()
+
+        # Assert
+        assert result.scanned == 2
+        assert client.scan.call_args.kwargs["ExclusiveStartKey"] == {"PK": "x"}
+
+    def test_existing_section_is_skipped(self):
+        """ストリームで反映済みのセクションは上書きしない"""
+        # Arrange
+        client = MagicMock()
+        client.scan.return_value = {"Items": [_payment_item("trip-1")]}
+        client.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        backfill = _backfill(client, total_segments=1)
+
+        # Act
+        result = backfill.run()
+
+        # Assert
+        assert result.skipped == 1
+        assert result.rewritten == 0
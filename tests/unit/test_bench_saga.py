@@ -0,0 +1,119 @@
+import json
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+
+from benchmarks.bench_saga import (
+    HANDLER_MODULES,
+    InMemoryDynamoDBClient,
+    SagaExecutor,
+    build_services,
+    percentiles,
+)
+
+from .infra.constructs.test_orchestration import render_definition
+
+EVENTS_DIR = Path(__file__).resolve().parents[2] / "events"
+TABLE_NAME = "TripTable"
+
+
+@pytest.fixture
+def client(monkeypatch) -> InMemoryDynamoDBClient:
+    """ハンドラーのサービスを共有のインメモリクライアントで作成する"""
+    client = InMemoryDynamoDBClient()
+    for name, service in build_services(client, TABLE_NAME).items():
+        monkeypatch.setattr(
+            HANDLER_MODULES[name], "get_service", lambda service=service: service
+        )
+    return client
+
+
+def execute(client: InMemoryDynamoDBClient, event: str, **options):
+    data = json.loads((EVENTS_DIR / event).read_text())
+    return SagaExecutor(render_definition(**options), client=client).execute(data)
+
+
+def status_of(client: InMemoryDynamoDBClient, sk_prefix: str) -> str:
+    (item,) = [
+        item for (_, sk), item in client.items.items() if sk.startswith(sk_prefix)
+    ]
+    return item["status"]["S"]
+
+
+class TestSagaExecutor:
+    """SagaExecutor のテスト"""
+
+    def test_success_stores_every_booking(self, client):
+        """正常系は成功で終了し、予約と決済が保存される"""
+        # Act
+        execution = execute(client, "sfn_input_success.json")
+
+        # Assert
+        assert execution.status == "SUCCEEDED"
+        assert [name for name, _ in execution.steps] == [
+            "ReserveFlight",
+            "ReserveHotel",
+            "ProcessPayment",
+        ]
+        assert status_of(client, "FLIGHT#") == "PENDING"
+        assert status_of(client, "PAYMENT#") == "COMPLETED"
+
+    def test_hotel_failure_cancels_flight(self, client):
+        """ホテル予約の失敗はフライトを取り消して失敗で終了する"""
+        # Act
+        execution = execute(client, "sfn_input_hotel_fail.json")
+
+        # Assert
+        assert execution.status == "FAILED"
+        assert execution.error == "SagaFailed"
+        assert status_of(client, "FLIGHT#") == "CANCELLED"
+
+    @pytest.mark.parametrize("direct_compensations", [False, True])
+    def test_payment_failure_cancels_both(self, client, direct_compensations: bool):
+        """決済の失敗はホテルとフライトを取り消す（DynamoDB の直接更新も同じ結果）"""
+        # Act
+        execution = execute(
+            client,
+            "sfn_input_payment_fail.json",
+            direct_compensations=direct_compensations,
+        )
+
+        # Assert
+        assert execution.status == "FAILED"
+        assert status_of(client, "FLIGHT#") == "CANCELLED"
+        assert status_of(client, "HOTEL#") == "CANCELED"
+
+
+class TestInMemoryDynamoDBClient:
+    """InMemoryDynamoDBClient のテスト"""
+
+    def test_conditional_check_failure_returns_old_item(self):
+        """条件を満たさない場合は ConditionalCheckFailedException と既存の項目"""
+        # Arrange
+        client = InMemoryDynamoDBClient()
+        item = {"PK": {"S": "TRIP#1"}, "SK": {"S": "FLIGHT#1"}}
+        client.put_item(TableName=TABLE_NAME, Item=item)
+
+        # Act
+        with pytest.raises(ClientError) as e:
+            client.put_item(
+                TableName=TABLE_NAME,
+                Item=item,
+                ConditionExpression="attribute_not_exists(PK)",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+
+        # Assert
+        assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+        assert e.value.response["Item"] == item
+
+
+class TestPercentiles:
+    """percentiles のテスト"""
+
+    def test_returns_p50_p90_p99(self):
+        """1〜100 の p50 / p90 / p99"""
+        assert percentiles([float(i) for i in range(1, 101)]) == pytest.approx(
+            [50.5, 90.1, 99.01]
+        )
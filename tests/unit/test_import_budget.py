@@ -0,0 +1,92 @@
+import pytest
+
+from benchmarks import import_budget
+from benchmarks.import_budget import (
+    BASELINE_MS,
+    HEADROOM,
+    check,
+    handler_modules,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       332 |      31158 |   aws_lambda_powertools
+import time:      2444 |      16869 |   services.trip.infrastructure.trip_read_model
+import time:      1996 |      89454 | services.trip.handlers.get_trip
+"""
+
+
+class TestImportBudget:
+    """ハンドラーの import 時間予算チェックのテスト"""
+
+    def test_every_handler_has_budget(self):
+        """Functions Construct の全ハンドラーに予算が設定されている"""
+        modules = handler_modules()
+
+        assert "services.flight.handlers.reserve" in modules
+        assert set(modules) <= set(BASELINE_MS)
+
+    def test_parse_importtime_returns_cumulative_ms(self):
+        """対象モジュールの累積時間をミリ秒で返す"""
+        elapsed = parse_importtime(IMPORTTIME_OUTPUT, "services.trip.handlers.get_trip")
+
+        assert elapsed == pytest.approx(89.454)
+
+    def test_parse_importtime_missing_module(self):
+        """対象モジュールが出力にない場合は ValueError"""
+        with pytest.raises(ValueError):
+            parse_importtime(IMPORTTIME_OUTPUT, "services.flight.handlers.reserve")
+
+
+class TestCheck:
+    """check のテスト"""
+
+    @pytest.fixture
+    def modules(self, monkeypatch) -> list[str]:
+        modules = ["services.trip.handlers.get_trip", "services.new.handlers.new"]
+        monkeypatch.setattr(import_budget, "handler_modules", lambda: modules[:1])
+        return modules
+
+    def measure_as(self, monkeypatch, elapsed_ms: float) -> None:
+        monkeypatch.setattr(import_budget, "measure", lambda module: elapsed_ms)
+
+    def test_within_budget_passes(self, monkeypatch, modules, capsys):
+        """中央値が 基準値 × HEADROOM 以内なら成功"""
+        # Arrange
+        self.measure_as(monkeypatch, BASELINE_MS[modules[0]] * HEADROOM)
+
+        # Act / Assert
+        assert check(repeat=3, scale=1.0) is True
+        assert capsys.readouterr().out.startswith("ok")
+
+    def test_over_budget_fails(self, monkeypatch, modules, capsys):
+        """中央値が予算を超えたら失敗"""
+        # Arrange
+        self.measure_as(monkeypatch, BASELINE_MS[modules[0]] * HEADROOM + 1)
+
+        # Act / Assert
+        assert check(repeat=3, scale=1.0) is False
+        assert capsys.readouterr().out.startswith("OVER")
+
+    def test_missing_budget_fails_with_measurement(self, monkeypatch, modules, capsys):
+        """予算のないハンドラーは計測値を示して失敗"""
+        # Arrange
+        monkeypatch.setattr(import_budget, "handler_modules", lambda: modules[1:])
+        self.measure_as(monkeypatch, 42.0)
+
+        # Act
+        passed = check(repeat=3, scale=1.0)
+
+        # Assert
+        assert passed is False
+        assert capsys.readouterr().out.split() == [
+            "NONE",
+            "services.new.handlers.new",
+            "42.0",
+            "ms",
+            "/",
+            "no",
+            "budget",
+            "(--calibrate)",
+        ]
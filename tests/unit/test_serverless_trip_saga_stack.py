@@ -2,6 +2,8 @@ import aws_cdk as core
 import aws_cdk.assertions as assertions
 
 from serverless_trip_saga_stack import ServerlessTripSagaStack
+from services.shared.infrastructure.aws import AwsClientSettings
+from services.shared.infrastructure.deadline import DEFAULT_SAFETY_MARGIN_MS
 
 
 def test_stack_created():
@@ -11,3 +13,28 @@ def test_stack_created():
 
     # Verify the stack is empty as currently defined
     template.resource_count_is("AWS::SQS::Queue", 0)
+
+
+def test_function_timeouts_fit_deadline_budget():
+    """Lambda のタイムアウトから安全マージンを引いた時間に DynamoDB の全試行が収まる"""
+    app = core.App()
+    stack = ServerlessTripSagaStack(app, "ServerlessTripSagaStack")
+    functions = assertions.Template.from_stack(stack).find_resources(
+        "AWS::Lambda::Function"
+    )
+
+    settings = AwsClientSettings()
+    saga_functions = [
+        resource["Properties"]
+        for resource in functions.values()
+        if "TABLE_NAME"
+        in resource["Properties"].get("Environment", {}).get("Variables", {})
+    ]
+    assert saga_functions
+    for properties in saga_functions:
+        margin_ms = int(
+            properties["Environment"]["Variables"]["DEADLINE_SAFETY_MARGIN_MS"]
+        )
+        assert margin_ms == DEFAULT_SAFETY_MARGIN_MS
+        budget = properties["Timeout"] - margin_ms / 1000
+        assert settings.within(budget).max_attempts == settings.max_attempts